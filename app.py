@@ -2,81 +2,97 @@ from datetime import date
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from streamlit_folium import st_folium
-from folium.plugins import MarkerCluster
 import folium
-from scraper_booking import run_spider
+from map_layers import hotel_map, add_landmark, ViewportClusterLayer
+from map_clustering import GridClusterIndex
+from scraper_booking import run_spider, build_search_url
+from date_sweep import run_sweep, cheapest_stays, SWEEP_FILE
+from delta_refresh import run_refresh, RESULTS_FILE
+from snapshot_store import SnapshotStore, SNAPSHOT_DB
+from dataset import content_hash, prepare_dataset, dataset_profile
+from rollups import histogram_counts, treemap_rollup
+from correlations import CorrelationEngine, CORRELATION_METHODS
+from figure_cache import FigureCache
+from downsampling import downsample, LARGE_PLOT_POINTS
+from deals import deal_discounts
+from lazy_enrichment import DETAIL_CRITERIA, start_enrichment, pending_details
+from speculative_crawl import SpeculativeCrawler
+from ranking import TOP_N_CRITERIA, BALANCE_CRITERIA, RankingIndex
+from spatial_index import SpatialIndex
+from similar_hotels import SimilarHotels
+import os
+import subprocess
+import time
 from theme_settings import apply_theme, generate_color_palette
 import datetime
 import numpy as np
 
 
-def create_map(scraped_data, top_5_hotels = None, filter_top_5 = False):
+# Tryb listy top 5 z rankingiem ważonym i frontem Pareto (ranking.RankingIndex.balanced_top_n)
+BEST_BALANCE = "best balance"
+
+# Skąd wziąć punkt wyszukiwania hoteli w pobliżu
+NEAR_MODES = ["anywhere", "point clicked on the map", "a spot"]
+
+# Ile pasujących hoteli pokazać na liście wyboru w trybie "a spot" (reszta po zawężeniu wyszukiwania)
+SPOT_OPTIONS_LIMIT = 100
+
+# Od tej liczby hoteli klastry są liczone po stronie Pythona tylko dla widocznego fragmentu mapy
+SERVER_CLUSTERING_MIN_HOTELS = 2000
+
+# Zakładki strony głównej
+TABS = ["hotels info", "understand the trends", "cheapest nights", "price history"]
+
+
+def located_hotels(scraped_data):
+    """
+    Zwraca hotele ze współrzędnymi (przygotowane dane mają je już jako liczby, patrz dataset.prepare_dataset).
+    """
+    return scraped_data.dropna(subset = ['latitude', 'longitude'])
+
+
+def create_map(scraped_data, top_5_hotels = None, filter_top_5 = False, landmark = None):
     """
     Tworzy mapę z oznaczeniem hoteli, na podstawie danych zebranych przez scraper.
+    Znaczniki są budowane w przeglądarce z kolumn danych (map_layers.HotelMarkerCluster).
 
     Parametry:
     - scraped_data: pd.DataFrame-DataFrame zawierający dane o hotelach, w tym współrzędne geograficzne.
     - top_5_hotels: pd.DataFrame-DataFrame zawierający dane o top 5 hotelach do wyróżnienia.
     - filter_top_5: bool-Czy wyświetlać tylko top 5 hoteli.
+    - landmark: tuple-Punkt wyszukiwania hoteli w pobliżu i promień w metrach (opcjonalnie).
 
     Zwraca:
     - folium.Map - Obiekt mapy z oznaczeniami hoteli.
     """
-    scraped_data['latitude'] = pd.to_numeric(scraped_data['latitude'], errors = 'coerce')
-    scraped_data['longitude'] = pd.to_numeric(scraped_data['longitude'], errors = 'coerce')
-    scraped_data = scraped_data.dropna(subset = ['latitude', 'longitude'])
+    located = located_hotels(scraped_data)
+
+    # Przynależność do top 5 liczona raz jako zbiór nazw
+    top_5_names = set() if top_5_hotels is None else set(top_5_hotels['name'])
 
     # Jeśli filtrujemy tylko top 5, ogranicz dane do top_5_hotels
     if filter_top_5 and top_5_hotels is not None:
-        scraped_data = top_5_hotels
-
-    center_lat = scraped_data['latitude'].mean()
-    center_lon = scraped_data['longitude'].mean()
-
-    # Tworzenie mapy
-    m = folium.Map(location = [center_lat, center_lon], zoom_start = 12, tiles = 'cartodbpositron')
-    marker_cluster = MarkerCluster(zoom_to_bounds_on_click = True).add_to(m)
-
-    for _, row in scraped_data.iterrows():
-        popup_html = folium.Popup(
-            f""" <style> @import url('https://fonts.googleapis.com/css2?family=Roboto+Mono:ital,wght@0,100..700;1,
-            100..700&display=swap');
-            
-            div {{
-            font-family: 'Roboto Mono', sans-serif !important;
-            font-weight: 700 !important;
-            text-align: left !important;
-        }}
-            </style>
-            
-            <div>
-                <strong>{row['name']}</strong><br>
-                <b>price:</b> {row['price']} PLN<br>
-                <b>rating:</b> {row.get('rating_stars', 'N/A')}<br>
-                <b>number of reviews:</b> {row.get('num_review', 'N/A')}<br>
-                <b>address:</b> {row['address']}<br>
-            </div>
-            """,
-            max_width = 400
-        )
+        located = located[located['name'].isin(top_5_names)]
 
-        is_top_5 = top_5_hotels is not None and row['name'] in top_5_hotels['name'].values
+    return hotel_map(located, top_5_names, landmark = landmark)
 
-        folium.Marker(
-            location = [row['latitude'], row['longitude']],
-            popup = popup_html,
-            tooltip = f"{row['name']} ({row['price']} PLN)",
-            icon = folium.Icon(color = "pink" if is_top_5 else "cadetblue", icon_color = 'beige',
-                               icon = "star" if is_top_5 else "heart")
-        ).add_to(marker_cluster)
 
-    return m
+@st.cache_resource(max_entries = 8, show_spinner = False)
+def cached_map(scraped_data: pd.DataFrame, top_5_hotels: pd.DataFrame, filter_top_5: bool,
+               landmark: tuple = None) -> folium.Map:
+    """
+    create_map z pamięcią podręczną - mapa jest budowana ponownie tylko po zmianie danych
+    (zakresu cen), listy top 5, filtra albo punktu wyszukiwania.
+    """
+    return create_map(scraped_data, top_5_hotels, filter_top_5, landmark)
 
 
-def plot_histogram(data, column, dark_mode, title_suffix = "distribution", height = 410):
+def plot_histogram(data, column, dark_mode, title_suffix = "distribution", height = 410, value_range = None):
     """
-    Tworzy histogram dla określonej kolumny w danych.
+    Tworzy histogram dla określonej kolumny w danych. Przedziały są liczone w Pythonie
+    (rollups.histogram_counts), więc do przeglądarki trafia 20 słupków zamiast wszystkich wartości.
 
     Args:
         data (DataFrame): Dane wejściowe.
@@ -84,6 +100,7 @@ def plot_histogram(data, column, dark_mode, title_suffix = "distribution", heigh
         dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
         title_suffix (str): Dodatkowy tekst do tytułu wykresu.
         height (int): Wysokość wykresu.
+        value_range (tuple): Zakres przedziałów (np. z profilu danych); domyślnie min i max kolumny.
 
     Returns:
         plotly.graph_objs._figure.Figure: Wykres histogramu.
@@ -91,15 +108,18 @@ def plot_histogram(data, column, dark_mode, title_suffix = "distribution", heigh
     if column not in data.columns:
         return None
 
-    hist_fig = px.histogram(
-        data,
-        x = column,
-        title = f"{column} {title_suffix}",
-        labels = {column: column},
-        nbins = 20,
-        color_discrete_sequence = [generate_color_palette(dark_mode)['middle']]
-    )
+    # Słupki na całą szerokość przedziału, jak w px.histogram (go.Bar - bez narzutu Plotly Express)
+    counts, edges = histogram_counts(data[column], bins = 20, value_range = value_range)
+    hist_fig = go.Figure(go.Bar(
+        x = (edges[:-1] + edges[1:]) / 2,
+        y = counts,
+        width = np.diff(edges),
+        marker_color = generate_color_palette(dark_mode)['middle'],
+        customdata = np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate = f"{column}=%{{customdata[0]:.4g}} - %{{customdata[1]:.4g}}<br>count=%{{y}}<extra></extra>"
+    ))
     hist_fig.update_layout(
+        bargap = 0,
         xaxis = dict(
             title = dict(
                 text = f"{column}",
@@ -117,6 +137,7 @@ def plot_histogram(data, column, dark_mode, title_suffix = "distribution", heigh
         modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
         font = dict(family = "Roboto Mono"),
         title = dict(
+            text = f"{column} {title_suffix}",
             font = dict(family = "Roboto Mono", color = generate_color_palette(dark_mode)['title'])
         ),
         height = height
@@ -124,19 +145,467 @@ def plot_histogram(data, column, dark_mode, title_suffix = "distribution", heigh
     return hist_fig
 
 
-def load_scraped_data(file_path: str) -> pd.DataFrame:
+def plot_scatter(data, x_axis, y_axis, dark_mode, max_points = LARGE_PLOT_POINTS, ranges = (None, None)):
+    """
+    Tworzy wykres punktowy zależności między dwiema kolumnami.
+
+    Args:
+        data (DataFrame): Dane hoteli.
+        x_axis (str): Kolumna osi X (także rozmiar punktów).
+        y_axis (str): Kolumna osi Y (także kolor punktów).
+        dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
+        max_points (int): Powyżej tej liczby hoteli wykres jest rysowany przez WebGL (scattergl) z próbki punktów.
+        ranges (tuple): Zakresy osi X i Y (np. axis_range); None - zakres automatyczny.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Wykres punktowy.
+    """
+    # Tryb dużych danych: próbka zachowująca rozkład i punkty odstające (downsampling.downsample)
+    large = len(data) > max_points
+    if large:
+        data = data.iloc[downsample(data, [x_axis, y_axis], max_points)]
+    fig = px.scatter(
+        data,
+        x = x_axis,
+        y = y_axis,
+        color = y_axis,
+        size = x_axis,
+        color_continuous_scale = generate_color_palette(dark_mode)['palette'],
+        labels = {x_axis: x_axis, y_axis: y_axis},
+        title = f"relation between {x_axis} and {y_axis}",
+        render_mode = 'webgl' if large else 'auto',
+        range_x = ranges[0],
+        range_y = ranges[1]
+    )
+    fig.update_traces(marker = dict(opacity = 0.7, line = dict(width = 1, color = 'black')))
+    fig.update_layout(
+        modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+        font = dict(family = "Roboto Mono"),
+        title = dict(
+            font = dict(family = "Roboto Mono", color = generate_color_palette(dark_mode)['title'])
+        ),
+        xaxis = dict(
+            title = dict(
+                font = dict(family = "Roboto Mono", size = 14,
+                            color = generate_color_palette(dark_mode)['text'])
+            ),
+            tickfont = dict(color = generate_color_palette(dark_mode)['text'])
+        ),
+        yaxis = dict(
+            title = dict(
+                font = dict(family = "Roboto Mono", size = 14,
+                            color = generate_color_palette(dark_mode)['text'])
+            ),
+            tickfont = dict(color = generate_color_palette(dark_mode)['text'])
+        ),
+        height = 630
+    )
+    return fig
+
+
+def plot_treemap(data, color_option, dark_mode):
+    """
+    Tworzy treemapę hoteli według typu obiektu i kategorii cenowej. Do wykresu trafiają agregaty liści
+    (rollups.treemap_rollup), a nie wiersze hoteli - rozmiar wykresu nie zależy od liczby hoteli.
+
+    Args:
+        data (DataFrame): Dane hoteli z kolumnami hotel_type i price_range.
+        color_option (str): Kolumna, według której kolorowane są pola.
+        dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Treemapa.
+    """
+    treemap_fig = px.treemap(
+        treemap_rollup(data, ['hotel_type', 'price_range'], 'price', color_option),
+        path = ['hotel_type', 'price_range'],
+        values = 'price',
+        color = color_option,
+        color_continuous_scale = generate_color_palette(dark_mode)['palette']
+    )
+
+    # Aktualizacja etykiet w treemap
+    treemap_fig.update_traces(
+        root_color = 'rgba(0,0,0,0)',
+        marker = dict(cornerradius = 5)
+    )
+
+    # Aktualizacja tytułów osi i ogólnej etykiety koloru
+    treemap_fig.update_layout(
+        coloraxis_colorbar = dict(
+            tickfont = dict(color = generate_color_palette(dark_mode)['text']),
+            # Zmiana koloru tekstu etykiet na skali kolorów
+            titlefont = dict(color = generate_color_palette(dark_mode)['text'])
+            # Zmiana koloru tytułu skali kolorów
+        ),
+        paper_bgcolor = 'rgba(0,0,0,0)',
+        plot_bgcolor = 'rgba(0,0,0,0)',
+        margin = dict(t = 30, l = 25, r = 25, b = 25),
+        font = dict(family = "Roboto Mono"),
+        modebar = dict(bgcolor = 'rgba(0,0,0,0)')
+    )
+    return treemap_fig
+
+
+def plot_scatter_3d(data, x_axis_3d, y_axis_3d, z_axis_3d, dark_mode, max_points = LARGE_PLOT_POINTS,
+                    ranges = (None, None, None)):
+    """
+    Tworzy wykres punktowy 3D.
+
+    Args:
+        data (DataFrame): Dane hoteli (np. tylko wybranego typu).
+        x_axis_3d, y_axis_3d, z_axis_3d (str): Kolumny osi (X - rozmiar punktów, Z - kolor).
+        dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
+        max_points (int): Powyżej tej liczby hoteli wykres jest rysowany z próbki punktów.
+        ranges (tuple): Zakresy osi X, Y i Z (np. axis_range); None - zakres automatyczny.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Wykres 3D.
+    """
+    # Wykres 3D jest zawsze rysowany przez WebGL - dla dużych danych wystarczy próbka punktów
+    if len(data) > max_points:
+        data = data.iloc[downsample(data, [x_axis_3d, y_axis_3d, z_axis_3d], max_points)]
+    fig_3d = px.scatter_3d(
+        data,
+        x = x_axis_3d,
+        y = y_axis_3d,
+        z = z_axis_3d,
+        color = z_axis_3d,
+        size = x_axis_3d,
+        color_continuous_scale = generate_color_palette(dark_mode)['palette'],
+        range_x = ranges[0],
+        range_y = ranges[1],
+        range_z = ranges[2]
+    )
+    fig_3d.update_traces(marker = dict(opacity = 0.7))
+    fig_3d.update_layout(
+        coloraxis_colorbar = dict(
+            tickfont = dict(color = generate_color_palette(dark_mode)['title']),
+            titlefont = dict(color = generate_color_palette(dark_mode)['text'])
+        ),
+        height = 700,
+        paper_bgcolor = 'rgba(0,0,0,0)',
+        plot_bgcolor = 'rgba(0,0,0,0)',
+        margin = dict(t = 30, l = 25, r = 25, b = 25),
+        font = dict(family = "Roboto Mono"),
+        modebar = dict(bgcolor = 'rgba(0,0,0,0)')
+    )
+    return fig_3d
+
+
+def plot_correlation(correlation_matrix, dark_mode):
+    """
+    Tworzy heatmapę macierzy korelacji.
+
+    Args:
+        correlation_matrix (DataFrame): Macierz korelacji (np. z correlations.CorrelationEngine.matrix);
+            puste pola (NaN) nie są kolorowane.
+        dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Heatmapa korelacji.
+    """
+    # Heatmapa korelacji
+    heatmap_fig = px.imshow(
+        correlation_matrix,
+        color_continuous_scale = generate_color_palette(dark_mode)['palette'],
+        labels = {"color": "correlation"},
+        x = list(correlation_matrix.columns),
+        y = list(correlation_matrix.index),
+        text_auto = True  # Dodanie wartości na heatmapie
+    )
+
+    # Dostosowanie stylu
+    heatmap_fig.update_layout(
+        font = dict(family = "Roboto Mono"),
+        modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+        xaxis = dict(
+            title = dict(
+                font = dict(family = "Roboto Mono", size = 14,
+                            color = generate_color_palette(dark_mode)['text'])
+            ),
+            tickfont = dict(color = generate_color_palette(dark_mode)['text'])
+        ),
+        yaxis = dict(
+            title = dict(
+                font = dict(family = "Roboto Mono", size = 14,
+                            color = generate_color_palette(dark_mode)['text'])
+            ),
+            tickfont = dict(color = generate_color_palette(dark_mode)['text'])
+        ),
+    )
+    return heatmap_fig
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """
+    Wspólna dla wszystkich sesji pamięć gotowych wykresów (figure_cache.FigureCache).
+    """
+    return FigureCache()
+
+
+def cached_figure(chart, options, dark_mode, build):
+    """
+    Wykres z pamięci podręcznej albo zbudowany przez `build` (jeśli dane, opcje lub motyw się zmieniły).
+
+    Args:
+        chart (str): Rodzaj wykresu.
+        options (tuple): Wybrane osie, kolory i filtry wykresu.
+        dark_mode (bool): Flaga trybu ciemnego.
+        build (callable): Funkcja bez argumentów tworząca wykres.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Wykres (nie wolno go modyfikować - jest wspólny dla sesji).
+    """
+    key = (st.session_state["dataset_hash"], chart, options, dark_mode)
+    return get_figure_cache().figure(key, build)
+
+
+def sampled_points_caption(fig, total, max_points):
+    """
+    Podpis wykresu w trybie dużych danych: ile punktów z próbki jest pokazanych.
+
+    Args:
+        fig (Figure): Wykres punktowy.
+        total (int): Liczba hoteli w danych wykresu.
+        max_points (int): Próg trybu dużych danych.
+    """
+    if total > max_points:
+        shown = sum(len(trace.x) for trace in fig.data)
+        st.caption(f"showing {shown:,} of {total:,} points: a sample that keeps the density and the outliers")
+
+
+@st.cache_data
+def load_price_matrix(file_path: str, modified_at: float) -> pd.DataFrame:
+    """
+    Wczytuje macierz cen hotel x termin zapisaną przez date_sweep.
+
+    Parametry:
+    - file_path: str-Ścieżka do pliku Parquet z macierzą.
+    - modified_at: float-Czas modyfikacji pliku (klucz pamięci podręcznej - nowy sweep unieważnia wpis).
+
+    Zwraca:
+    - pd.DataFrame-Macierz cen za noc (puste, jeśli pliku nie ma).
+    """
+    try:
+        return pd.read_parquet(file_path)
+    except Exception:
+        return pd.DataFrame()
+
+
+def plot_price_matrix(matrix, dark_mode, max_hotels = 30):
+    """
+    Tworzy heatmapę cen za noc: najtańsze hotele x terminy (data zameldowania / liczba nocy).
+
+    Args:
+        matrix (DataFrame): Macierz cen z date_sweep.price_matrix (hotele posortowane od najtańszego,
+            indeks z poziomem 'name').
+        dark_mode (bool): Flaga trybu ciemnego (dla kolorów).
+        max_hotels (int): Liczba wyświetlanych hoteli.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Heatmapa cen.
+    """
+    shown = matrix.head(max_hotels)
+    # Etykiety wierszy to nazwy hoteli; powtórzone nazwy (różne obiekty) są numerowane, żeby wiersze się nie łączyły
+    names = pd.Series(shown.index.get_level_values('name') if 'name' in shown.index.names else shown.index)
+    repeat = names.groupby(names).cumcount()
+    labels = names.where(repeat == 0, names + " (" + (repeat + 1).astype(str) + ")")
+    heatmap_fig = px.imshow(
+        shown.to_numpy(),
+        x = list(shown.columns),
+        y = list(labels),
+        labels = {"x": "check-in / nights", "y": "hotel", "color": "price per night"},
+        color_continuous_scale = generate_color_palette(dark_mode)['palette'],
+        aspect = "auto"
+    )
+    heatmap_fig.update_layout(
+        font = dict(family = "Roboto Mono"),
+        modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+        xaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+        yaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+        height = max(400, 22 * len(shown))
+    )
+    return heatmap_fig
+
+
+def sweep_content(dark_mode):
+    """
+    Sekcja wyszukiwania najtańszych nocy: formularz zakresu dat i heatmapa macierzy cen hotel x termin.
+    """
+    st.subheader("find the cheapest nights")
+    with st.form("sweep_form", clear_on_submit = False):
+        col1, col2, col3, col4 = st.columns([3, 3, 2, 2])
+        with col1:
+            sweep_city = st.text_input("destination", placeholder = "destination", key = "sweep_city")
+        with col2:
+            checkin_range = st.date_input("check-in between",
+                                          value = (date.today(), date.today() + datetime.timedelta(days = 6)),
+                                          min_value = date.today(), key = "sweep_range")
+        with col3:
+            stay_lengths = st.multiselect("nights", options = list(range(1, 15)), default = [1, 2],
+                                          key = "sweep_nights")
+        with col4:
+            sweep_adults = st.number_input("adults", min_value = 1, value = 2, step = 1, key = "sweep_adults")
+            sweep_button = st.form_submit_button("sweep dates", use_container_width = True)
+
+        if sweep_button:
+            if not sweep_city.strip():
+                st.error(" no vibes, no travel. type in a destination!")
+            elif len(checkin_range) != 2 or not stay_lengths:
+                st.error(" pick a check-in range and at least one stay length!")
+            else:
+                with st.spinner("scraping prices for every date... hotel details are fetched only once"):
+                    run_sweep(sweep_city, checkin_range[0], checkin_range[1], stay_lengths, sweep_adults)
+
+    if not os.path.exists(SWEEP_FILE):
+        st.info("run a date sweep to see the price matrix.")
+        return
+
+    matrix = load_price_matrix(SWEEP_FILE, os.path.getmtime(SWEEP_FILE))
+    if matrix.empty:
+        st.warning("the price matrix is empty.")
+        return
+
+    summary = cheapest_stays(matrix)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("cheapest stay (median per night)", summary['stay'].iloc[0],
+                f"{summary['median_price'].iloc[0]:.2f} pln")
+    col2.metric("lowest price per night", f"{summary['min_price'].min():.2f} pln")
+    col3.metric("hotels x dates", f"{matrix.shape[0]} x {matrix.shape[1]}")
+
+    max_hotels = st.slider("hotels shown (cheapest first)", min_value = 5, max_value = max(5, len(matrix)),
+                           value = min(30, max(5, len(matrix))))
+    st.plotly_chart(plot_price_matrix(matrix, dark_mode, max_hotels), use_container_width = True)
+
+
+@st.cache_resource
+def get_snapshot_store(db_path: str) -> SnapshotStore:
+    """
+    Zwraca obiekt historii cen (jeden na sesję serwera; połączenia SQLite są otwierane per zapytanie).
+    """
+    return SnapshotStore(db_path)
+
+
+def history_content(dark_mode):
+    """
+    Sekcja historii cen: trajektoria ceny wybranego hotelu i mediana ceny za noc według typu hotelu.
+    """
+    if not os.path.exists(SNAPSHOT_DB):
+        st.info("no price history yet. every scrape is added to it automatically.")
+        return
+
+    store = get_snapshot_store(SNAPSHOT_DB)
+    cities = store.cities()
+    if not cities:
+        st.info("no price history yet. every scrape is added to it automatically.")
+        return
+
+    history_city = st.selectbox("city", cities, key = "history_city")
+    col1, col2 = st.columns([3, 2])
+
+    with col1:
+        st.subheader("price trajectory")
+        hotels = store.hotels(history_city)
+        hotel_labels = dict(zip(hotels['name'].fillna(hotels['hotel']), hotels['hotel']))
+        selected_hotel = st.selectbox("hotel", list(hotel_labels), key = "history_hotel")
+        trajectory = store.price_trajectory(hotel_labels[selected_hotel])
+        if trajectory.empty:
+            st.warning("no snapshots for this hotel.")
+        else:
+            trajectory_fig = px.line(
+                trajectory,
+                x = 'scraped_at',
+                y = 'price_per_night',
+                color = 'checkin',
+                markers = True,
+                labels = {'scraped_at': 'scraped at', 'price_per_night': 'price per night', 'checkin': 'check-in'},
+                color_discrete_sequence = generate_color_palette(dark_mode)['palette']
+            )
+            trajectory_fig.update_layout(
+                font = dict(family = "Roboto Mono"),
+                modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+                xaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                yaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                height = 450
+            )
+            st.plotly_chart(trajectory_fig, use_container_width = True)
+
+    with col2:
+        st.subheader("median price by hotel type")
+        days = st.slider("last days", min_value = 1, max_value = 365, value = 30, key = "history_days")
+        medians = store.median_price_by_type(days = days, city = history_city)
+        if medians.empty:
+            st.warning(f"no snapshots in the last {days} days.")
+        else:
+            median_fig = px.bar(
+                medians,
+                x = 'hotel_type',
+                y = 'median_price_per_night',
+                hover_data = ['snapshots'],
+                labels = {'hotel_type': 'hotel type', 'median_price_per_night': 'median price per night'},
+                color_discrete_sequence = [generate_color_palette(dark_mode)['middle']]
+            )
+            median_fig.update_layout(
+                font = dict(family = "Roboto Mono"),
+                modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+                xaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                yaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                height = 450
+            )
+            st.plotly_chart(median_fig, use_container_width = True)
+
+    st.subheader("price per night distribution over history")
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        distribution_by = st.radio("group by", ['price_range', 'hotel_type'], key = "history_group_by")
+    with col2:
+        # Statystyki ze scalonych agregatów (rollups) - bez skanowania surowych migawek
+        distribution = store.distribution([distribution_by], days = days, city = history_city)
+        if distribution.empty:
+            st.warning(f"no snapshots in the last {days} days.")
+        else:
+            distribution_fig = px.bar(
+                distribution,
+                x = distribution_by,
+                y = 'p50',
+                error_y = distribution['p75'] - distribution['p50'],
+                error_y_minus = distribution['p50'] - distribution['p25'],
+                hover_data = ['count', 'mean', 'min', 'max', 'p90'],
+                labels = {'p50': 'median price per night (p25-p75)', distribution_by: distribution_by},
+                color_discrete_sequence = [generate_color_palette(dark_mode)['middle']]
+            )
+            distribution_fig.update_layout(
+                font = dict(family = "Roboto Mono"),
+                modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
+                xaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                yaxis = dict(tickfont = dict(color = generate_color_palette(dark_mode)['text'])),
+                height = 400
+            )
+            st.plotly_chart(distribution_fig, use_container_width = True)
+
+
+def load_scraped_data(file_path: str, require_details: bool = True) -> pd.DataFrame:
     """
     Ładuje dane z pliku CSV zawierającego informacje o hotelach pochodzące ze scrapingu.
 
     Parametry:
     - file_path: str-Ścieżka do pliku CSV z danymi.
+    - require_details: bool-Czy pominąć hotele bez danych ze strony hotelu (typ, współrzędne).
 
     Zwraca:
     - pd. DataFrame-DataFrame zawierający dane o hotelach.
     """
     try:
         scraped_data = pd.read_csv(file_path)
-        scraped_data = scraped_data.dropna(subset = ['latitude', 'longitude', 'hotel_type', 'num_review'])
+        if require_details:
+            scraped_data = scraped_data.dropna(subset = ['latitude', 'longitude', 'hotel_type', 'num_review'])
+        else:
+            for column in ['latitude', 'longitude', 'hotel_type']:
+                if column not in scraped_data.columns:
+                    scraped_data[column] = np.nan
+            scraped_data = scraped_data.dropna(subset = ['num_review'])
         st.success("...csv file loaded successfully!")
         return scraped_data
     except FileNotFoundError:
@@ -148,6 +617,702 @@ def load_scraped_data(file_path: str) -> pd.DataFrame:
     return pd.DataFrame()
 
 
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def prepared_dataset(dataset_hash: str, num_days: int, _scraped_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    dataset.prepare_dataset z pamięcią podręczną według skrótu zawartości - te same wyniki
+    (np. ponownie wczytany, niezmieniony plik) są przygotowywane tylko raz.
+    """
+    return prepare_dataset(_scraped_data, num_days)
+
+
+def set_scraped_data(scraped_data, num_days):
+    """
+    Zapisuje w sesji przygotowane dane hoteli, z których korzystają wszystkie widoki aplikacji.
+
+    Parametry:
+    - scraped_data: pd.DataFrame-Dane wczytane z pliku wyników.
+    - num_days: int-Liczba nocy pobytu.
+    """
+    dataset_hash = content_hash(scraped_data)
+    # Własna kopia sesji - przygotowana ramka w pamięci podręcznej jest wspólna dla wszystkich sesji
+    st.session_state["scraped_data"] = prepared_dataset(dataset_hash, num_days, scraped_data).copy()
+    st.session_state["dataset_hash"] = f"{dataset_hash}-{num_days}"
+
+
+def refresh_enrichment():
+    """
+    Wczytuje ponownie plik wyników, jeśli proces pobierający strony hoteli (tryb lazy) dopisał nowe dane.
+    """
+    enrichment = st.session_state.get("enrichment")
+    if not enrichment or not os.path.exists(RESULTS_FILE):
+        return
+    modified_at = os.path.getmtime(RESULTS_FILE)
+    if modified_at <= enrichment['loaded_at']:
+        return
+    try:
+        scraped_data = pd.read_csv(RESULTS_FILE).dropna(subset = ['num_review'])
+    except (pd.errors.EmptyDataError, pd.errors.ParserError):
+        return
+    set_scraped_data(scraped_data, enrichment['num_days'])
+    enrichment['loaded_at'] = modified_at
+
+
+def stop_enrichment():
+    """
+    Zatrzymuje proces pobierający strony hoteli poprzedniego wyszukiwania (tryb lazy) i usuwa go z sesji,
+    żeby nie nadpisał wyników ani historii cen nowego wyszukiwania.
+    """
+    enrichment = st.session_state.get("enrichment")
+    if enrichment and enrichment['process'].poll() is None:
+        enrichment['process'].terminate()
+        try:
+            enrichment['process'].wait(timeout = 10)
+        except subprocess.TimeoutExpired:
+            enrichment['process'].kill()
+            enrichment['process'].wait()
+    st.session_state.pop("enrichment", None)
+
+
+def prioritize_enrichment(scraped_data, filtered_data, top_5_hotels, criterion, selected_price_range):
+    """
+    Pokazuje postęp pobierania stron hoteli (tryb lazy) i - jeśli poprzedni proces już się zakończył,
+    a oglądane hotele (top 5 i wybrany zakres cen) nie mają jeszcze danych - uruchamia go ponownie
+    z priorytetami dla bieżącego wyboru.
+    """
+    enrichment = st.session_state.get("enrichment")
+    if not enrichment:
+        return
+    pending = pending_details(scraped_data)
+    running = enrichment['process'].poll() is None
+    if pending.any():
+        col1, col2 = st.columns([3, 1])
+        col1.caption(f"hotel details: {int((~pending).sum())} of {len(scraped_data)} spots "
+                     f"{'(fetching...)' if running else ''}")
+        # Panel mapy jest fragmentem - nowe dane wczytuje dopiero pełny rerun (refresh_enrichment)
+        if col2.button("refresh", key = "refresh_enrichment", use_container_width = True):
+            st.rerun()
+    if running:
+        return
+
+    watched = pd.Series(False, index = scraped_data.index)
+    if enrichment['rest'] == 'skip':
+        watched[filtered_data.index] = True
+    watched[top_5_hotels.index] = True
+    if (watched & pending).any():
+        # Historia cen dostaje wyniki raz i tylko pełne - gdy ten przebieg pobierze wszystkie brakujące strony
+        append_history = not enrichment['history'] and not (pending & ~watched).any()
+        # Proces pobierający zna tylko kryteria z kolumn surowego pliku - w trybie best balance czy deal_score
+        # priorytet ma zakres cen (top 5 i tak jest w wybranym zakresie)
+        enrichment['process'] = start_enrichment(RESULTS_FILE,
+                                                 criterion = criterion if criterion in DETAIL_CRITERIA else None,
+                                                 price_range = selected_price_range, rest = enrichment['rest'],
+                                                 append_history = append_history)
+        enrichment['history'] |= append_history
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_ranking_index(dataset_hash: str, _scraped_data: pd.DataFrame) -> RankingIndex:
+    """
+    Indeks top N i zakresu cen liczony raz dla przygotowanych danych (klucz: st.session_state["dataset_hash"]).
+    """
+    return RankingIndex(_scraped_data)
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_spatial_index(dataset_hash: str, _scraped_data: pd.DataFrame) -> SpatialIndex:
+    """
+    Indeks przestrzenny (promień, najbliższe hotele) liczony raz dla przygotowanych danych.
+    """
+    return SpatialIndex(_scraped_data)
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_spots(dataset_hash: str, _scraped_data: pd.DataFrame, _spatial_index: SpatialIndex) -> pd.Series:
+    """
+    Hotele ze współrzędnymi do trybu "a spot": pozycja wiersza (pierwszego o danej nazwie) według nazwy,
+    posortowane po nazwie - liczone raz dla przygotowanych danych.
+    """
+    names = _scraped_data['name'].iloc[_spatial_index.rows]
+    spots = pd.Series(_spatial_index.rows, index = names.to_numpy())
+    return spots[~spots.index.duplicated()].sort_index()
+
+
+@st.cache_resource(max_entries = 16, show_spinner = False)
+def cached_near_index(dataset_hash: str, point: tuple, radius: int, _scraped_data: pd.DataFrame,
+                      _spatial_index: SpatialIndex) -> tuple:
+    """
+    Hotele w promieniu od punktu (z odległością od punktu jako kryterium) i ich indeks top N - liczone raz
+    dla punktu i promienia, więc front Pareto zostaje w pamięci przy zmianie wag czy kryterium.
+
+    Zwraca:
+    - tuple - (dane hoteli w pobliżu, RankingIndex, czy zamiast promienia wzięto 5 najbliższych hoteli).
+    """
+    near_rows, near_distances = _spatial_index.within(*point, radius)
+    nearest = not len(near_rows)
+    if nearest:
+        near_rows, near_distances = _spatial_index.nearest(*point, k = 5)
+    near_data = _scraped_data.iloc[near_rows].assign(distance_to_point = near_distances.round())
+    return near_data, RankingIndex(near_data), nearest
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_similar_hotels(dataset_hash: str, _scraped_data: pd.DataFrame) -> SimilarHotels:
+    """
+    Indeks podobnych hoteli (wektory cech) liczony raz dla przygotowanych danych.
+    """
+    return SimilarHotels(_scraped_data)
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_profile(dataset_hash: str, _scraped_data: pd.DataFrame) -> dict:
+    """
+    Profil danych (dataset.dataset_profile) liczony raz dla przygotowanych danych.
+    """
+    return dataset_profile(_scraped_data)
+
+
+def column_bounds(column):
+    """
+    Najmniejsza i największa wartość kolumny z profilu wszystkich hoteli.
+
+    Args:
+        column (str): Kolumna liczbowa.
+
+    Returns:
+        tuple | None: (min, max) albo None, jeśli kolumna nie ma wartości.
+    """
+    stats = cached_profile(st.session_state["dataset_hash"], st.session_state["scraped_data"])['numeric']
+    if column not in stats.index or not stats.loc[column, 'count']:
+        return None
+    return stats.loc[column, 'min'], stats.loc[column, 'max']
+
+
+def axis_range(column, padding = 0.05):
+    """
+    Zakres osi wykresu z profilu wszystkich hoteli - stały przy zmianie filtrów i próbki punktów.
+
+    Args:
+        column (str): Kolumna liczbowa.
+        padding (float): Margines z obu stron jako część rozpiętości wartości.
+
+    Returns:
+        list | None: [min, max] z marginesem albo None (zakres automatyczny).
+    """
+    bounds = column_bounds(column)
+    if bounds is None:
+        return None
+    low, high = bounds
+    margin = (high - low) * padding or 1
+    return [low - margin, high + margin]
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_correlations(dataset_hash: str, _scraped_data: pd.DataFrame) -> CorrelationEngine:
+    """
+    Macierze korelacji kolumn liczbowych liczone raz dla przygotowanych danych (wybór kolumn to wycinek).
+    """
+    return CorrelationEngine(_scraped_data)
+
+
+def remember_map_click(returned):
+    """
+    Zapamiętuje punkt kliknięty na mapie (tryb "point clicked on the map") i przelicza panel mapy.
+
+    Parametry:
+    - returned: dict-Wynik st_folium z 'last_clicked'.
+    """
+    clicked = (returned or {}).get('last_clicked')
+    if clicked and (clicked['lat'], clicked['lng']) != st.session_state.get("map_point"):
+        st.session_state["map_point"] = (clicked['lat'], clicked['lng'])
+        st.rerun(scope = "fragment")
+
+
+@st.cache_resource(max_entries = 4, show_spinner = False)
+def cached_cluster_index(data_key: tuple, _located: pd.DataFrame) -> GridClusterIndex:
+    """
+    Indeks klastrów liczony raz dla zbioru hoteli (klucz: wersja danych i filtry, które wybrały hotele).
+    """
+    return GridClusterIndex(_located)
+
+
+def clustered_map(scraped_data, top_5_hotels, data_key, landmark = None, track_clicks = False):
+    """
+    Mapa dla bardzo dużej liczby hoteli: do przeglądarki trafiają tylko klastry i hotele z bieżącego
+    widoku i przybliżenia (zwracanych przez st_folium), a nie wszystkie znaczniki.
+
+    Parametry:
+    - scraped_data: pd.DataFrame-Dane hoteli.
+    - top_5_hotels: pd.DataFrame-Top 5 hoteli (zawsze pokazywane jako osobne znaczniki).
+    - data_key: tuple-Klucz zbioru hoteli: skrót danych (dataset_hash), zakres cen i punkt wyszukiwania.
+    - landmark: tuple-Punkt wyszukiwania hoteli w pobliżu i promień w metrach (opcjonalnie).
+    - track_clicks: bool-Czy zapamiętywać punkt kliknięty na mapie.
+    """
+    located = located_hotels(scraped_data)
+    # Klucz z gotowych wartości - bez liczenia skrótu danych przy każdym przesunięciu mapy
+    index = cached_cluster_index(data_key, located)
+    view = st.session_state.get("hotel_map_view")
+    if not view or view['data'] != data_key:
+        view = {
+            'data': data_key,
+            'bounds': [located['latitude'].min(), located['longitude'].min(),
+                       located['latitude'].max(), located['longitude'].max()],
+            'zoom': 12,
+        }
+    clusters, points = index.query(*view['bounds'], view['zoom'])
+
+    top_5_names = set(top_5_hotels['name'])
+    points = located.iloc[points]
+    points = pd.concat([points[~points['name'].isin(top_5_names)], located[located['name'].isin(top_5_names)]])
+
+    m = folium.Map(location = [located['latitude'].mean(), located['longitude'].mean()], zoom_start = 12,
+                   tiles = 'cartodbpositron')
+    layer = folium.FeatureGroup(name = "hotels")
+    ViewportClusterLayer(clusters, points, top_5_names).add_to(layer)
+    if landmark is not None:
+        add_landmark(layer, landmark)
+    st.caption(f"showing {len(clusters)} clusters and {len(points)} spots in view (of {len(located)} spots)")
+    returned = st_folium(m, key = "hotel_map", width = 1200, height = 1200, feature_group_to_add = layer,
+                         returned_objects = ['bounds', 'zoom'] + (['last_clicked'] if track_clicks else []))
+    if track_clicks:
+        remember_map_click(returned)
+
+    # Nowy widok z przeglądarki - przelicz klastry dla niego
+    bounds = (returned or {}).get('bounds') or {}
+    if bounds.get('_southWest', {}).get('lat') is not None and returned.get('zoom') is not None:
+        new_bounds = [bounds['_southWest']['lat'], bounds['_southWest']['lng'],
+                      bounds['_northEast']['lat'], bounds['_northEast']['lng']]
+        if new_bounds != view['bounds'] or returned['zoom'] != view['zoom']:
+            st.session_state["hotel_map_view"] = {'data': data_key, 'bounds': new_bounds,
+                                                  'zoom': returned['zoom']}
+            st.rerun(scope = "fragment")
+
+
+def get_speculative_crawler() -> SpeculativeCrawler:
+    """
+    Zwraca (i w razie potrzeby tworzy) crawler spekulacyjny przypisany do sesji użytkownika.
+    """
+    if "speculation" not in st.session_state:
+        st.session_state["speculation"] = SpeculativeCrawler()
+    return st.session_state["speculation"]
+
+
+def report_search_timing(submitted_at, timing = None):
+    """
+    Pokazuje czas od wysłania formularza do pierwszych wyników.
+
+    Parametry:
+    - submitted_at: float-Czas wysłania formularza (time.time()).
+    - timing: dict-Wynik SpeculativeCrawler.fetch (opcjonalnie).
+    """
+    elapsed = time.time() - submitted_at
+    message = f"results ready {elapsed:.1f} s after submit"
+    if timing and timing['first_item_at'] is not None:
+        message += f", first hotel found {timing['first_item_at'] - submitted_at:+.1f} s from submit"
+    if timing and timing['reused']:
+        message += f" (speculative crawl started {submitted_at - timing['started_at']:.1f} s before submit)"
+    st.caption(message)
+
+
+@st.fragment
+def map_panel():
+    """
+    Panel mapy i listy top 5. Jako fragment Streamlit zmiana kryterium, zakresu cen czy przesunięcie mapy
+    przelicza tylko ten panel, a nie całą stronę z wykresami.
+    """
+    scraped_data = st.session_state["scraped_data"]
+    ranking_index = cached_ranking_index(st.session_state["dataset_hash"], scraped_data)
+    col_map, col_data = st.columns([1, 1])
+
+    with col_map:
+        st.subheader("show me top 5")
+
+        # Hotele w pobliżu punktu klikniętego na mapie albo wybranego hotelu (indeks przestrzenny)
+        spatial_index = cached_spatial_index(st.session_state["dataset_hash"], scraped_data)
+        near_mode = st.radio("near...", NEAR_MODES, horizontal = True, key = "near_mode")
+        point, landmark = None, None
+        if near_mode == "a spot":
+            # Lista wyboru tylko z hotelami pasującymi do wyszukiwania (nie cała lista nazw przy każdym przebiegu)
+            spots = cached_spots(st.session_state["dataset_hash"], scraped_data, spatial_index)
+            search = st.text_input("search spot", key = "near_spot_search")
+            matching = spots[spots.index.str.contains(search, case = False, regex = False)] if search else spots
+            spot = st.selectbox("spot", matching.index[:SPOT_OPTIONS_LIMIT], key = "near_spot")
+            if len(matching) > SPOT_OPTIONS_LIMIT:
+                st.caption(f"showing {SPOT_OPTIONS_LIMIT} of {len(matching)} spots - type to narrow the list")
+            if spot is None:
+                st.caption("no spots match the search.")
+            else:
+                spot_row = scraped_data.iloc[matching[spot]]
+                point = (float(spot_row['latitude']), float(spot_row['longitude']))
+        elif near_mode == "point clicked on the map":
+            point = st.session_state.get("map_point")
+            if point is None:
+                st.caption("click on the map to choose a point.")
+        if point is not None:
+            radius = st.slider("within (m)", min_value = 100, max_value = 5000, value = 1000, step = 100,
+                               key = "near_radius")
+            scraped_data, ranking_index, nearest = cached_near_index(st.session_state["dataset_hash"], point,
+                                                                     radius, scraped_data, spatial_index)
+            if nearest:
+                st.caption(f"no spots within {radius} m - showing the 5 nearest spots")
+            landmark = (point[0], point[1], radius)
+
+        # Wybór kategorii
+        criteria = TOP_N_CRITERIA + [BEST_BALANCE] + (['distance_to_point'] if landmark else [])
+        top_5_referring = st.selectbox("referring to...", criteria, index = 0, help = """   choose a criterion to filter the top 5 spots based on:
+
+    - **distance**: hotels closest to the city center.
+    - **rate_review**: hotels with the highest rating based on reviews.
+    - **rating_stars**: hotels with the highest number of stars (highest star rating).
+    - **num_review**: hotels with the most reviews.
+    - **price**: the cheapest hotels (lowest price).
+    - **deal_score**: hotels priced furthest below similar spots (same type, area and review rate).
+    - **best balance**: hotels not beaten by any other hotel on price, distance, review rate and number of reviews at once, ranked by your weights.
+    - **distance_to_point**: hotels closest to the selected point (when searching near a point).""")
+
+        # Dodanie suwaka dla ceny (zakres z profilu wszystkich hoteli, niezależnie od punktu)
+        price_stats = cached_profile(st.session_state["dataset_hash"], st.session_state["scraped_data"])['numeric']
+        min_price, max_price = int(price_stats.loc['price', 'min']), int(price_stats.loc['price', 'max'])
+        selected_price_range = st.slider("select price range (PLN)", min_value = min_price,
+                                         max_value = max_price, value = (min_price, max_price))
+
+        # Filtracja danych na podstawie zakresu cen (wyszukiwanie binarne w posortowanych cenach)
+        in_range = ranking_index.in_price_range(selected_price_range)
+        filtered_data = scraped_data[in_range]
+
+        if top_5_referring == BEST_BALANCE:
+            # Wagi kryteriów - front Pareto dla zakresu cen jest w pamięci, więc zmiana wag tylko przelicza wyniki
+            weight_columns = st.columns(len(BALANCE_CRITERIA))
+            weights = {criterion: column.slider(f"{criterion} weight", min_value = 0, max_value = 10, value = 5,
+                                                key = f"balance_weight_{criterion}")
+                       for criterion, column in zip(BALANCE_CRITERIA, weight_columns)}
+            top_5_hotels = ranking_index.balanced_top_n(weights, price_range = selected_price_range)
+            front_size = len(ranking_index.pareto_front(selected_price_range))
+            at_least = "" if ranking_index.front_complete(selected_price_range) else "at least "
+            st.caption(f"{at_least}{front_size} of {int(in_range.sum())} spots "
+                       f"in this price range are not beaten on every criterion by another spot")
+        else:
+            # Top 5 spotów z gotowych permutacji kryteriów
+            top_5_hotels = ranking_index.top_n(top_5_referring, price_range = selected_price_range)
+        prioritize_enrichment(st.session_state["scraped_data"], filtered_data, top_5_hotels, top_5_referring,
+                              selected_price_range)
+
+        show_only_top_5 = st.checkbox("show only top 5 spots on the map", value = False)
+        st.divider()
+
+        located_count = filtered_data[['latitude', 'longitude']].notna().all(axis = 1).sum()
+        track_clicks = near_mode == "point clicked on the map"
+        if located_count >= SERVER_CLUSTERING_MIN_HOTELS and not show_only_top_5:
+            with st.spinner("creating map..."):
+                clustered_map(filtered_data, top_5_hotels,
+                              (st.session_state["dataset_hash"], selected_price_range, landmark), landmark,
+                              track_clicks)
+        elif located_count > 0 or landmark is not None:
+            with st.spinner("creating map..."):
+                m = cached_map(filtered_data, top_5_hotels, show_only_top_5, landmark)
+                # Mapa odsyła do Pythona tylko kliknięty punkt (w trybie wyszukiwania w pobliżu punktu) -
+                # przesuwanie mapy nie powoduje rerunu
+                returned = st_folium(m, width = 1200, height = 1200,
+                                     returned_objects = ['last_clicked'] if track_clicks else [])
+                if track_clicks:
+                    remember_map_click(returned)
+        else:
+            st.info("waiting for hotel locations...")
+
+        with col_data:
+            with st.container():
+                st.write(f"#### top 5 spots sorted by {top_5_referring}:")
+                # Podobne hotele dla całej listy jednym zapytaniem (indeksy top 5 to pozycje w przygotowanych danych)
+                all_hotels = st.session_state["scraped_data"]
+                similar_index = cached_similar_hotels(st.session_state["dataset_hash"], all_hotels)
+                similar_rows, similar_distances = similar_index.similar(top_5_hotels.index.to_numpy(), k = 3)
+                discounts = deal_discounts(top_5_hotels)
+                for (index, row), alternatives, distances in zip(top_5_hotels.iterrows(), similar_rows,
+                                                                  similar_distances):
+                    st.markdown(
+                        f"**{row['name']}** " + f"[click here to visit the hotel]({row['link']})")  #
+                    # Link do strony hotelu na booking
+                    if 'distance_to_point' in row:
+                        st.caption(f"{row['distance_to_point']:.0f} m from the selected point")
+                    if 'balance_score' in row:
+                        st.caption(f"balance score: {row['balance_score']:.2f}"
+                                   + ("" if row['pareto_optimal'] else " (filled in, not on the pareto front)"))
+                    if pd.notna(discounts[index]):
+                        st.caption(f"deal: {discounts[index]:.0f}% below the ~{row['expected_price']:.0f} pln "
+                                   f"per night typical for similar spots")
+                    col1, col2 = st.columns(2)  # Dwie kolumny dla metryk
+
+                    with col1:
+                        st.metric(label = "price", value = f"{row['price']} pln")
+                        st.metric(label = "rating", value = f"{row['rating_stars']}/5 ☆")
+
+                    with col2:
+                        st.metric(label = "review rate", value = f"{row['rate_review']} / 10")
+                        st.metric(label = "distance to city center", value = f"{row['distance']} m")
+
+                    with st.expander("similar spots"):
+                        for alternative in all_hotels.iloc[alternatives[np.isfinite(distances)]].itertuples():
+                            st.markdown(f"**{alternative.name}** [visit]({alternative.link}) - "
+                                        f"{alternative.price} pln, {alternative.rate_review} / 10, "
+                                        f"{alternative.rating_stars}/5 ☆"
+                                        + (f", {alternative.hotel_type}" if pd.notna(alternative.hotel_type) else ""))
+
+
+def hotels_tab(city, checkin, checkout, adults_count):
+    """
+    Zakładka "hotels info": podsumowanie wyników wyszukiwania i panel mapy z listą top 5.
+    """
+    # Sekcja mapy
+    if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
+        scraped_data = st.session_state["scraped_data"]
+        st.header(f"your __{city}__ experience awaits: __{checkin}-{checkout}__ for __{adults_count}__ guests")
+        st.divider()
+        st.subheader("quick hotel insights")
+        # Statystyki z profilu danych - liczone raz dla wersji danych, nie przy każdym rerunie
+        profile = cached_profile(st.session_state["dataset_hash"], scraped_data)
+        stats = profile['numeric']
+        col1, col2, col3, col4 = st.columns(4)
+
+        col1.metric("no. of found spots", profile['rows'])
+        col2.metric("avg. price", f"{stats.loc['price', 'mean']:.2f} pln")
+        col2.write(
+            f"_highest price:_ ___{stats.loc['price', 'max']:.2f} pln___")
+        col2.write(
+            f"_lowest price:_ ___{stats.loc['price', 'min']:.2f} pln___")
+        col3.metric("avg rate review:",
+                    f"{stats.loc['rate_review', 'mean']:.2f}")
+        col3.write(
+            f"_highest rate review:_ ___{stats.loc['rate_review', 'max']:.2f}___")
+        col3.write(
+            f"_lowest rate review:_ ___{stats.loc['rate_review', 'min']:.2f}___")
+        col4.metric("avg distance to city center",
+                    f"{stats.loc['distance', 'mean']:.2f} m")
+        col4.write(
+            f"_highest distance:_ ___{stats.loc['distance', 'max']:.2f} m___")
+        col4.write(
+            f"_lowest distance:_ ___{stats.loc['distance', 'min']:.2f} m___")
+        st.divider()
+        if 'latitude' in scraped_data.columns and 'longitude' in scraped_data.columns:
+            map_panel()
+
+    else:
+        st.info("fill in the form to see the results.")
+
+
+@st.fragment
+def scatter_panel(dark_mode, max_points = LARGE_PLOT_POINTS):
+    """
+    Wykres punktowy z histogramami wybranych osi. Fragment - zmiana osi przelicza tylko ten panel.
+    """
+    # W trybie lazy część hoteli nie ma jeszcze typu i współrzędnych
+    scraped_data = st.session_state["scraped_data"].dropna(subset = ['hotel_type'])
+
+    col1, col2 = st.columns([3, 2.5])
+
+    with col1:
+
+        st.subheader("customizable scatter plot")
+
+        options = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price']
+        x_axis = st.selectbox("select X-axis", options, index = 0)
+        y_axis = st.selectbox("select Y-axis", options, index = 4)
+
+        with st.spinner("generating your scatter plot..."):
+            if x_axis in scraped_data.columns and y_axis in scraped_data.columns:
+                # Osie z profilu wszystkich hoteli - takie same dla pełnych danych i dla próbki punktów
+                ranges = (axis_range(x_axis), axis_range(y_axis))
+                fig = cached_figure("scatter", (x_axis, y_axis, max_points), dark_mode,
+                                    lambda: plot_scatter(scraped_data, x_axis, y_axis, dark_mode, max_points, ranges))
+                st.plotly_chart(fig, use_container_width = True)
+                sampled_points_caption(fig, len(scraped_data), max_points)
+            else:
+                st.error(f"the data does not contain the selected columns '{x_axis}' or '{y_axis}'.")
+
+    with col2:
+        if x_axis in scraped_data.columns:
+            hist_fig_x = cached_figure("histogram", (x_axis,), dark_mode,
+                                       lambda: plot_histogram(scraped_data, x_axis, dark_mode,
+                                                              value_range = column_bounds(x_axis)))
+            if hist_fig_x:
+                st.plotly_chart(hist_fig_x, use_container_width = True, key = "hist_x")
+            else:
+                st.error(f"{x_axis} data is not available.")
+
+        if y_axis in scraped_data.columns:
+            hist_fig_y = cached_figure("histogram", (y_axis,), dark_mode,
+                                       lambda: plot_histogram(scraped_data, y_axis, dark_mode,
+                                                              value_range = column_bounds(y_axis)))
+            if hist_fig_y:
+                st.plotly_chart(hist_fig_y, use_container_width = True, key = "hist_y")
+            else:
+                st.error(f"{y_axis} data is not available.")
+
+
+@st.fragment
+def treemap_panel(dark_mode):
+    """
+    Treemapa hoteli według typu i kategorii cenowej. Fragment - zmiana koloru przelicza tylko ten panel.
+    """
+    scraped_data = st.session_state["scraped_data"].dropna(subset = ['hotel_type'])
+    st.subheader("treemap: hotel distribution by price range and...")
+    color_option = st.radio("choose color by", ['num_review', 'rate_review', 'rating_stars'], index = 0,
+                            horizontal = True)
+    if 'hotel_type' in scraped_data.columns and 'price_range' in scraped_data.columns:
+        treemap_fig = cached_figure("treemap", (color_option,), dark_mode,
+                                    lambda: plot_treemap(scraped_data, color_option, dark_mode))
+        st.plotly_chart(treemap_fig, use_container_width = True)
+    else:
+        st.write(scraped_data.columns)
+        st.error("oops! columns do not exist.")
+
+
+@st.fragment
+def scatter_3d_panel(dark_mode, max_points = LARGE_PLOT_POINTS):
+    """
+    Wykres 3D z wyborem osi i typu obiektu. Fragment - zmiana osi lub typu przelicza tylko ten panel.
+    """
+    st.subheader("fancy 3D plot")
+    col11, col12, col13 = st.columns([1, 0.1, 1])
+    with col11:
+        options = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price']
+        x_axis_3d = st.selectbox("select X-axis (3D)", options, index = 0, key = "x_3d")
+        y_axis_3d = st.selectbox("select Y-axis (3D)", options, index = 1, key = "y_3d")
+        z_axis_3d = st.selectbox("select Z-axis (3D)", options, index = 2, key = "z_3d")
+    with col13:
+        # Mapa typów hoteli z polskiego na angielski (dane mam po polsku bo scrpuje sie z polskiej strony booking.com)
+        hotel_type_map = {
+            "Hotel": "hotel",
+            "Motel": "motel",
+            "Aparthotel": "aparthotel",
+            "Apartament": "apartment",
+            "Hostel": "hostel",
+            "Pensjonat": "guesthouse",
+            "Willa": "villa"
+        }
+
+        # Opcje w języku angielskim + "all"
+        hotel_type_options = ["all"] + list(hotel_type_map.values())
+
+        # Użytkownik wybiera opcję w języku angielskim
+        selected_hotel_type_english = st.radio("select hotel type", hotel_type_options, key = "hotel_type")
+
+        # Jeśli "All", wybieramy cały DataFrame, inaczej tłumaczymy i filtrujemy
+        if selected_hotel_type_english == "all":
+            filtered_data = st.session_state["scraped_data"]
+        else:
+            # Znajdowanie polskiego odpowiednika
+            selected_hotel_type = {v: k for k, v in hotel_type_map.items()}[selected_hotel_type_english]
+            filtered_data = st.session_state["scraped_data"][
+                st.session_state["scraped_data"]['hotel_type'] == selected_hotel_type
+                ]
+
+    # Sprawdzenie unikalnych wartości hotel_type
+    if "hotel_type" in filtered_data.columns:
+        unique_types = filtered_data['hotel_type'].dropna().unique()
+        if len(unique_types) > 0:
+            # Generowanie wykresu 3D
+            if all(col in filtered_data.columns for col in [x_axis_3d, y_axis_3d, z_axis_3d]):
+                fig_3d = cached_figure("scatter_3d",
+                                       (x_axis_3d, y_axis_3d, z_axis_3d, selected_hotel_type_english, max_points),
+                                       dark_mode,
+                                       lambda: plot_scatter_3d(filtered_data, x_axis_3d, y_axis_3d, z_axis_3d,
+                                                               dark_mode, max_points,
+                                                               [axis_range(axis) for axis in
+                                                                (x_axis_3d, y_axis_3d, z_axis_3d)]))
+                st.plotly_chart(fig_3d, use_container_width = True)
+                sampled_points_caption(fig_3d, len(filtered_data), max_points)
+            else:
+                st.error(f"selected columns are not in the data: {x_axis_3d}, {y_axis_3d}, {z_axis_3d}")
+        else:
+            st.warning(f"no valid hotel type found in the data for your city :((( ")
+    else:
+        st.error("the 'hotel_type' column is missing from the dataset")
+
+
+@st.fragment
+def correlation_panel(dark_mode):
+    """
+    Macierz korelacji wybranych kolumn. Fragment - zmiana kolumn lub zakresu przelicza tylko ten panel.
+    """
+    scraped_data = st.session_state["scraped_data"].dropna(subset = ['hotel_type'])
+    st.subheader("heatmap: correlation matrix")
+
+    # Korelacja: kolumny numeryczne i pełne macierze korelacji policzone raz dla wersji danych
+    correlations = cached_correlations(st.session_state["dataset_hash"], scraped_data)
+    numeric_columns = correlations.columns
+
+    if len(numeric_columns) > 1:
+        # Dodaj możliwość wyboru kolumn do analizy
+        selected_columns = st.multiselect(
+            "select columns for correlation matrix",
+            options = numeric_columns,
+            default = numeric_columns
+        )
+
+        if len(selected_columns) > 1:
+            # Możliwość filtrowania zakresu korelacji
+            min_corr, max_corr = st.slider(
+                "Select correlation range",
+                min_value = -1.0,
+                max_value = 1.0,
+                value = (-1.0, 1.0),
+                step = 0.1
+            )
+
+            method = st.radio("correlation method", CORRELATION_METHODS, horizontal = True,
+                              key = "correlation_method",
+                              help = "pearson measures linear relations; spearman compares rankings, so it also "
+                                     "catches monotonic relations and is less sensitive to outliers. "
+                                     "missing values are skipped pair by pair.")
+
+            heatmap_fig = cached_figure("correlation", (tuple(selected_columns), min_corr, max_corr, method),
+                                        dark_mode,
+                                        lambda: plot_correlation(
+                                            correlations.matrix(selected_columns, method, (min_corr, max_corr)),
+                                            dark_mode))
+            st.plotly_chart(heatmap_fig, use_container_width = True)
+        else:
+            st.warning("please select at least two columns to compute correlations.")
+    else:
+        st.warning("not enough numeric columns to compute correlations.")
+
+
+def trends_tab(dark_mode):
+    """
+    Zakładka "understand the trends": wykresy danych hoteli, każdy w osobnym fragmencie.
+    """
+    if "scraped_data" not in st.session_state or st.session_state["scraped_data"].empty:
+        st.info("fill in the form to see the results.")
+        return
+
+    max_points = st.number_input("max points per plot", min_value = 500, value = LARGE_PLOT_POINTS, step = 500,
+                                 key = "max_plot_points",
+                                 help = "above this number of spots the scatter plots switch to webgl and show a "
+                                        "sample that keeps the density of points and the outliers.")
+    scatter_panel(dark_mode, max_points)
+    st.divider()
+
+    col1, col2 = st.columns([3, 1.5])
+    with col1:
+        treemap_panel(dark_mode)
+    with col2:
+        st.write("""
+        #### price categories description:
+
+        - **cheap**: items priced from 0 to 150 per night. these are affordable options suitable for budget-conscious buyers.
+        - **moderate**: prices between 150 and 300 per night. these items are moderately priced and offer a balance between quality and cost.
+        - **expensive**: items priced from 300 to 500 per night. these are higher-priced items often associated with luxury features or premium brands.
+        - **luxury**: items priced over 500 per night. these are high-end, exclusive products often linked to top-quality materials or prestigious brands.
+        """)
+    st.divider()
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        scatter_3d_panel(dark_mode, max_points)
+    with col2:
+        correlation_panel(dark_mode)
+
+
 def home_content(dark_mode):
     """
     Funkcja wyświetlająca główną stronę aplikacji z formularzem wyszukiwania hoteli.
@@ -157,7 +1322,12 @@ def home_content(dark_mode):
     """
 
     st.header("search hotels")
-    with st.form("booking_form", clear_on_submit = False):
+    speculative = st.toggle("speculative warm-up", value = False,
+                            help = "keep a warmed-up scraper ready and start scraping search results as soon as "
+                                   "the destination and dates are filled in. if you submit the same search, "
+                                   "the results are already on their way.")
+    # Formularz nie przekazuje wartości przed wysłaniem, więc w trybie spekulacyjnym pola są poza formularzem
+    with st.container() if speculative else st.form("booking_form", clear_on_submit = False):
         col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
 
         with col1:
@@ -173,7 +1343,34 @@ def home_content(dark_mode):
 
             col4_1, col4_2 = st.columns([1, 1])
             with col4_2:
-                submit_button = st.form_submit_button("find my stay", use_container_width = True)
+                submit_button = (st.button if speculative else st.form_submit_button)("find my stay",
+                                                                                      use_container_width = True)
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            refresh_only = st.checkbox("refresh prices only", value = False,
+                                       help = "re-scrape only the search results and reuse hotel details "
+                                              "(type, location) from the last run; new hotels are still fetched.")
+        with col2:
+            detail_modes = {
+                "fetch all, then show results": None,
+                "show results first, fetch the rest in background": 'background',
+                "show results first, fetch only top 5 & price range": 'skip',
+            }
+            detail_mode = detail_modes[st.selectbox(
+                "hotel details", list(detail_modes), index = 0,
+                help = "hotel pages (type, location) are the slow part of scraping. in lazy modes the search "
+                       "results appear right away and hotel pages are fetched in order: the current top 5 first, "
+                       "then the selected price range.")]
+
+        if speculative:
+            # Spekulacja tylko po zmianie pól formularza - nie dla wyszukiwania, którego wyniki są już wczytane
+            if not submit_button and city.strip() and checkin < checkout and not refresh_only:
+                url = build_search_url(city, checkin, checkout, adults_count)
+                if url != st.session_state.get("last_search_url"):
+                    get_speculative_crawler().speculate(url)
+            get_speculative_crawler().warm_up()
+        elif "speculation" in st.session_state:
+            st.session_state.pop("speculation").close()
 
         if submit_button:
             if not city.strip():
@@ -181,12 +1378,8 @@ def home_content(dark_mode):
             elif checkin >= checkout:
                 st.error(" whoa there, Doc Brown. let’s fix those dates!")
             else:
-                link = (
-                    f"https://www.booking.com/searchresults.pl.html"
-                    f"?ss={city}"
-                    f"&checkin={checkin}&checkout={checkout}"
-                    f"&group_adults={adults_count}"
-                )
+                link = build_search_url(city, checkin, checkout, adults_count)
+                st.session_state["last_search_url"] = link
                 st.success("...link generated!")
                 st.markdown(
                     f"scraping may take a moment...[while scraping you can explore booking.com by yourself.]({link})",
@@ -195,391 +1388,57 @@ def home_content(dark_mode):
                 # Spinner podczas scrapowania danych
                 with st.spinner("scraping hotel data..."):
                     try:
-                        run_spider(link)
+                        submitted_at, timing = time.time(), None
+                        data_file = RESULTS_FILE
+                        lazy = detail_mode is not None and not (refresh_only and os.path.exists(data_file))
+                        stop_enrichment()
+                        if refresh_only and os.path.exists(data_file):
+                            run_refresh(city, checkin, checkout, adults_count)
+                        elif speculative:
+                            # Wyniki wyszukiwania z rozgrzanego procesu (albo przejęte ze scrapowania spekulacyjnego)
+                            timing = get_speculative_crawler().fetch(link)
+                            data_file = "bookingResults.csv" if lazy else RESULTS_FILE
+                            if not lazy:
+                                start_enrichment("bookingResults.csv").wait()
+                        elif lazy:
+                            # Tylko wyniki wyszukiwania - strony hoteli pobiera proces w tle
+                            run_spider(link, details = 'lazy')
+                            data_file = "bookingResults.csv"
+                        else:
+                            run_spider(link)
                         st.success("...scraping completed!")
-                        data_file = "bookingResults_updated.csv"
 
                         # Spinner podczas ładowania danych
                         with st.spinner("loading scraped data..."):
-                            scraped_data = load_scraped_data(data_file)
-                            scraped_data['price_range'] = pd.cut(scraped_data['price'] / num_days,
-                                                                 bins = [0, 150, 300, 500, np.inf],
-                                                                 labels = ['cheap', 'moderate', 'expensive', 'luxury'])
-                            st.session_state["scraped_data"] = scraped_data
+                            set_scraped_data(load_scraped_data(data_file, require_details = not lazy), num_days)
+                        report_search_timing(submitted_at, timing)
+                        if lazy:
+                            # W trybie 'skip' pierwszy przebieg pomija część hoteli - bez zapisu do historii cen
+                            history = detail_mode != 'skip'
+                            st.session_state["enrichment"] = {
+                                'process': start_enrichment(data_file, criterion = TOP_N_CRITERIA[0],
+                                                            rest = detail_mode, append_history = history),
+                                'history': history,  # Czy któryś przebieg już dopisuje wyniki do historii
+                                'rest': detail_mode,
+                                'num_days': num_days,
+                                'loaded_at': time.time(),
+                            }
                     except Exception as e:
                         st.error(f"oops! an error occurred during scraping: {e}")
 
-    # Layout tabeli
-    tabs = st.tabs(["hotels info", "understand the trends"])
-
-    with tabs[0]:
-        # Sekcja mapy
-        if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-            scraped_data = st.session_state["scraped_data"]
-            st.header(f"your __{city}__ experience awaits: __{checkin}-{checkout}__ for __{adults_count}__ guests")
-            st.divider()
-            st.subheader("quick hotel insights")
-            col1, col2, col3, col4 = st.columns(4)
-
-            col1.metric("no. of found spots", len(scraped_data))
-            col2.metric("avg. price", f"{scraped_data['price'].mean():.2f} pln")
-            col2.write(
-                f"_highest price:_ ___{scraped_data['price'].max():.2f} pln___")
-            col2.write(
-                f"_lowest price:_ ___{scraped_data['price'].min():.2f} pln___")
-            col3.metric("avg rate review:",
-                        f"{scraped_data['rate_review'].mean():.2f}")
-            col3.write(
-                f"_highest rate review:_ ___{scraped_data['rate_review'].max():.2f}___")
-            col3.write(
-                f"_lowest rate review:_ ___{scraped_data['rate_review'].min():.2f}___")
-            col4.metric("avg distance to city center",
-                        f"{scraped_data['distance'].mean():.2f} m")
-            col4.write(
-                f"_highest distance:_ ___{scraped_data['distance'].max():.2f} m___")
-            col4.write(
-                f"_lowest distance:_ ___{scraped_data['distance'].min():.2f} m___")
-            st.divider()
-            if 'latitude' in scraped_data.columns and 'longitude' in scraped_data.columns:
-                col_map, col_data = st.columns([1, 1])
-
-                with col_map:
-                    # Wybór kategorii
-                    st.subheader("show me top 5")
-
-                    options = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price']
-                    top_5_referring = st.selectbox("referring to...", options, index = 0, help = """   choose a criterion to filter the top 5 spots based on:
-
-    - **distance**: hotels closest to the city center.
-    - **rate_review**: hotels with the highest rating based on reviews.
-    - **rating_stars**: hotels with the highest number of stars (highest star rating).
-    - **num_review**: hotels with the most reviews.
-    - **price**: the cheapest hotels (lowest price).""")
-
-                    # Dodanie suwaka dla ceny
-                    min_price, max_price = int(scraped_data['price'].min()), int(scraped_data['price'].max())
-                    selected_price_range = st.slider("select price range (PLN)", min_value = min_price,
-                                                     max_value = max_price, value = (min_price, max_price))
-
-                    # Filtracja danych na podstawie zakresu cen
-                    filtered_data = scraped_data[
-                        (scraped_data['price'] >= selected_price_range[0]) &
-                        (scraped_data['price'] <= selected_price_range[1])
-                        ]
-
-                    # Filtracja top 5 spotów
-                    if top_5_referring in filtered_data.columns:
-                        if top_5_referring == 'price':
-                            # dla ceny wybieramy najtańsze hotele
-                            top_5_hotels = filtered_data.nsmallest(5, top_5_referring)
-                        elif top_5_referring == 'rating_stars':
-                            # dla ocen gwiazdkowych wybieramy najwyższe hotele
-                            top_5_hotels = filtered_data.nlargest(5, top_5_referring)
-                        else:
-                            # dla innych kryteriów (np. liczba recenzji, ocena) wybieramy najmniejsze lub największe
-                            # wartości w zależności od kontekstu
-                            top_5_hotels = filtered_data.nsmallest(5, top_5_referring)
-
-                    show_only_top_5 = st.checkbox("show only top 5 spots on the map", value = False)
-                    st.divider()
-
-                    with st.spinner("creating map..."):
-                        m = create_map(filtered_data, top_5_hotels, filter_top_5 = show_only_top_5)
-                        st_folium(m, width = 1200, height = 1200)
-
-                    with col_data:
-                        with st.container():
-                            st.write(f"#### top 5 spots sorted by {top_5_referring}:")
-                            for index, row in top_5_hotels.iterrows():
-                                st.markdown(
-                                    f"**{row['name']}** " + f"[click here to visit the hotel]({row['link']})")  #
-                                # Link do strony hotelu na booking
-                                col1, col2 = st.columns(2)  # Dwie kolumny dla metryk
-
-                                with col1:
-                                    st.metric(label = "price", value = f"{row['price']} pln")
-                                    st.metric(label = "rating", value = f"{row['rating_stars']}/5 ☆")
-
-                                with col2:
-                                    st.metric(label = "review rate", value = f"{row['rate_review']} / 10")
-                                    st.metric(label = "distance to city center", value = f"{row['distance']} m")
-
-        else:
-            st.info("fill in the form to see the results.")
-
-    with tabs[1]:
-        # Dashboard content
-        if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-            scraped_data = st.session_state["scraped_data"]
-
-            col1, col2 = st.columns([3, 2.5])
-
-            with col1:
-
-                st.subheader("customizable scatter plot")
-
-                options = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price']
-                x_axis = st.selectbox("select X-axis", options, index = 0)
-                y_axis = st.selectbox("select Y-axis", options, index = 4)
-
-                with st.spinner("generating your scatter plot..."):
-                    if x_axis in scraped_data.columns and y_axis in scraped_data.columns:
-                        fig = px.scatter(
-                            scraped_data,
-                            x = x_axis,
-                            y = y_axis,
-                            color = y_axis,
-                            size = x_axis,
-                            color_continuous_scale = generate_color_palette(dark_mode)['palette'],
-                            labels = {x_axis: x_axis, y_axis: y_axis},
-                            title = f"relation between {x_axis} and {y_axis}"
-                        )
-                        fig.update_traces(marker = dict(opacity = 0.7, line = dict(width = 1, color = 'black')))
-                        fig.update_layout(
-                            modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
-                            font = dict(family = "Roboto Mono"),
-                            title = dict(
-                                font = dict(family = "Roboto Mono", color = generate_color_palette(dark_mode)['title'])
-                            ),
-                            xaxis = dict(
-                                title = dict(
-                                    font = dict(family = "Roboto Mono", size = 14,
-                                                color = generate_color_palette(dark_mode)['text'])
-                                ),
-                                tickfont = dict(color = generate_color_palette(dark_mode)['text'])
-                            ),
-                            yaxis = dict(
-                                title = dict(
-                                    font = dict(family = "Roboto Mono", size = 14,
-                                                color = generate_color_palette(dark_mode)['text'])
-                                ),
-                                tickfont = dict(color = generate_color_palette(dark_mode)['text'])
-                            ),
-                            height = 630
-                        )
-                        st.plotly_chart(fig, use_container_width = True)
-                    else:
-                        st.error(f"the data does not contain the selected columns '{x_axis}' or '{y_axis}'.")
-
-            with col2:
-                if x_axis in scraped_data.columns:
-                    hist_fig_x = plot_histogram(scraped_data, x_axis, dark_mode)
-                    if hist_fig_x:
-                        st.plotly_chart(hist_fig_x, use_container_width = True, key = "hist_x")
-                    else:
-                        st.error(f"{x_axis} data is not available.")
-
-                if y_axis in scraped_data.columns:
-                    hist_fig_y = plot_histogram(scraped_data, y_axis, dark_mode)
-                    if hist_fig_y:
-                        st.plotly_chart(hist_fig_y, use_container_width = True, key = "hist_y")
-                    else:
-                        st.error(f"{y_axis} data is not available.")
-            st.divider()
-        else:
-            st.info("fill in the form to see the results.")
-        col1, col2 = st.columns([3, 1.5])
+    refresh_enrichment()
 
+    # Zakładki: st.tabs wykonuje kod wszystkich zakładek przy każdym rerunie, więc rysowana jest tylko wybrana
+    active_tab = st.radio("tab", TABS, horizontal = True, label_visibility = "collapsed", key = "active_tab")
 
-        with col1:
-            if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-                scraped_data = st.session_state["scraped_data"]
-                st.subheader("treemap: hotel distribution by price range and...")
-                color_option = st.radio("choose color by", ['num_review', 'rate_review', 'rating_stars'], index = 0,
-                                        horizontal = True)
-                if 'hotel_type' in scraped_data.columns and 'price_range' in scraped_data.columns:
-                    treemap_fig = px.treemap(
-                        scraped_data,
-                        path = ['hotel_type', 'price_range'],
-                        values = 'price',
-                        color = color_option,
-                        color_continuous_scale = generate_color_palette(dark_mode)['palette']
-                    )
-
-                    # Aktualizacja etykiet w treemap
-                    treemap_fig.update_traces(
-                        root_color = 'rgba(0,0,0,0)',
-                        marker = dict(cornerradius = 5)
-                    )
-
-                    # Aktualizacja tytułów osi i ogólnej etykiety koloru
-                    treemap_fig.update_layout(
-                        coloraxis_colorbar = dict(
-                            tickfont = dict(color = generate_color_palette(dark_mode)['text']),
-                            # Zmiana koloru tekstu etykiet na skali kolorów
-                            titlefont = dict(color = generate_color_palette(dark_mode)['text'])
-                            # Zmiana koloru tytułu skali kolorów
-                        ),
-                        paper_bgcolor = 'rgba(0,0,0,0)',
-                        plot_bgcolor = 'rgba(0,0,0,0)',
-                        margin = dict(t = 30, l = 25, r = 25, b = 25),
-                        font = dict(family = "Roboto Mono"),
-                        modebar = dict(bgcolor = 'rgba(0,0,0,0)')
-                    )
-
-                    st.plotly_chart(treemap_fig, use_container_width = True)
-                else:
-                    st.write(scraped_data.columns)
-                    st.error("oops! columns do not exist.")
-            if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-                with col2:
-                    st.write("""
-                    #### price categories description:
-
-                    - **cheap**: items priced from 0 to 150 per night. these are affordable options suitable for budget-conscious buyers.
-                    - **moderate**: prices between 150 and 300 per night. these items are moderately priced and offer a balance between quality and cost.
-                    - **expensive**: items priced from 300 to 500 per night. these are higher-priced items often associated with luxury features or premium brands.
-                    - **luxury**: items priced over 500 per night. these are high-end, exclusive products often linked to top-quality materials or prestigious brands.
-                    """)
-
-        if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-            st.divider()
-
-        col1, col2 = st.columns([1, 1])
-        with col1:
-            if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-                st.subheader("fancy 3D plot")
-                col11, col12, col13 = st.columns([1, 0.1, 1])
-                with col11:
-                    options = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price']
-                    x_axis_3d = st.selectbox("select X-axis (3D)", options, index = 0, key = "x_3d")
-                    y_axis_3d = st.selectbox("select Y-axis (3D)", options, index = 1, key = "y_3d")
-                    z_axis_3d = st.selectbox("select Z-axis (3D)", options, index = 2, key = "z_3d")
-                with col13:
-                    # Mapa typów hoteli z polskiego na angielski (dane mam po polsku bo scrpuje sie z polskiej strony booking.com)
-                    hotel_type_map = {
-                        "Hotel": "hotel",
-                        "Motel": "motel",
-                        "Aparthotel": "aparthotel",
-                        "Apartament": "apartment",
-                        "Hostel": "hostel",
-                        "Pensjonat": "guesthouse",
-                        "Willa": "villa"
-                    }
-
-                    # Opcje w języku angielskim + "all"
-                    hotel_type_options = ["all"] + list(hotel_type_map.values())
-
-                    # Użytkownik wybiera opcję w języku angielskim
-                    selected_hotel_type_english = st.radio("select hotel type", hotel_type_options, key = "hotel_type")
-
-                    # Jeśli "All", wybieramy cały DataFrame, inaczej tłumaczymy i filtrujemy
-                    if selected_hotel_type_english == "all":
-                        filtered_data = st.session_state["scraped_data"]
-                    else:
-                        # Znajdowanie polskiego odpowiednika
-                        selected_hotel_type = {v: k for k, v in hotel_type_map.items()}[selected_hotel_type_english]
-                        filtered_data = st.session_state["scraped_data"][
-                            st.session_state["scraped_data"]['hotel_type'] == selected_hotel_type
-                            ]
-
-                # Sprawdzenie unikalnych wartości hotel_type
-                if "hotel_type" in filtered_data.columns:
-                    unique_types = filtered_data['hotel_type'].dropna().unique()
-                    if len(unique_types) > 0:
-                        # Generowanie wykresu 3D
-                        if all(col in filtered_data.columns for col in [x_axis_3d, y_axis_3d, z_axis_3d]):
-                            fig_3d = px.scatter_3d(
-                                filtered_data,
-                                x = x_axis_3d,
-                                y = y_axis_3d,
-                                z = z_axis_3d,
-                                color = z_axis_3d,
-                                size = x_axis_3d,
-                                color_continuous_scale = generate_color_palette(dark_mode)['palette']
-                            )
-                            fig_3d.update_traces(marker = dict(opacity = 0.7))
-                            fig_3d.update_layout(
-                                coloraxis_colorbar = dict(
-                                    tickfont = dict(color = generate_color_palette(dark_mode)['title']),
-                                    titlefont = dict(color = generate_color_palette(dark_mode)['text'])
-                                ),
-                                height = 700,
-                                paper_bgcolor = 'rgba(0,0,0,0)',
-                                plot_bgcolor = 'rgba(0,0,0,0)',
-                                margin = dict(t = 30, l = 25, r = 25, b = 25),
-                                font = dict(family = "Roboto Mono"),
-                                modebar = dict(bgcolor = 'rgba(0,0,0,0)')
-                            )
-                            st.plotly_chart(fig_3d, use_container_width = True)
-                        else:
-                            st.error(f"selected columns are not in the data: {x_axis_3d}, {y_axis_3d}, {z_axis_3d}")
-                    else:
-                        st.warning(f"no valid hotel type found in the data for your city :((( ")
-                else:
-                    st.error("the 'hotel_type' column is missing from the dataset")
-
-        with col2:
-            if "scraped_data" in st.session_state and not st.session_state["scraped_data"].empty:
-                st.subheader("heatmap: correlation matrix")
-
-                # Korelacja: wybierz kolumny numeryczne
-                if 'scraped_data' in locals():
-                    numeric_columns = scraped_data.select_dtypes(include = ["number"]).columns
-                else:
-                    numeric_columns = []  # lub inna wartość domyślna
-
-                if len(numeric_columns) > 1:
-                    # Dodaj możliwość wyboru kolumn do analizy
-                    selected_columns = st.multiselect(
-                        "select columns for correlation matrix",
-                        options = numeric_columns,
-                        default = numeric_columns
-                    )
-
-                    if len(selected_columns) > 1:
-                        # Obliczenie macierzy korelacji dla wybranych kolumn
-                        correlation_matrix = scraped_data[selected_columns].corr()
-                        correlation_matrix = correlation_matrix.round(3)
-
-                        # Możliwość filtrowania zakresu korelacji
-                        min_corr, max_corr = st.slider(
-                            "Select correlation range",
-                            min_value = -1.0,
-                            max_value = 1.0,
-                            value = (-1.0, 1.0),
-                            step = 0.1
-                        )
-
-                        # Maskowanie wartości poza zakresem
-                        filtered_correlation = correlation_matrix.applymap(
-                            lambda x: x if min_corr <= x <= max_corr else None
-                        )
-
-                        # Heatmapa korelacji
-                        heatmap_fig = px.imshow(
-                            filtered_correlation,
-                            color_continuous_scale = generate_color_palette(dark_mode)['palette'],
-                            labels = {"color": "correlation"},
-                            x = selected_columns,
-                            y = selected_columns,
-                            text_auto = True  # Dodanie wartości na heatmapie
-                        )
-
-                        # Dostosowanie stylu
-                        heatmap_fig.update_layout(
-                            font = dict(family = "Roboto Mono"),
-                            modebar = dict(bgcolor = 'rgba(0,0,0,0)'),
-                            xaxis = dict(
-                                title = dict(
-                                    font = dict(family = "Roboto Mono", size = 14,
-                                                color = generate_color_palette(dark_mode)['text'])
-                                ),
-                                tickfont = dict(color = generate_color_palette(dark_mode)['text'])
-                            ),
-                            yaxis = dict(
-                                title = dict(
-                                    font = dict(family = "Roboto Mono", size = 14,
-                                                color = generate_color_palette(dark_mode)['text'])
-                                ),
-                                tickfont = dict(color = generate_color_palette(dark_mode)['text'])
-                            ),
-                        )
-                        st.plotly_chart(heatmap_fig, use_container_width = True)
-                    else:
-                        st.warning("please select at least two columns to compute correlations.")
-                else:
-                    st.warning("not enough numeric columns to compute correlations.")
+    if active_tab == TABS[0]:
+        hotels_tab(city, checkin, checkout, adults_count)
+    elif active_tab == TABS[1]:
+        trends_tab(dark_mode)
+    elif active_tab == TABS[2]:
+        sweep_content(dark_mode)
+    else:
+        history_content(dark_mode)
 
 
 def write_about(dark_mode):
@@ -0,0 +1,257 @@
+import sys
+
+if "twisted.internet.reactor" in sys.modules:
+    del sys.modules["twisted.internet.reactor"]
+import argparse
+import logging
+from collections import namedtuple
+
+import pandas as pd
+import scrapy
+from scrapy.crawler import CrawlerProcess
+
+from detail_cache import DetailCache
+from listing_normalization import normalize_listings, print_parse_report
+from parse_pool import create_parse_pool
+from scraper_booking import LISTING_SUFFIXES, build_search_url, canonical_link, extract_hotel_cards
+from scraper_hotel_details import extract_hotel_details
+from snapshot_store import SNAPSHOT_DB, SnapshotStore
+
+# Jedno wyszukiwanie w trybie wsadowym
+SearchSpec = namedtuple('SearchSpec', ['city', 'checkin', 'checkout', 'adults'])
+
+SEARCH_COLUMNS = list(SearchSpec._fields)
+PARTITION_COLUMNS = ['city', 'checkin']
+
+
+class BatchHotelsSpider(scrapy.Spider):
+    name = "hotelsBatch"
+
+    def __init__(self, specs=None, detail_cache=None, parse_workers=None, *args, **kwargs):
+        """
+        Inicjalizuje spidera, który w jednym procesie scrapuje wyniki dla wielu wyszukiwań (miast i dat)
+        oraz strony hoteli - każdą tylko raz, niezależnie od tego, w ilu wyszukiwaniach hotel się pojawił.
+
+        Parametry:
+        - specs: list[SearchSpec] - Lista wyszukiwań (miasto, zameldowanie, wymeldowanie, liczba dorosłych).
+        - detail_cache: DetailCache (opcjonalnie) - Wspólna pamięć podręczna danych ze stron hoteli.
+        - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+        """
+        super(BatchHotelsSpider, self).__init__(*args, **kwargs)
+        if not specs:
+            raise ValueError("Brak wyszukiwań! Podaj co najmniej jedno wyszukiwanie.")
+        self.specs = list(specs)
+        self.detail_cache = detail_cache if detail_cache is not None else DetailCache()
+        self.parse_pool = create_parse_pool(parse_workers)
+        self.listings = []  # Wiersze z wyników wyszukiwania (surowe pola + dane wyszukiwania)
+        self.seen_links = set()  # Pary (wyszukiwanie, kanoniczny link) już zapisane
+        self.requested_details = set()  # Kanoniczne linki, dla których zlecono pobranie strony hotelu
+        self.cached_details = set()  # Kanoniczne linki obsłużone z pamięci podręcznej
+
+    custom_settings = {
+        'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/96.0.4664.45 Safari/537.36',
+        'LOG_LEVEL': logging.WARNING,
+    }
+
+    def start_requests(self):
+        """
+        Generuje żądania stron wyników dla każdego wyszukiwania i każdej końcówki sortowania.
+        Strony wyników mają wyższy priorytet, żeby jak najszybciej odkryć hotele do pobrania.
+        """
+        for spec in self.specs:
+            url = build_search_url(*spec)
+            for suffix in LISTING_SUFFIXES:
+                yield scrapy.Request(f"{url}{suffix}", callback=self.parse, cb_kwargs={'spec': spec}, priority=1)
+
+    def parse(self, response, spec):
+        """
+        Przetwarza stronę wyników jednego wyszukiwania.
+
+        Parametry:
+        - response: scrapy.http.Response - Odpowiedź HTTP ze stroną wyników.
+        - spec: SearchSpec - Wyszukiwanie, do którego należy strona.
+        """
+        if self.parse_pool is not None:
+            return self._parse_in_pool(response, spec)
+        return self._handle_hotels(extract_hotel_cards(response.body, response.encoding, response.url), spec)
+
+    async def _parse_in_pool(self, response, spec):
+        hotels = await self.parse_pool.submit(extract_hotel_cards, response.body, response.encoding, response.url)
+        return list(self._handle_hotels(hotels, spec))
+
+    def _handle_hotels(self, hotels, spec):
+        """
+        Zapisuje nowe hotele z wyszukiwania i zleca pobranie stron hoteli, których nie ma w pamięci podręcznej.
+        """
+        for hotel in hotels:
+            key = canonical_link(hotel['link'])
+            if (spec, key) in self.seen_links:
+                continue  # Pomijanie duplikatów w ramach jednego wyszukiwania
+            self.seen_links.add((spec, key))
+            self.listings.append({**hotel, 'canonical_link': key, **spec._asdict()})
+
+            if key in self.requested_details:
+                continue
+            if key in self.detail_cache:
+                self.cached_details.add(key)
+            else:
+                self.requested_details.add(key)
+                yield scrapy.Request(key, callback=self.parse_details, cb_kwargs={'key': key})
+
+    def parse_details(self, response, key):
+        """
+        Przetwarza stronę hotelu i zapisuje jej dane we wspólnej pamięci podręcznej.
+
+        Parametry:
+        - response: scrapy.http.Response - Odpowiedź HTTP ze stroną hotelu.
+        - key: str - Kanoniczny link do strony hotelu.
+        """
+        if self.parse_pool is not None:
+            return self._parse_details_in_pool(response, key)
+        self._store_details(key, extract_hotel_details(response.body, response.encoding))
+
+    async def _parse_details_in_pool(self, response, key):
+        self._store_details(key, await self.parse_pool.submit(extract_hotel_details, response.body, response.encoding))
+        return []
+
+    def _store_details(self, key, details):
+        if details is None:
+            self.logger.warning(f"No hotel data found for link: {key}")
+        self.detail_cache.put(key, details)
+
+    def close(self, reason):
+        """
+        Zamyka pulę procesów po zakończeniu scrapowania.
+
+        Parametry:
+        - reason: str - Powód zakończenia działania Scrapera.
+        """
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+
+
+def load_specs(file_path):
+    """
+    Wczytuje listę wyszukiwań z pliku CSV z kolumnami: city, checkin, checkout, adults.
+
+    Parametry:
+    - file_path: str - Ścieżka do pliku CSV.
+
+    Zwraca:
+    - list[SearchSpec] - Lista wyszukiwań.
+    """
+    df = pd.read_csv(file_path, dtype={'city': 'string', 'checkin': 'string', 'checkout': 'string'})
+    missing = set(SEARCH_COLUMNS) - set(df.columns)
+    if missing:
+        raise ValueError(f"Brak kolumn w pliku z wyszukiwaniami: {sorted(missing)}")
+    specs = []
+    # Numer wiersza jak w pliku (wiersz 1 to nagłówek)
+    for line, row in enumerate(df[SEARCH_COLUMNS].itertuples(index=False), start=2):
+        if pd.isna(row.city) or not row.city.strip():
+            raise ValueError(f"Wiersz {line}: brak miejsca docelowego (city)")
+        if pd.isna(row.checkin) or pd.isna(row.checkout):
+            raise ValueError(f"Wiersz {line} ({row.city}): brak daty zameldowania lub wymeldowania")
+        try:
+            checkin, checkout = pd.Timestamp(row.checkin).date(), pd.Timestamp(row.checkout).date()
+        except ValueError:
+            raise ValueError(f"Wiersz {line} ({row.city}): niepoprawna data: {row.checkin} - {row.checkout}")
+        if checkin >= checkout:
+            raise ValueError(f"Wiersz {line}: niepoprawne daty dla {row.city}: {checkin} - {checkout}")
+        adults = pd.to_numeric(row.adults, errors='coerce')
+        if pd.isna(adults) or adults < 1 or adults != int(adults):
+            raise ValueError(f"Wiersz {line} ({row.city}): niepoprawna liczba dorosłych (adults): {row.adults}")
+        specs.append(SearchSpec(row.city.strip(), str(checkin), str(checkout), int(adults)))
+    return specs
+
+
+def assemble_dataset(listings, detail_cache):
+    """
+    Łączy surowe wiersze z wyników wszystkich wyszukiwań w jeden typowany zbiór danych.
+
+    Parametry:
+    - listings: list[dict] - Wiersze zebrane przez BatchHotelsSpider.
+    - detail_cache: DetailCache - Pamięć podręczna z danymi stron hoteli.
+
+    Zwraca:
+    - pd.DataFrame - Dane z wyników wyszukiwań, uzupełnione o typ hotelu i współrzędne.
+    """
+    if not listings:
+        return pd.DataFrame()
+    df, report = normalize_listings(pd.DataFrame(listings))
+    print_parse_report(report)
+    df = df.merge(detail_cache.to_frame(), on='canonical_link', how='left')
+    df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
+    df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
+    df['nights'] = (pd.to_datetime(df['checkout']) - pd.to_datetime(df['checkin'])).dt.days
+    return df
+
+
+def write_dataset(df, output_dir):
+    """
+    Zapisuje zbiór danych jako Parquet partycjonowany po mieście i dacie zameldowania.
+    Ponowny zapis tego samego wyszukiwania zastępuje jego partycję.
+
+    Parametry:
+    - df: pd.DataFrame - Zbiór danych z assemble_dataset.
+    - output_dir: str - Katalog docelowy.
+    """
+    df.to_parquet(output_dir, partition_cols=PARTITION_COLUMNS, index=False,
+                  existing_data_behavior='delete_matching')
+    print(f"Zapisano {len(df)} wierszy do: {output_dir}")
+
+
+def run_batch(specs, output_dir="batchResults", concurrency=16, parse_workers=None,
+              cache_path="hotel_details_cache.csv", detail_cache=None, snapshot_db=SNAPSHOT_DB):
+    """
+    Scrapuje wiele wyszukiwań współbieżnie w jednym procesie (jeden reaktor Twisted, jeden limit żądań).
+
+    Parametry:
+    - specs: list[SearchSpec] - Lista wyszukiwań.
+    - output_dir: str | None - Katalog partycjonowanego zbioru Parquet (None - bez zapisu).
+    - concurrency: int - Globalny limit równoległych żądań dla wszystkich wyszukiwań razem.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+    - cache_path: str | None - Plik pamięci podręcznej danych ze stron hoteli, współdzielony między uruchomieniami.
+    - detail_cache: DetailCache (opcjonalnie) - Gotowa pamięć podręczna (zamiast wczytywania z cache_path).
+    - snapshot_db: str | None - Baza historii cen, do której dopisywana jest migawka (None - bez zapisu).
+
+    Zwraca:
+    - pd.DataFrame - Zebrany zbiór danych.
+    """
+    if detail_cache is None:
+        detail_cache = DetailCache(cache_path)
+    process = CrawlerProcess(settings={
+        'CONCURRENT_REQUESTS': concurrency,
+        'CONCURRENT_REQUESTS_PER_DOMAIN': concurrency,
+    })
+    crawler = process.create_crawler(BatchHotelsSpider)
+    process.crawl(crawler, specs=specs, detail_cache=detail_cache, parse_workers=parse_workers)
+    process.start()
+
+    print(f"Strony hoteli: pobrane {len(crawler.spider.requested_details)}, "
+          f"z pamięci podręcznej {len(crawler.spider.cached_details)}")
+    detail_cache.save()
+    dataset = assemble_dataset(crawler.spider.listings, detail_cache)
+    if output_dir and not dataset.empty:
+        write_dataset(dataset, output_dir)
+    if snapshot_db and not dataset.empty:
+        SnapshotStore(snapshot_db).append(dataset)
+        print(f"Dopisano {len(dataset)} wierszy do historii cen: {snapshot_db}")
+    return dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wsadowe scrapowanie wielu wyszukiwań Booking.com.")
+    parser.add_argument("specs", help="plik CSV z kolumnami: city, checkin, checkout, adults")
+    parser.add_argument("-o", "--output", default="batchResults", help="katalog wynikowego zbioru Parquet")
+    parser.add_argument("--concurrency", type=int, default=16, help="globalny limit równoległych żądań")
+    parser.add_argument("--parse-workers", type=int, default=0, help="procesy do parsowania HTML (0 - wyłączone)")
+    parser.add_argument("--cache", default="hotel_details_cache.csv", help="plik pamięci podręcznej stron hoteli")
+    args = parser.parse_args(argv)
+
+    run_batch(load_specs(args.specs), output_dir=args.output, concurrency=args.concurrency,
+              parse_workers=args.parse_workers, cache_path=args.cache)
+
+
+if __name__ == "__main__":
+    main()
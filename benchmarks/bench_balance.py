@@ -0,0 +1,119 @@
+"""
+Benchmark trybu "best balance": front Pareto (ranking.skyline) i ranking ważony (RankingIndex.balanced_top_n).
+
+Porównuje front liczony sortowaniem i porcjami z naiwnym porównaniem każdej pary hoteli (tylko dla
+mniejszych zbiorów) oraz zapytanie po zmianie wag z przeliczeniem wyniku dla wszystkich hoteli z zakresu cen.
+
+Dwa rodzaje danych: niezależne kryteria (build_hotels) i kryteria przeciwstawne - droższe hotele mają lepszą
+ocenę, więcej recenzji i są bliżej centrum. Wtedy front obejmuje większość hoteli, a skyline kończy się
+po MAX_FRONT punktach; "front" to wtedy liczba wyznaczonych punktów (z plusem), a wynik best balance jest
+sprawdzany z pełnym frontem naiwnym.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_balance.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from ranking import BALANCE_CRITERIA, MAX_FRONT, RankingIndex, normalized_criteria, skyline  # noqa: E402
+
+
+def naive_skyline(values):
+    """
+    Front Pareto przez porównanie każdej pary wierszy (punkt odniesienia, pamięć O(n^2)).
+    """
+    dominated = np.zeros(len(values), dtype=bool)
+    for row in values:
+        dominated |= (row >= values).all(axis=1) & (row > values).any(axis=1)
+    return np.flatnonzero(~dominated)
+
+
+def naive_balanced_top_n(hotels, values, weights, price_range, n=5):
+    """
+    Wynik ważony dla wszystkich hoteli z zakresu cen i n najlepszych (bez frontu z pamięci).
+    """
+    mask = (hotels['price'] >= price_range[0]) & (hotels['price'] <= price_range[1])
+    scores = values[mask.to_numpy()] @ weights
+    return hotels[mask].iloc[np.argsort(-scores, kind='stable')[:n]]
+
+
+def anticorrelated_hotels(count, seed=0):
+    """
+    Hotele z kryteriami przeciwstawnymi: znormalizowane kryteria sumują się do ok. 1 (punkty blisko
+    hiperpłaszczyzny), więc hotel lepszy w jednym kryterium jest gorszy w pozostałych.
+    """
+    rng = np.random.default_rng(seed)
+    scores = np.clip(rng.dirichlet(np.ones(4), count) + rng.normal(0, 0.01, (count, 4)), 0, 1)
+    hotels = build_hotels(count)
+    hotels['price'] = (100 + 1900 * (1 - scores[:, 0])).round()
+    hotels['distance'] = (10000 * (1 - scores[:, 1])).round()
+    hotels['rate_review'] = (1 + 9 * scores[:, 2]).round(1)
+    hotels['num_review'] = np.expm1(scores[:, 3] * np.log1p(5000)).round()
+    return hotels
+
+
+def main(sizes, queries):
+    rng = np.random.default_rng(0)
+    print(f"{'data':>10} {'hotels':>7} {'front':>6} {'skyline ms':>11} {'naive ms':>9} {'weights ms':>11} "
+          f"{'rescore ms':>11}")
+    for kind, build in (('independent', build_hotels), ('anti', anticorrelated_hotels)):
+        for count in sizes:
+            run(kind, prepare_dataset(build(count)), queries, rng)
+
+
+def run(kind, hotels, queries, rng):
+    count = len(hotels)
+    values = normalized_criteria(hotels)
+
+    start = time.perf_counter()
+    front = skyline(values, max_front=MAX_FRONT)
+    skyline_ms = (time.perf_counter() - start) * 1000
+    complete = len(front) < MAX_FRONT
+    weight_sets = [dict(zip(BALANCE_CRITERIA, w)) for w in rng.integers(0, 11, (queries, 4))]
+    index = RankingIndex(hotels)
+    price_range = (int(hotels['price'].min()), int(hotels['price'].max()))
+    naive_ms = float('nan')
+    if count <= 20000:
+        start = time.perf_counter()
+        naive = naive_skyline(values)
+        naive_ms = (time.perf_counter() - start) * 1000
+        # Niepełny front to część pełnego; wynik best balance - n najlepszych hoteli pełnego frontu
+        assert np.array_equal(naive, front) if complete else np.isin(front, naive).all()
+        for weights in weight_sets[:10]:
+            scores = values[naive] @ index.weight_vector(weights)
+            expected = set(hotels.index[naive[np.argsort(-scores, kind='stable')[:5]]])
+            assert set(index.balanced_top_n(weights, price_range=price_range).index) == expected, weights
+
+    index.pareto_front(price_range)
+    samples = []
+    for weights in weight_sets:
+        start = time.perf_counter()
+        index.balanced_top_n(weights, price_range=price_range)
+        samples.append(time.perf_counter() - start)
+    weights_ms = statistics.median(samples) * 1000
+    samples = []
+    for weights in weight_sets:
+        start = time.perf_counter()
+        naive_balanced_top_n(hotels, values, index.weight_vector(weights), price_range)
+        samples.append(time.perf_counter() - start)
+    rescore_ms = statistics.median(samples) * 1000
+    front_size = f"{len(front)}{'' if complete else '+'}"
+    print(f"{kind:>10} {count:>7} {front_size:>6} {skyline_ms:>11.1f} {naive_ms:>9.1f} {weights_ms:>11.2f} "
+          f"{rescore_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=30)
+    args = parser.parse_args()
+    main(args.sizes, args.queries)
@@ -0,0 +1,66 @@
+"""
+Pomiar zimnego startu: import headless_scraper vs import app.
+
+Każdy import jest mierzony w świeżym procesie Pythona (mediana z --runs prób). Skrypt sprawdza też,
+że headless_scraper nie ładuje Streamlit, Plotly, Folium ani matplotlib, i porównuje czas z celem.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_cold_start.py --runs 5 --target 1.0
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_MODULES = ['streamlit', 'plotly', 'folium', 'matplotlib', 'streamlit_folium']
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted(name for name in {ui_modules!r} if name in sys.modules)
+print(json.dumps({{"seconds": elapsed, "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                   "ui_modules": loaded}}))
+"""
+
+
+def measure(module, runs):
+    """
+    Importuje moduł w `runs` świeżych procesach i zwraca medianę czasu, pamięci oraz załadowane moduły UI.
+    """
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, ui_modules=UI_MODULES)],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        samples.append(json.loads(output))
+    return {
+        "seconds": statistics.median(sample["seconds"] for sample in samples),
+        "max_rss_mb": statistics.median(sample["max_rss_mb"] for sample in samples),
+        "ui_modules": samples[0]["ui_modules"],
+    }
+
+
+def main(runs, target):
+    results = {module: measure(module, runs) for module in ("headless_scraper", "app")}
+    for module, result in results.items():
+        print(f"{module:17s} import={result['seconds']:.2f} s  max_rss={result['max_rss_mb']:.0f} MB  "
+              f"ui_modules={result['ui_modules']}")
+
+    headless = results["headless_scraper"]
+    ok = not headless["ui_modules"] and headless["seconds"] <= target
+    print(f"target: headless import <= {target:.2f} s without UI modules -> {'OK' if ok else 'FAILED'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=1.0, help="docelowy czas importu headless_scraper [s]")
+    args = parser.parse_args()
+    sys.exit(main(args.runs, args.target))
@@ -0,0 +1,118 @@
+"""
+Benchmark budowania mapy hoteli: dawny create_map (iterrows, osobny folium.Marker i folium.Popup z własnym
+blokiem <style> dla każdego hotelu) vs create_map oparty na kolumnach (map_layers.HotelMarkerCluster).
+
+Mierzy czas zbudowania mapy i wygenerowania HTML (to, co st_folium wysyła do przeglądarki) oraz rozmiar HTML.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_create_map.py --sizes 100 1000 10000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import MarkerCluster
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_map  # noqa: E402
+
+
+def build_hotels(count, seed=0):
+    """
+    Syntetyczne hotele wokół centrum Krakowa.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'name': [f'Hotel {i} "Pod Wawelem" & Spa' for i in range(count)],
+        'address': [f"ul. Testowa {i}, Kraków" for i in range(count)],
+        'price': rng.integers(100, 2000, count),
+        'rating_stars': rng.integers(0, 6, count),
+        'num_review': rng.integers(0, 5000, count),
+        'rate_review': rng.uniform(5, 10, count).round(1),
+        'distance': rng.uniform(0, 10000, count).round(),
+        'latitude': 50.06 + rng.normal(0, 0.03, count),
+        'longitude': 19.94 + rng.normal(0, 0.05, count),
+    })
+
+
+def legacy_create_map(scraped_data, top_5_hotels=None, filter_top_5=False):
+    """
+    Dawna implementacja create_map (punkt odniesienia).
+    """
+    scraped_data['latitude'] = pd.to_numeric(scraped_data['latitude'], errors='coerce')
+    scraped_data['longitude'] = pd.to_numeric(scraped_data['longitude'], errors='coerce')
+    scraped_data = scraped_data.dropna(subset=['latitude', 'longitude'])
+    if filter_top_5 and top_5_hotels is not None:
+        scraped_data = top_5_hotels
+    m = folium.Map(location=[scraped_data['latitude'].mean(), scraped_data['longitude'].mean()], zoom_start=12,
+                   tiles='cartodbpositron')
+    marker_cluster = MarkerCluster(zoom_to_bounds_on_click=True).add_to(m)
+    for _, row in scraped_data.iterrows():
+        popup_html = folium.Popup(
+            f""" <style> @import url('https://fonts.googleapis.com/css2?family=Roboto+Mono:ital,wght@0,100..700;1,
+            100..700&display=swap');
+
+            div {{
+            font-family: 'Roboto Mono', sans-serif !important;
+            font-weight: 700 !important;
+            text-align: left !important;
+        }}
+            </style>
+
+            <div>
+                <strong>{row['name']}</strong><br>
+                <b>price:</b> {row['price']} PLN<br>
+                <b>rating:</b> {row.get('rating_stars', 'N/A')}<br>
+                <b>number of reviews:</b> {row.get('num_review', 'N/A')}<br>
+                <b>address:</b> {row['address']}<br>
+            </div>
+            """,
+            max_width=400
+        )
+        is_top_5 = top_5_hotels is not None and row['name'] in top_5_hotels['name'].values
+        folium.Marker(
+            location=[row['latitude'], row['longitude']],
+            popup=popup_html,
+            tooltip=f"{row['name']} ({row['price']} PLN)",
+            icon=folium.Icon(color="pink" if is_top_5 else "cadetblue", icon_color='beige',
+                             icon="star" if is_top_5 else "heart")
+        ).add_to(marker_cluster)
+    return m
+
+
+def measure(build, hotels, repeat):
+    """
+    Zwraca medianę czasu (budowa mapy + HTML) w sekundach i rozmiar HTML w bajtach.
+    """
+    samples, size = [], 0
+    for _ in range(repeat):
+        data = hotels.copy()
+        start = time.perf_counter()
+        html = build(data, data.nsmallest(5, 'price')).get_root().render()
+        samples.append(time.perf_counter() - start)
+        size = len(html.encode('utf-8'))
+    return statistics.median(samples), size
+
+
+def main(sizes, repeat):
+    print(f"{'hotels':>7} {'legacy s':>9} {'legacy KB':>10} {'columns s':>10} {'columns KB':>11} {'speedup':>8}")
+    for count in sizes:
+        hotels = build_hotels(count)
+        legacy_time, legacy_size = measure(legacy_create_map, hotels, repeat)
+        new_time, new_size = measure(create_map, hotels, repeat)
+        print(f"{count:>7} {legacy_time:>9.3f} {legacy_size / 1024:>10.0f} {new_time:>10.3f} {new_size / 1024:>11.0f} "
+              f"{legacy_time / new_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
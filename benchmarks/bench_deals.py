@@ -0,0 +1,68 @@
+"""
+Benchmark oceny okazji: deals.deal_scores (mediany i MAD wszystkich grup naraz przez groupby) vs pętla
+po hotelach, która dla każdego hotelu osobno szuka podobnych hoteli maskami i liczy medianę.
+Pętla jest liczona dla próbki hoteli, a jej czas dla całego zbioru - oszacowany.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_deals.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from deals import MIN_PEERS, MIN_SPREAD, deal_scores, peer_levels  # noqa: E402
+
+
+def naive_score(log_price, levels, row):
+    """
+    Ocena jednego hotelu: pierwsza grupa podobnych hoteli z co najmniej MIN_PEERS cenami.
+    """
+    known = ~np.isnan(log_price)
+    for keys in levels:
+        peers = known.copy()
+        for values in keys.values():
+            peers &= values == values[row]
+        if peers.sum() >= MIN_PEERS:
+            break
+    else:
+        peers = known
+    median = np.median(log_price[peers])
+    spread = np.median(np.abs(log_price[peers] - median)) * 1.4826
+    return (median - log_price[row]) / max(spread, MIN_SPREAD)
+
+
+def main(sizes, sample):
+    rng = np.random.default_rng(0)
+    print(f"{'hotels':>7} {'grouped ms':>11} {'loop ms (est.)':>15} {'same':>5}")
+    for count in sizes:
+        hotels = build_hotels(count)
+        hotels['hotel_type'] = rng.choice(['Hotel', 'Hostel', 'Apartament', 'Pensjonat'], count)
+        hotels = prepare_dataset(hotels, 2)
+
+        start = time.perf_counter()
+        scores = deal_scores(hotels)['deal_score'].to_numpy()
+        grouped_ms = (time.perf_counter() - start) * 1000
+
+        rows = rng.choice(count, min(sample, count), replace=False)
+        log_price = np.log(hotels['price_per_night'].to_numpy(dtype='float64'))
+        start = time.perf_counter()
+        levels = peer_levels(hotels)
+        expected = np.array([naive_score(log_price, levels, row) for row in rows])
+        loop_ms = (time.perf_counter() - start) * 1000 * count / len(rows)
+        same = np.allclose(scores[rows], expected.round(2), atol=0.011)
+        print(f"{count:>7} {grouped_ms:>11.1f} {loop_ms:>15.0f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--sample", type=int, default=200, help="hotels scored by the loop")
+    args = parser.parse_args()
+    main(args.sizes, args.sample)
@@ -0,0 +1,88 @@
+"""
+Benchmark tego, co st_folium robi przy każdym rerunie aplikacji dla tej samej (zbuforowanej) mapy:
+renderowanie warstwy hoteli do skryptu i rozmiar argumentów komponentu wysyłanych do przeglądarki.
+
+Porównuje warstwę renderowaną od nowa przy każdym wywołaniu (szablon Jinja parsowany za każdym razem)
+z map_layers.HotelMarkerCluster, który renderuje swój skrypt raz. Wywołanie komponentu jest podmienione,
+więc pomiar nie wymaga przeglądarki ani serwera Streamlit.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_map_payload.py --sizes 1000 10000
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+import folium
+from folium.plugins import MarkerCluster
+import streamlit_folium
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from map_layers import HotelMarkerCluster  # noqa: E402
+
+
+class UncachedHotelMarkerCluster(HotelMarkerCluster):
+    """
+    Ta sama warstwa, ale renderowana jak zwykły MarkerCluster (punkt odniesienia).
+    """
+
+    render = MarkerCluster.render
+
+
+def build_map(layer, hotels):
+    m = folium.Map(location=[hotels['latitude'].mean(), hotels['longitude'].mean()], zoom_start=12,
+                   tiles='cartodbpositron')
+    layer(hotels, top_names=set(hotels.nsmallest(5, 'price')['name']), zoom_to_bounds_on_click=True).add_to(m)
+    return m
+
+
+def measure(m, repeat, **kwargs):
+    """
+    Zwraca medianę czasu wywołania st_folium w sekundach, rozmiar argumentów komponentu i rozmiar
+    początkowego stanu odsyłanego przez mapę (w bajtach).
+    """
+    sent = {}
+
+    def component(**component_kwargs):
+        sent.update(component_kwargs)
+        return component_kwargs['default']
+
+    original, streamlit_folium._component_func = streamlit_folium._component_func, component
+    try:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            streamlit_folium.st_folium(m, width=1200, height=1200, **kwargs)
+            samples.append(time.perf_counter() - start)
+    finally:
+        streamlit_folium._component_func = original
+    size = len(json.dumps(sent, default=str).encode('utf-8'))
+    return statistics.median(samples), size, len(json.dumps(sent['default']).encode('utf-8'))
+
+
+def main(sizes, repeat):
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    print(f"{'hotels':>7} {'uncached ms':>12} {'cached ms':>10} {'args KB':>8} {'speedup':>8} "
+          f"{'state B (all)':>14} {'state B ([])':>13}")
+    for count in sizes:
+        hotels = build_hotels(count)
+        uncached_time, _, state_size = measure(build_map(UncachedHotelMarkerCluster, hotels), repeat)
+        # Przy returned_objects=[] stan mapy jest stały, więc kliknięcia i przesunięcia nie wywołują rerunu
+        cached_time, size, empty_state_size = measure(build_map(HotelMarkerCluster, hotels), repeat,
+                                                      returned_objects=[])
+        print(f"{count:>7} {uncached_time * 1000:>12.1f} {cached_time * 1000:>10.1f} {size / 1024:>8.0f} "
+              f"{uncached_time / cached_time:>7.1f}x {state_size:>14} {empty_state_size:>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
@@ -0,0 +1,83 @@
+"""
+Benchmark normalizacji pól z kart hoteli: czyszczenie per element (dotychczasowy kod w HotelsSpider.parse)
+vs kolumnowa normalizacja w listing_normalization.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_normalization.py --rows 200000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from listing_normalization import normalize_listings  # noqa: E402
+
+
+def clean_per_item(raw_price, raw_distance, raw_rate_review, raw_reviews):
+    """
+    Czyszczenie jednej karty w stylu dotychczasowego HotelsSpider.parse.
+    """
+    clean_price = (
+        int(raw_price.replace(' ', '').replace('zł', '').strip().encode('ascii', 'ignore').decode('ascii'))
+        if raw_price else None
+    )
+    if raw_distance:
+        distance_value, distance_unit = raw_distance.replace(',', '.').split(' ')[:2]
+        distance_value = float(distance_value.strip())
+        clean_distance = distance_value * 1000 if distance_unit.lower() == 'km' else distance_value
+    else:
+        clean_distance = None
+    clean_rate_review = (
+        float(raw_rate_review.replace(',', '.').split(' ')[2].strip()) if raw_rate_review else None
+    )
+    clean_reviews = int(re.sub(r'\D', '', raw_reviews)) if raw_reviews else None
+    return clean_price, clean_distance, clean_rate_review, clean_reviews
+
+
+def build_raw_frame(rows, seed=0):
+    """
+    Generuje surowe teksty w formacie kart booking.com.
+    """
+    rng = np.random.default_rng(seed)
+    price = rng.integers(80, 5000, rows)
+    km = rng.random(rows) < 0.7
+    distance = np.where(km, rng.integers(1, 200, rows) / 10, rng.integers(50, 999, rows))
+    return pd.DataFrame({
+        'price': [f"{p:,} zł".replace(',', '\xa0') for p in price],
+        'distance': [f"{d:.1f} km od centrum".replace('.', ',') if k else f"{int(d)} m od centrum"
+                     for d, k in zip(distance, km)],
+        'rate_review': [f"Z oceną {r:.1f}".replace('.', ',') for r in rng.integers(50, 100, rows) / 10],
+        'num_review': [f"{n:,} opinii".replace(',', ' ') for n in rng.integers(1, 20000, rows)],
+    })
+
+
+def main(rows):
+    raw = build_raw_frame(rows)
+
+    start = time.perf_counter()
+    per_item = [clean_per_item(*values) for values in raw.itertuples(index=False, name=None)]
+    per_item_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    normalized, report = normalize_listings(raw)
+    vectorized_s = time.perf_counter() - start
+
+    expected = pd.DataFrame(per_item, columns=raw.columns)
+    for column in raw.columns:
+        assert np.allclose(expected[column].astype(float), normalized[column].astype(float)), column
+
+    print(f"rows={rows}  per-item={per_item_s * 1000:.1f} ms  vectorized={vectorized_s * 1000:.1f} ms  "
+          f"speedup={per_item_s / vectorized_s:.2f}x")
+    print(report.to_string(index=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    main(parser.parse_args().rows)
@@ -0,0 +1,128 @@
+"""
+Benchmark parsowania stron wyników w wątku reaktora vs w puli procesów (`parse_workers`).
+
+Symuluje napływ odpowiedzi HTTP ze stałą częstotliwością (jak przy dużej współbieżności pobierania)
+i mierzy:
+- opóźnienie reaktora: o ile spóźnia się zegar tykający co TICK_MS,
+- przepustowość: ile stron wyników na sekundę zostaje sparsowanych.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_parse_pool.py --pages 200 --cards 25 --workers 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper_booking import HotelsSpider  # noqa: E402  (import usuwa reaktor z sys.modules)
+from scrapy.http import HtmlResponse  # noqa: E402
+from twisted.internet import defer, reactor, task  # noqa: E402
+
+TICK_MS = 5
+
+CARD_HTML = """
+<div data-testid="property-card">
+  <h3 class="aab71f8e4e"><a href="/hotel/pl/hotel-{page}-{i}.pl.html">link</a></h3>
+  <div data-testid="title">Hotel {page}-{i}</div>
+  <span data-testid="address">ul. Testowa {i}, Kraków</span>
+  <span data-testid="price-and-discounted-price">{price} zł</span>
+  <span data-testid="distance">{distance} km od centrum</span>
+  <div data-testid="review-score">Z oceną 8,{i_mod}<div class="abf093bdfe">{reviews} opinii</div></div>
+  <div data-testid="rating-squares"><span class="fcd9eec8fb"></span><span class="fcd9eec8fb"></span></div>
+</div>
+"""
+
+
+def build_page(page, cards):
+    """
+    Buduje syntetyczną stronę wyników z zadaną liczbą kart hoteli.
+    """
+    body = "".join(
+        CARD_HTML.format(page=page, i=i, i_mod=i % 10, price=200 + i, distance=f"{i % 7},{i % 10}",
+                         reviews=f"1 {i:03d}")
+        for i in range(cards)
+    )
+    return f"<html><body>{body}</body></html>".encode("utf-8")
+
+
+@defer.inlineCallbacks
+def run_mode(pages, cards, workers, arrival_ms):
+    """
+    Przepuszcza `pages` odpowiedzi przez HotelsSpider.parse i zwraca statystyki opóźnień i przepustowości.
+    """
+    spider = HotelsSpider(url="https://www.booking.com/searchresults.pl.html?ss=bench", parse_workers=workers)
+    responses = [
+        HtmlResponse(url=f"https://www.booking.com/searchresults.pl.html?ss=bench&page={page}",
+                     body=build_page(page, cards), encoding="utf-8")
+        for page in range(pages)
+    ]
+
+    lags = []
+    last_tick = [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        lags.append((now - last_tick[0]) * 1000 - TICK_MS)
+        last_tick[0] = now
+
+    clock = task.LoopingCall(tick)
+    clock.start(TICK_MS / 1000, now=False)
+
+    done = []
+    all_done = defer.Deferred()
+
+    def handle(response):
+        result = spider.parse(response)
+        if hasattr(result, "__await__"):
+            d = defer.ensureDeferred(result)
+        else:
+            d = defer.succeed(list(result))
+        d.addCallback(lambda items: done.append(len(items)))
+        d.addCallback(lambda _: len(done) == pages and not all_done.called and all_done.callback(None))
+        d.addErrback(lambda failure: not all_done.called and all_done.errback(failure))
+
+    start = time.perf_counter()
+    for index, response in enumerate(responses):
+        reactor.callLater(index * arrival_ms / 1000, handle, response)
+    yield all_done
+    elapsed = time.perf_counter() - start
+
+    clock.stop()
+    if spider.parse_pool is not None:
+        spider.parse_pool.shutdown()
+
+    lags = sorted(max(lag, 0.0) for lag in lags) or [0.0]
+    return {
+        "mode": f"pool({workers})" if workers else "reactor",
+        "pages/s": pages / elapsed,
+        "items": sum(done),
+        "lag p50 ms": statistics.median(lags),
+        "lag p95 ms": lags[int(0.95 * (len(lags) - 1))],
+        "lag max ms": lags[-1],
+    }
+
+
+@defer.inlineCallbacks
+def main(args):
+    try:
+        results = []
+        for workers in (0, args.workers):
+            results.append((yield run_mode(args.pages, args.cards, workers, args.arrival_ms)))
+        for result in results:
+            print("  ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                            for key, value in result.items()))
+    finally:
+        reactor.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--cards", type=int, default=25)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--arrival-ms", type=float, default=2.0, help="odstęp między kolejnymi odpowiedziami")
+    reactor.callWhenRunning(main, parser.parse_args())
+    reactor.run()
@@ -0,0 +1,101 @@
+"""
+Benchmark czasu rerunu aplikacji po zmianie jednego widżetu (streamlit.testing AppTest, bez przeglądarki).
+Dane hoteli są wstawiane do session_state tak, jak po wyszukiwaniu. Zmieniane widżety: suwak ceny na
+mapie, oś X wykresu punktowego, kolor treemapy i zakres korelacji.
+
+AppTest zawsze wykonuje cały skrypt (mierzy zysk z rysowania tylko wybranej zakładki), więc rerun samego
+fragmentu (st.fragment), jak w przeglądarce, jest mierzony osobnym skryptem, który rysuje tylko ten panel.
+
+Uruchomienie (z katalogu głównego repozytorium; --app pozwala zmierzyć inną wersję, np. sprzed zmiany):
+    python benchmarks/bench_rerun.py --hotels 2000
+    git show HEAD~1:app.py > /tmp/app_before.py && python benchmarks/bench_rerun.py --app /tmp/app_before.py
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import content_hash, prepare_dataset  # noqa: E402
+
+# (zakładka, fragment, rodzaj widżetu, etykieta, dwie wartości do przełączania)
+CHANGES = [
+    ("hotels info", "map_panel()", "slider", "select price range (PLN)", None),
+    ("understand the trends", "scatter_panel(False)", "selectbox", "select X-axis", ('rate_review', 'distance')),
+    ("understand the trends", "treemap_panel(False)", "radio", "choose color by", ('rate_review', 'num_review')),
+    ("understand the trends", "correlation_panel(False)", "slider", "Select correlation range",
+     ((-0.5, 1.0), (-1.0, 1.0))),
+]
+
+
+def widget(app, kind, label):
+    return next(element for element in getattr(app, kind) if element.label == label)
+
+
+def new_app(script, prepared, dataset_hash, from_string=False):
+    app = (AppTest.from_string if from_string else AppTest.from_file)(script, default_timeout=300)
+    app.session_state['scraped_data'] = prepared
+    app.session_state['dataset_hash'] = dataset_hash
+    app.run()
+    return app
+
+
+def rerun_ms(app, tab, kind, label, values, repeat):
+    """
+    Mediana czasu rerunu po przełączeniu widżetu między dwiema wartościami.
+    """
+    if any(radio.key == 'active_tab' for radio in app.radio):
+        app.radio(key='active_tab').set_value(tab).run()
+    if values is None:
+        low, high = widget(app, kind, label).value
+        values = ((low + 1, high), (low, high))
+    times = []
+    for index in range(repeat):
+        widget(app, kind, label).set_value(values[index % 2])
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return statistics.median(times) * 1000
+
+
+def main(app_path, hotels_count, repeat):
+    hotels = build_hotels(hotels_count)
+    hotels['link'] = 'https://www.booking.com'
+    hotels['hotel_type'] = np.random.default_rng(0).choice(['Hotel', 'Hostel', 'Apartament'], hotels_count)
+    prepared = prepare_dataset(hotels, 2)
+    # Pliki zapisywane przez aplikację (np. baza historii cen) poza repozytorium; motywy czytane z data/
+    os.chdir(tempfile.mkdtemp())
+    os.symlink(os.path.join(ROOT, 'data'), 'data')
+    sys.path.insert(0, os.path.dirname(os.path.abspath(app_path)))
+    module = os.path.splitext(os.path.basename(app_path))[0]
+    dataset_hash = f"{content_hash(hotels)}-2"
+    app = new_app(os.path.abspath(app_path), prepared, dataset_hash)
+    panels = vars(__import__(module))
+
+    print(f"{'tab':>22} {'widget':>25} {'rerun ms':>9} {'fragment ms':>12}")
+    for tab, fragment, kind, label, values in CHANGES:
+        script_ms = rerun_ms(app, tab, kind, label, values, repeat)
+        fragment_ms = "-"
+        if fragment.split("(")[0] in panels:
+            panel = new_app(f"from {module} import *\n{fragment}", prepared, dataset_hash, from_string=True)
+            fragment_ms = f"{rerun_ms(panel, tab, kind, label, values, repeat):.0f}"
+        print(f"{tab:>22} {label:>25} {script_ms:>9.0f} {fragment_ms:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--hotels", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.app, args.hotels, args.repeat)
@@ -0,0 +1,68 @@
+"""
+Benchmark podobnych hoteli dla listy top 5: similar_hotels.SimilarHotels (wektory cech liczone raz, jedno
+zapytanie dla całej listy) vs osobne zapytanie dla każdego hotelu z cechami liczonymi od nowa i pełnym
+sortowaniem odległości.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_similar_hotels.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from similar_hotels import SimilarHotels, feature_matrix  # noqa: E402
+
+
+def naive_similar(hotels, rows, k):
+    """
+    Dla każdego hotelu osobno: cechy od nowa, odległości do wszystkich i pełne sortowanie.
+    """
+    results = []
+    for row in rows:
+        features = feature_matrix(hotels).astype('float64')
+        distances = ((features - features[row]) ** 2).sum(axis=1)
+        distances[hotels['name'].to_numpy() == hotels['name'].iloc[row]] = np.inf
+        results.append(np.argsort(distances, kind='stable')[:k])
+    return np.array(results)
+
+
+def main(sizes, repeat, k):
+    rng = np.random.default_rng(0)
+    print(f"{'hotels':>7} {'build ms':>9} {'batched ms':>11} {'naive ms':>9} {'same':>5}")
+    for count in sizes:
+        hotels = build_hotels(count)
+        hotels['hotel_type'] = rng.choice(['Hotel', 'Hostel', 'Apartament', 'Pensjonat'], count)
+        hotels = prepare_dataset(hotels, 2)
+        start = time.perf_counter()
+        index = SimilarHotels(hotels)
+        build_ms = (time.perf_counter() - start) * 1000
+        rows = rng.choice(count, 5, replace=False)
+
+        batched, naive = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            similar, _ = index.similar(rows, k)
+            batched.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            expected = naive_similar(hotels, rows, k)
+            naive.append(time.perf_counter() - start)
+        same = all(set(a) == set(b) for a, b in zip(similar, expected))
+        print(f"{count:>7} {build_ms:>9.1f} {statistics.median(batched) * 1000:>11.2f} "
+              f"{statistics.median(naive) * 1000:>9.1f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--k", type=int, default=3)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat, args.k)
@@ -0,0 +1,96 @@
+"""
+Benchmark historii cen (SnapshotStore) na syntetycznej bazie z milionami wierszy.
+
+Mierzy czas zapytań: trajektoria ceny jednego hotelu, mediana ceny za noc według typu hotelu
+z ostatnich 30 dni (z agregatów rollups) oraz dla porównania ta sama mediana liczona dokładnie z surowych wierszy.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_snapshot_store.py --hotels 5000 --days 400
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot_store import SnapshotStore  # noqa: E402
+
+CITIES = ['Kraków', 'Gdańsk', 'Warszawa', 'Wrocław', 'Poznań']
+HOTEL_TYPES = ['Hotel', 'Apartament', 'Hostel', 'Pensjonat', 'Aparthotel']
+
+
+def build_store(path, hotels, days, seed=0):
+    """
+    Zapełnia bazę: każdy hotel ma jedną migawkę dziennie przez `days` dni.
+    """
+    rng = np.random.default_rng(seed)
+    store = SnapshotStore(path)
+    hotel_city = rng.choice(CITIES, hotels)
+    hotel_type = rng.choice(HOTEL_TYPES, hotels)
+    base_price = rng.integers(100, 900, hotels)
+    today = datetime.date.today()
+    for day in range(days):
+        scraped_at = datetime.datetime.combine(today - datetime.timedelta(days=days - day - 1), datetime.time(6))
+        checkin = (scraped_at.date() + datetime.timedelta(days=14)).isoformat()
+        checkout = (scraped_at.date() + datetime.timedelta(days=16)).isoformat()
+        price = (base_price * rng.uniform(0.8, 1.3, hotels)).round() * 2
+        store.append(pd.DataFrame({
+            'city': hotel_city, 'checkin': checkin, 'checkout': checkout, 'adults': 2,
+            'canonical_link': [f"https://www.booking.com/hotel/pl/h{i}.pl.html" for i in range(hotels)],
+            'name': [f"Hotel {i}" for i in range(hotels)], 'hotel_type': hotel_type, 'price': price,
+            'rate_review': 8.0, 'num_review': 100, 'rating_stars': 3, 'distance': 1000.0,
+            'latitude': 50.0, 'longitude': 19.9,
+        }), scraped_at=scraped_at)
+    return store
+
+
+def exact_median_by_type(store, days):
+    """
+    Dokładna mediana z surowych migawek (skan okna) - punkt odniesienia dla agregatów.
+    """
+    since = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+    rows = store.query("SELECT hotel_type, price_per_night FROM snapshots WHERE snapshot_date >= ?", (since,))
+    return rows.groupby('hotel_type')['price_per_night'].median()
+
+
+def timed(fn, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(hotels, days):
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        store = build_store(os.path.join(directory, "history.sqlite"), hotels, days)
+        rows = store.query("SELECT COUNT(*) AS n FROM snapshots")['n'].iloc[0]
+        print(f"rows={rows}  build={time.perf_counter() - start:.1f} s")
+
+        hotel = "https://www.booking.com/hotel/pl/h42.pl.html"
+        print(f"price_trajectory(hotel)            {timed(lambda: store.price_trajectory(hotel)):8.2f} ms")
+        print(f"median_price_by_type(30 days)      {timed(lambda: store.median_price_by_type(30)):8.2f} ms")
+        print(f"median_price_by_type(30 days, city) "
+              f"{timed(lambda: store.median_price_by_type(30, city='Kraków')):7.2f} ms")
+        print(f"distribution(price_range, 30 days) {timed(lambda: store.distribution(['price_range'], 30)):8.2f} ms")
+        print(f"exact median from raw rows        {timed(lambda: exact_median_by_type(store, 30)):8.2f} ms")
+        approx = store.median_price_by_type(30).set_index('hotel_type')['median_price_per_night']
+        exact = exact_median_by_type(store, 30)
+        print(f"max relative error of rollup median: {((approx - exact).abs() / exact).max():.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hotels", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=400)
+    args = parser.parse_args()
+    main(args.hotels, args.days)
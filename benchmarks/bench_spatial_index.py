@@ -0,0 +1,67 @@
+"""
+Benchmark wyszukiwania hoteli w pobliżu punktu: spatial_index.SpatialIndex (siatka posortowana po numerze
+komórki, haversine tylko dla kandydatów z okolicy) vs haversine do wszystkich hoteli i sortowanie.
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_spatial_index.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from spatial_index import SpatialIndex, haversine  # noqa: E402
+
+
+def median_ms(query, points):
+    samples = []
+    for point in points:
+        start = time.perf_counter()
+        query(point)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(sizes, queries, radius, k):
+    rng = np.random.default_rng(0)
+    points = list(zip(50.06 + rng.normal(0, 0.03, queries), 19.94 + rng.normal(0, 0.05, queries)))
+    print(f"{'hotels':>7} {'build ms':>9} {'radius ms':>10} {'full ms':>8} {'knn ms':>7} {'full knn ms':>12}")
+    for count in sizes:
+        hotels = prepare_dataset(build_hotels(count))
+        latitude, longitude = hotels['latitude'].to_numpy(), hotels['longitude'].to_numpy()
+        start = time.perf_counter()
+        index = SpatialIndex(hotels)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        def full_radius(point):
+            distances = haversine(*point, latitude, longitude)
+            rows = np.flatnonzero(distances <= radius)
+            return rows[np.argsort(distances[rows])]
+
+        def full_nearest(point):
+            distances = haversine(*point, latitude, longitude)
+            rows = np.argpartition(distances, k)[:k]
+            return rows[np.argsort(distances[rows])]
+
+        for point in points[:10]:
+            assert np.array_equal(np.sort(index.within(*point, radius)[0]), np.sort(full_radius(point)))
+        print(f"{count:>7} {build_ms:>9.1f} {median_ms(lambda p: index.within(*p, radius), points):>10.3f} "
+              f"{median_ms(full_radius, points):>8.3f} {median_ms(lambda p: index.nearest(*p, k), points):>7.3f} "
+              f"{median_ms(full_nearest, points):>12.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--radius", type=float, default=1000)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    main(args.sizes, args.queries, args.radius, args.k)
@@ -0,0 +1,85 @@
+"""
+Benchmark listy top 5 w wybranym zakresie cen (każde przesunięcie suwaka ceny w aplikacji):
+maska zakresu cen + nsmallest/nlargest na całych danych vs ranking.RankingIndex (gotowe permutacje
+kryteriów i wyszukiwanie binarne w posortowanych cenach).
+
+Sprawdza też, że oba sposoby wybierają te same hotele - również wtedy, gdy tylko kilka hoteli ma
+wartość kryterium (hotele bez wartości są pomijane).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python benchmarks/bench_top_n.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_create_map import build_hotels  # noqa: E402
+from dataset import prepare_dataset  # noqa: E402
+from ranking import TOP_N_CRITERIA, RankingIndex, in_price_range, top_n  # noqa: E402
+
+
+def random_ranges(count, seed=0):
+    """
+    Zakresy cen jak z suwaka: od wąskich po prawie cały zakres.
+    """
+    rng = np.random.default_rng(seed)
+    low = rng.integers(100, 1900, count)
+    return [(int(lo), int(min(lo + width, 2000))) for lo, width in zip(low, rng.integers(10, 1900, count))]
+
+
+def median_ms(query, ranges):
+    samples = []
+    for price_range in ranges:
+        start = time.perf_counter()
+        query(price_range)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def check_missing(count, valued=3, seed=0):
+    """
+    Kryteria z brakami: tylko `valued` hoteli ma wartość, więc top 5 ma mniej niż 5 hoteli i bez braków.
+    """
+    rng = np.random.default_rng(seed)
+    hotels = prepare_dataset(build_hotels(count))
+    hotels = hotels.assign(**{criterion: np.where(np.arange(count) < valued, hotels[criterion], np.nan)
+                              for criterion in TOP_N_CRITERIA})
+    index = RankingIndex(hotels)
+    for criterion in TOP_N_CRITERIA:
+        for price_range in [None] + random_ranges(20, seed=int(rng.integers(1000))):
+            expected = top_n(hotels[in_price_range(hotels, price_range)], criterion)
+            result = index.top_n(criterion, price_range=price_range)
+            assert list(result.index) == list(expected.index), (criterion, price_range)
+            assert result[criterion].notna().all(), (criterion, price_range)
+
+
+def main(sizes, queries):
+    check_missing(min(sizes))
+    print(f"{'hotels':>7} {'criterion':>13} {'mask ms':>8} {'index ms':>9} {'speedup':>8} {'build ms':>9} {'same':>5}")
+    for count in sizes:
+        hotels = prepare_dataset(build_hotels(count))
+        start = time.perf_counter()
+        index = RankingIndex(hotels)
+        build_ms = (time.perf_counter() - start) * 1000
+        ranges = random_ranges(queries)
+        for criterion in TOP_N_CRITERIA:
+            mask_ms = median_ms(lambda r: top_n(hotels[in_price_range(hotels, r)], criterion), ranges)
+            index_ms = median_ms(lambda r: index.top_n(criterion, price_range=r), ranges)
+            same = all(set(top_n(hotels[in_price_range(hotels, r)], criterion).index) ==
+                       set(index.top_n(criterion, price_range=r).index) for r in ranges[:20])
+            print(f"{count:>7} {criterion:>13} {mask_ms:>8.2f} {index_ms:>9.3f} {mask_ms / index_ms:>7.0f}x "
+                  f"{build_ms:>9.1f} {str(same):>5}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    main(args.sizes, args.queries)
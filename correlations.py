@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+CORRELATION_METHODS = ['pearson', 'spearman']
+
+
+def pairwise_pearson(values):
+    """
+    Macierz korelacji Pearsona z brakami pomijanymi parami (jak DataFrame.corr): dla pary kolumn liczą się
+    tylko wiersze, w których obie wartości są znane. Wszystkie pary naraz - kilka mnożeń macierzy
+    zamiast osobnego przejścia po danych dla każdej pary.
+
+    Parametry:
+    - values: np.ndarray - Macierz (liczba wierszy x liczba kolumn), braki jako NaN.
+
+    Zwraca:
+    - np.ndarray - Macierz korelacji (liczba kolumn x liczba kolumn); NaN, gdy para ma mniej niż dwa wiersze
+      albo stałą wartość.
+    """
+    known = ~np.isnan(values)
+    weights = known.astype('float64')
+    # Centrowanie średnią kolumny zmniejsza błąd zaokrągleń w sumach kwadratów
+    counts = weights.sum(axis=0)
+    means = np.divide(np.where(known, values, 0.0).sum(axis=0), counts, out=np.zeros(len(counts)), where=counts > 0)
+    centered = np.where(known, values - means, 0.0)
+
+    count = weights.T @ weights  # [i, j] - liczba wierszy ze znanymi obiema wartościami
+    sum_x = centered.T @ weights  # [i, j] - suma kolumny i w tych wierszach
+    sum_xx = (centered ** 2).T @ weights
+    sum_xy = centered.T @ centered
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_xy - sum_x * sum_x.T / count
+        variance = sum_xx - sum_x ** 2 / count
+        correlation = covariance / np.sqrt(variance * variance.T)
+    scale = np.maximum(sum_xx, sum_xx.T)
+    correlation[(count < 2) | (variance <= 1e-12 * scale) | (variance.T <= 1e-12 * scale.T)] = np.nan
+    return np.clip(correlation, -1.0, 1.0)
+
+
+class CorrelationEngine:
+    """
+    Macierze korelacji wszystkich kolumn liczbowych, liczone raz dla wersji danych.
+
+    Korelacja pary przy brakach pomijanych parami nie zależy od pozostałych kolumn, więc wybór kolumn
+    to wycięcie fragmentu pełnej macierzy. Pearson jest liczony wektorowo (pairwise_pearson), Spearman
+    (DataFrame.corr) dopiero przy pierwszym użyciu; obie macierze są zapamiętywane.
+    """
+
+    def __init__(self, data):
+        """
+        Parametry:
+        - data: pd.DataFrame - Dane hoteli; brane są kolumny liczbowe.
+        """
+        self.numeric = data.select_dtypes(include=["number"])
+        self.columns = list(self.numeric.columns)
+        self.positions = {column: position for position, column in enumerate(self.columns)}
+        self._matrices = {}
+
+    def full_matrix(self, method='pearson'):
+        """
+        Pełna macierz korelacji (liczona przy pierwszym użyciu metody).
+
+        Parametry:
+        - method: str - Jedna z CORRELATION_METHODS.
+
+        Zwraca:
+        - np.ndarray - Macierz korelacji kolumn self.columns.
+        """
+        if method not in self._matrices:
+            if method == 'pearson':
+                matrix = pairwise_pearson(self.numeric.to_numpy(dtype='float64', na_value=np.nan))
+            elif method == 'spearman':
+                matrix = self.numeric.corr(method='spearman').to_numpy()
+            else:
+                raise ValueError(f"unknown correlation method: {method}")
+            matrix.flags.writeable = False
+            self._matrices[method] = matrix
+        return self._matrices[method]
+
+    def matrix(self, columns, method='pearson', value_range=None, decimals=3):
+        """
+        Macierz korelacji wybranych kolumn.
+
+        Parametry:
+        - columns: list[str] - Kolumny (z self.columns).
+        - method: str - Jedna z CORRELATION_METHODS.
+        - value_range: tuple[float, float] (opcjonalnie) - Zakres (min, max); wartości poza nim to NaN.
+        - decimals: int - Zaokrąglenie (przed porównaniem z zakresem).
+
+        Zwraca:
+        - pd.DataFrame - Macierz korelacji z kolumnami i indeksem `columns`.
+        """
+        positions = [self.positions[column] for column in columns]
+        values = self.full_matrix(method)[np.ix_(positions, positions)].round(decimals)
+        if value_range is not None:
+            low, high = value_range
+            values = np.where((values >= low) & (values <= high), values, np.nan)
+        return pd.DataFrame(values, index=list(columns), columns=list(columns))
@@ -0,0 +1,117 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from deals import deal_scores
+from rollups import price_range
+
+# Kolumny liczbowe danych ze scrapera (w CSV mogą być tekstem albo mieć braki)
+NUMERIC_COLUMNS = ['price', 'rate_review', 'rating_stars', 'num_review', 'distance']
+COORDINATE_COLUMNS = ['latitude', 'longitude']
+CATEGORICAL_COLUMNS = ['hotel_type', 'price_range']
+PROFILE_QUANTILES = [0.25, 0.5, 0.75]
+
+
+def content_hash(data):
+    """
+    Skrót zawartości danych (kolumny, typy i wartości) - ten sam plik wyników daje ten sam skrót.
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli.
+
+    Zwraca:
+    - str - Skrót szesnastkowy.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(column), str(dtype)) for column, dtype in data.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def prepare_dataset(data, num_days=1):
+    """
+    Jednorazowe przygotowanie danych hoteli dla wszystkich widoków aplikacji.
+
+    Współrzędne są liczbami (float64, braki jako NaN), kolumny NUMERIC_COLUMNS liczbami, hotel_type
+    i price_range kategoriami, a price_per_night ceną za jedną noc; expected_price i deal_score
+    to ocena okazji z deals.deal_scores. Wynik jest współdzielony przez pamięć podręczną aplikacji, więc
+    nie wolno go modyfikować - każda sesja dostaje własną kopię (app.set_scraped_data). Tablice nie są
+    oznaczane jako tylko do odczytu: pandas 2.0 (nanmedian) liczy np. median() w miejscu i kończy się wtedy
+    błędem "assignment destination is read-only".
+
+    Parametry:
+    - data: pd.DataFrame - Dane z pliku wyników (nie są modyfikowane).
+    - num_days: int - Liczba nocy pobytu (do ceny za noc i kategorii cenowej).
+
+    Zwraca:
+    - pd.DataFrame - Przygotowane dane z indeksem 0..n-1.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if column in COORDINATE_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce').astype('float64')
+        elif column in NUMERIC_COLUMNS:
+            values = pd.to_numeric(values, errors='coerce')
+        elif column in CATEGORICAL_COLUMNS:
+            values = values.astype('category')
+        columns[column] = values
+    for column in COORDINATE_COLUMNS:
+        columns.setdefault(column, pd.Series(np.nan, index=data.index))
+    columns.setdefault('hotel_type', pd.Series(np.nan, index=data.index).astype('category'))
+    columns['price_per_night'] = columns['price'] / max(num_days, 1)
+    columns['price_range'] = price_range(columns['price_per_night'])
+    # Ocena okazji względem podobnych hoteli (typ, okolica, ocena) - raz, przy przygotowaniu danych
+    columns.update(deal_scores(pd.DataFrame(columns)).items())
+
+    prepared = {column: values.array if isinstance(values.dtype, pd.CategoricalDtype) else values.to_numpy()
+                for column, values in columns.items()}
+    return pd.DataFrame(prepared, index=pd.RangeIndex(len(data)))
+
+
+def dataset_profile(data):
+    """
+    Profil danych liczony raz dla wersji danych (nagłówek z metrykami, zakresy suwaków i osi wykresów).
+
+    Kolumny liczbowe są sortowane raz (braki na końcu), więc min, max i kwantyle to odczyt z posortowanej
+    macierzy, a średnia - jedna suma, dla wszystkich kolumn naraz.
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli (np. z prepare_dataset).
+
+    Zwraca:
+    - dict - 'rows': liczba wierszy; 'numeric': pd.DataFrame z wierszem dla każdej kolumny liczbowej
+      (count, nulls, min, max, mean i p25/p50/p75 z PROFILE_QUANTILES; NaN dla kolumn bez wartości);
+      'categories': dict[str, pd.Series] - liczba hoteli w każdej kategorii kolumn kategorii.
+    """
+    numeric = data.select_dtypes(include=['number'])
+    values = np.sort(numeric.to_numpy(dtype='float64', na_value=np.nan), axis=0)
+    count = (~np.isnan(values)).sum(axis=0)
+    last = np.maximum(count - 1, 0)
+
+    def sorted_at(positions):
+        # Interpolacja liniowa między sąsiednimi wartościami (jak np.quantile)
+        low, high = np.floor(positions).astype('int64'), np.ceil(positions).astype('int64')
+        low_values = values[low, np.arange(values.shape[1])] if len(values) else np.full(values.shape[1], np.nan)
+        high_values = values[high, np.arange(values.shape[1])] if len(values) else np.full(values.shape[1], np.nan)
+        return np.where(count > 0, low_values + (high_values - low_values) * (positions - low), np.nan)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = {
+            'count': count,
+            'nulls': len(values) - count,
+            'min': sorted_at(np.zeros(len(count))),
+            'max': sorted_at(last.astype('float64')),
+            'mean': np.where(count > 0, np.nansum(values, axis=0) / count, np.nan),
+        }
+    for quantile in PROFILE_QUANTILES:
+        profile[f"p{int(quantile * 100)}"] = sorted_at(last * quantile)
+
+    categories = {column: data[column].value_counts(sort=False)
+                  for column in data.columns if isinstance(data[column].dtype, pd.CategoricalDtype)}
+    return {
+        'rows': len(data),
+        'numeric': pd.DataFrame(profile, index=numeric.columns),
+        'categories': categories,
+    }
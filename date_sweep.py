@@ -0,0 +1,164 @@
+import argparse
+import datetime
+import subprocess
+import sys
+
+import pandas as pd
+
+from batch_scraper import SearchSpec, run_batch
+
+SWEEP_FILE = "sweepResults.parquet"
+
+
+def sweep_specs(city, first_checkin, last_checkin, stay_lengths, adults=2):
+    """
+    Generuje wyszukiwania dla każdej daty zameldowania z zakresu i każdej długości pobytu.
+
+    Parametry:
+    - city: str - Miejsce docelowe.
+    - first_checkin: datetime.date | str - Pierwsza data zameldowania.
+    - last_checkin: datetime.date | str - Ostatnia data zameldowania (włącznie).
+    - stay_lengths: list[int] - Długości pobytu w nocach.
+    - adults: int - Liczba dorosłych.
+
+    Zwraca:
+    - list[SearchSpec] - Lista wyszukiwań.
+    """
+    checkins = pd.date_range(pd.Timestamp(first_checkin), pd.Timestamp(last_checkin), freq='D').date
+    if len(checkins) == 0:
+        raise ValueError(f"Pusty zakres dat: {first_checkin} - {last_checkin}")
+    return [
+        SearchSpec(city, str(checkin), str(checkin + datetime.timedelta(days=int(nights))), int(adults))
+        for checkin in checkins
+        for nights in sorted(set(stay_lengths))
+    ]
+
+
+def price_matrix(df):
+    """
+    Buduje macierz cen za noc: hotel x (data zameldowania, liczba nocy).
+
+    Hotele są rozróżniane po canonical_link (nazwy nie są unikalne - dwa obiekty o tej samej nazwie
+    to dwa wiersze), a nazwa jest tylko etykietą.
+
+    Parametry:
+    - df: pd.DataFrame - Wyniki z run_batch (kolumny 'canonical_link', 'name', 'price', 'checkin', 'nights').
+
+    Zwraca:
+    - pd.DataFrame - Macierz z indeksem ('canonical_link', 'name') i kolumnami w postaci 'RRRR-MM-DD / Nn'
+      uporządkowanymi po dacie zameldowania i liczbie nocy; hotele posortowane od najniższej ceny za noc,
+      brak oferty -> NaN.
+    """
+    df = df.dropna(subset=['price', 'nights'])
+    per_night = df['price'].astype('float64') / df['nights']
+    stay = df['checkin'].astype(str) + ' / ' + df['nights'].astype(int).astype(str) + 'n'
+    matrix = pd.pivot_table(pd.DataFrame({'canonical_link': df['canonical_link'], 'stay': stay,
+                                          'price_per_night': per_night}),
+                            index='canonical_link', columns='stay', values='price_per_night', aggfunc='min')
+    # Kolejność kolumn po (data, liczba nocy) - jako tekst "10n" byłoby przed "2n"
+    stays = pd.DataFrame({'stay': stay, 'checkin': pd.to_datetime(df['checkin']), 'nights': df['nights']})
+    stays = stays.drop_duplicates('stay').sort_values(['checkin', 'nights'])
+    matrix = matrix.reindex(stays['stay'].to_numpy(), axis=1)
+    matrix.columns.name = 'stay'
+    order = matrix.min(axis=1).sort_values().index
+    matrix = matrix.loc[order].round(2)
+    names = df.drop_duplicates('canonical_link').set_index('canonical_link')['name']
+    matrix.index = pd.MultiIndex.from_arrays([matrix.index, names.reindex(matrix.index).to_numpy()],
+                                             names=['canonical_link', 'name'])
+    return matrix
+
+
+def cheapest_stays(matrix):
+    """
+    Podsumowanie kolumn macierzy: najniższa i mediana ceny za noc dla każdej daty/długości pobytu.
+
+    Parametry:
+    - matrix: pd.DataFrame - Macierz z price_matrix.
+
+    Zwraca:
+    - pd.DataFrame - Kolumny: stay, min_price, median_price, hotels; posortowane rosnąco po medianie.
+    """
+    summary = pd.DataFrame({
+        'stay': matrix.columns,
+        'min_price': matrix.min().to_numpy(),
+        'median_price': matrix.median().to_numpy(),
+        'hotels': matrix.notna().sum().to_numpy(),
+    })
+    return summary.sort_values('median_price').reset_index(drop=True)
+
+
+def sweep(city, first_checkin, last_checkin, stay_lengths, adults=2, output=SWEEP_FILE, concurrency=16,
+          parse_workers=None, cache_path="hotel_details_cache.csv"):
+    """
+    Scrapuje wszystkie daty i długości pobytu współbieżnie w jednym procesie.
+    Strony hoteli nie zależą od dat, więc każda jest pobierana tylko raz (wspólna DetailCache).
+
+    Parametry:
+    - city, first_checkin, last_checkin, stay_lengths, adults: jak w sweep_specs.
+    - output: str | None - Plik Parquet z macierzą cen.
+    - concurrency: int - Globalny limit równoległych żądań.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+    - cache_path: str | None - Plik pamięci podręcznej danych ze stron hoteli.
+
+    Zwraca:
+    - pd.DataFrame - Macierz cen za noc (price_matrix).
+    """
+    specs = sweep_specs(city, first_checkin, last_checkin, stay_lengths, adults)
+    df = run_batch(specs, output_dir=None, concurrency=concurrency, parse_workers=parse_workers,
+                   cache_path=cache_path)
+    if df.empty:
+        return pd.DataFrame()
+    matrix = price_matrix(df)
+    if output:
+        matrix.to_parquet(output)
+        print(f"Zapisano macierz cen {matrix.shape[0]} hoteli x {matrix.shape[1]} terminów do: {output}")
+    return matrix
+
+
+def run_sweep(city, first_checkin, last_checkin, stay_lengths, adults=2, output=SWEEP_FILE):
+    """
+    Uruchamia sweep jako osobny proces za pomocą subprocess (reaktor Twisted nie startuje w procesie Streamlit).
+
+    Parametry:
+    - jak w sweep.
+    """
+    command = [
+        sys.executable,
+        "date_sweep.py",
+        city,
+        str(first_checkin),
+        str(last_checkin),
+        "--nights",
+        *[str(nights) for nights in stay_lengths],
+        "--adults",
+        str(adults),
+        "-o",
+        output,
+    ]
+    try:
+        subprocess.run(command, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error during sweep execution: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ceny hoteli dla zakresu dat zameldowania i długości pobytu.")
+    parser.add_argument("city", help="miejsce docelowe")
+    parser.add_argument("first_checkin", help="pierwsza data zameldowania RRRR-MM-DD")
+    parser.add_argument("last_checkin", help="ostatnia data zameldowania RRRR-MM-DD")
+    parser.add_argument("--nights", type=int, nargs="+", default=[1], help="długości pobytu w nocach")
+    parser.add_argument("--adults", type=int, default=2, help="liczba dorosłych")
+    parser.add_argument("-o", "--output", default=SWEEP_FILE, help="plik Parquet z macierzą cen")
+    parser.add_argument("--concurrency", type=int, default=16, help="globalny limit równoległych żądań")
+    parser.add_argument("--parse-workers", type=int, default=0, help="procesy do parsowania HTML (0 - wyłączone)")
+    parser.add_argument("--cache", default="hotel_details_cache.csv", help="plik pamięci podręcznej stron hoteli")
+    args = parser.parse_args(argv)
+
+    matrix = sweep(args.city, args.first_checkin, args.last_checkin, args.nights, args.adults, output=args.output,
+                   concurrency=args.concurrency, parse_workers=args.parse_workers, cache_path=args.cache)
+    if not matrix.empty:
+        print(cheapest_stays(matrix).head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from spatial_index import METERS_PER_DEGREE
+
+DEAL_CELL_SIZE = 1000  # Bok komórki siatki "okolicy" w metrach
+RATING_BANDS = [0, 7, 8, 9, np.inf]  # Przedziały oceny z recenzji (podobna ocena)
+MIN_PEERS = 5  # Najmniejsza grupa porównawcza; mniejsze grupy są łączone w ogólniejsze
+MIN_SPREAD = 0.05  # Najmniejszy rozrzut logarytmu ceny (ok. 5%), żeby jednolite grupy nie dawały ogromnych wyników
+DEAL_THRESHOLD = 1.5  # Od tego deal_score hotel jest okazją
+
+
+def peer_levels(data):
+    """
+    Klucze grup porównawczych od najdokładniejszej do najogólniejszej: typ obiektu + komórka siatki + ocena,
+    typ + ocena, sama ocena. Braki (np. hotele bez współrzędnych) tworzą własną grupę klucza.
+
+    Zwraca:
+    - list[dict[str, np.ndarray]] - Kolumny kluczy dla każdego poziomu.
+    """
+    def codes(values):
+        return pd.factorize(values, use_na_sentinel=False)[0] if len(values) else np.empty(0, dtype='int64')
+
+    hotel_type = codes(data['hotel_type']) if 'hotel_type' in data.columns else np.zeros(len(data), dtype='int64')
+    rating = codes(pd.cut(data['rate_review'], RATING_BANDS)) if 'rate_review' in data.columns \
+        else np.zeros(len(data), dtype='int64')
+    latitude = data['latitude'].to_numpy(dtype='float64') if 'latitude' in data.columns else np.full(len(data), np.nan)
+    longitude = data['longitude'].to_numpy(dtype='float64') if 'longitude' in data.columns else np.full(len(data), np.nan)
+    middle = np.radians(np.nanmedian(latitude)) if (~np.isnan(latitude)).any() else 0.0
+    cell_y = np.floor(latitude * METERS_PER_DEGREE / DEAL_CELL_SIZE)
+    cell_x = np.floor(longitude * METERS_PER_DEGREE * np.cos(middle) / DEAL_CELL_SIZE)
+    cell = codes(cell_y * 1e7 + cell_x)  # Numer komórki (dokładny w float64 dla całej kuli ziemskiej)
+    return [
+        {'hotel_type': hotel_type, 'cell': cell, 'rating': rating},
+        {'hotel_type': hotel_type, 'rating': rating},
+        {'rating': rating},
+    ]
+
+
+def deal_scores(data):
+    """
+    Ocena okazji: o ile (w odpornych odchyleniach) cena za noc jest niższa od typowej ceny podobnych
+    hoteli. Typowa cena to mediana logarytmu ceny w grupie porównawczej (peer_levels), rozrzut to
+    przeskalowane odchylenie medianowe (MAD). Hotel bierze najdokładniejszą grupę, która ma co najmniej
+    MIN_PEERS hoteli z ceną; jeśli żadna nie ma - wszystkie hotele.
+
+    Parametry:
+    - data: pd.DataFrame - Hotele z kolumną price_per_night (albo price).
+
+    Zwraca:
+    - pd.DataFrame - Kolumny expected_price (typowa cena za noc podobnych hoteli) i deal_score
+      (dodatni = taniej niż podobne; od DEAL_THRESHOLD - okazja), z indeksem danych.
+    """
+    price = data['price_per_night'] if 'price_per_night' in data.columns else data['price']
+    price = price.to_numpy(dtype='float64')
+    log_price = np.log(np.where(price > 0, price, np.nan))
+    expected = np.full(len(data), np.nan)
+    spread = np.full(len(data), np.nan)
+
+    for keys in peer_levels(data):
+        frame = pd.DataFrame({'log_price': log_price, **keys})
+        grouped = frame.groupby(list(keys), sort=False)['log_price']
+        median = grouped.transform('median').to_numpy()
+        count = grouped.transform('count').to_numpy()
+        frame['deviation'] = np.abs(log_price - median)
+        mad = frame.groupby(list(keys), sort=False)['deviation'].transform('median').to_numpy()
+        use = np.isnan(expected) & (count >= MIN_PEERS)
+        expected[use], spread[use] = median[use], mad[use] * 1.4826
+
+    # Za mało podobnych hoteli - porównanie ze wszystkimi
+    rest = np.isnan(expected)
+    if rest.any() and (~np.isnan(log_price)).any():
+        median = np.nanmedian(log_price)
+        expected[rest], spread[rest] = median, np.nanmedian(np.abs(log_price - median)) * 1.4826
+
+    score = (expected - log_price) / np.maximum(np.nan_to_num(spread, nan=MIN_SPREAD), MIN_SPREAD)
+    return pd.DataFrame({'expected_price': np.exp(expected).round(), 'deal_score': score.round(2)},
+                        index=data.index)
+
+
+def deal_discounts(data):
+    """
+    Procent, o jaki okazje (deal_score >= DEAL_THRESHOLD) są tańsze od typowej ceny podobnych hoteli.
+
+    Parametry:
+    - data: pd.DataFrame - Hotele z kolumnami deal_score, expected_price i price_per_night.
+
+    Zwraca:
+    - pd.Series - Procent (liczba całkowita) dla okazji, NaN dla pozostałych hoteli.
+    """
+    if 'deal_score' not in data.columns:
+        return pd.Series(np.nan, index=data.index)
+    discount = (100 * (1 - data['price_per_night'] / data['expected_price'])).round()
+    return discount.where(data['deal_score'] >= DEAL_THRESHOLD)
@@ -0,0 +1,112 @@
+import argparse
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from batch_scraper import SearchSpec, run_batch
+from detail_cache import DetailCache
+from scraper_booking import canonical_link
+
+RESULTS_FILE = "bookingResults_updated.csv"
+
+# Kolumny pliku wynikowego w tej samej kolejności co w pełnym przebiegu obu spiderów
+RESULT_COLUMNS = ['name', 'address', 'price', 'distance', 'rate_review', 'num_review', 'rating_stars', 'link',
+                  'source_url', 'latitude', 'longitude', 'hotel_type']
+
+
+def load_known_hotels(file_path):
+    """
+    Wczytuje zapisane dane hoteli (CSV z pełnego przebiegu lub zbiór Parquet) jako pamięć podręczną stron hoteli.
+
+    Parametry:
+    - file_path: str - Ścieżka do pliku CSV albo pliku/katalogu Parquet.
+
+    Zwraca:
+    - DetailCache - Pamięć podręczna z typem hotelu i współrzędnymi, kluczowana kanonicznym linkiem.
+    """
+    detail_cache = DetailCache()
+    if not file_path or not os.path.exists(file_path):
+        print(f"Brak zapisanych danych hoteli: {file_path}")
+        return detail_cache
+
+    known = pd.read_csv(file_path) if file_path.endswith('.csv') else pd.read_parquet(file_path)
+    if 'canonical_link' not in known.columns:
+        known['canonical_link'] = known['link'].map(canonical_link)
+    detail_cache.update_from_frame(known)
+    return detail_cache
+
+
+def refresh_prices(city, checkin, checkout, adults=2, metadata_path=RESULTS_FILE, output=RESULTS_FILE,
+                   concurrency=16, parse_workers=None):
+    """
+    Odświeża ceny dla znanego już wyszukiwania: scrapuje tylko strony wyników (cena, ocena, liczba opinii),
+    łączy je z zapisanymi danymi hoteli po kanonicznym linku i pobiera strony tylko nowych hoteli.
+
+    Parametry:
+    - city: str - Miejsce docelowe.
+    - checkin: str - Data zameldowania.
+    - checkout: str - Data wymeldowania.
+    - adults: int - Liczba dorosłych.
+    - metadata_path: str - Plik z zapisanymi danymi hoteli (typ, współrzędne).
+    - output: str | None - Plik CSV z wynikami w formacie pełnego przebiegu.
+    - concurrency: int - Limit równoległych żądań.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+
+    Zwraca:
+    - pd.DataFrame - Odświeżone dane.
+    """
+    detail_cache = load_known_hotels(metadata_path)
+    known_hotels = len(detail_cache)
+    df = run_batch([SearchSpec(city, str(checkin), str(checkout), int(adults))], output_dir=None,
+                   concurrency=concurrency, parse_workers=parse_workers, detail_cache=detail_cache)
+    if df.empty:
+        print("Brak wyników wyszukiwania - plik wynikowy nie został zmieniony.")
+        return df
+
+    print(f"Znane hotele: {known_hotels}, nowe hotele w wynikach: {len(detail_cache) - known_hotels}")
+    # Duplikaty tylko wśród hoteli ze współrzędnymi - hotele bez lokalizacji (NaN) nie są ze sobą łączone
+    located = df[['latitude', 'longitude']].notna().all(axis=1)
+    df = df[~located | ~df.duplicated(subset=['latitude', 'longitude'])]
+    if output:
+        df[RESULT_COLUMNS].to_csv(output, index=False)
+        print(f"Zapisano odświeżone ceny do: {output}")
+    return df
+
+
+def run_refresh(city, checkin, checkout, adults=2):
+    """
+    Uruchamia odświeżenie cen jako osobny proces za pomocą subprocess (jak run_spider).
+
+    Parametry:
+    - city: str - Miejsce docelowe.
+    - checkin: str - Data zameldowania.
+    - checkout: str - Data wymeldowania.
+    - adults: int - Liczba dorosłych.
+    """
+    command = [sys.executable, "delta_refresh.py", city, str(checkin), str(checkout), "--adults", str(adults)]
+    try:
+        subprocess.run(command, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"Error during price refresh: {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Odświeżenie cen znanych hoteli bez ponownego scrapowania ich stron.")
+    parser.add_argument("city", help="miejsce docelowe")
+    parser.add_argument("checkin", help="data zameldowania RRRR-MM-DD")
+    parser.add_argument("checkout", help="data wymeldowania RRRR-MM-DD")
+    parser.add_argument("--adults", type=int, default=2, help="liczba dorosłych")
+    parser.add_argument("--metadata", default=RESULTS_FILE, help="zapisane dane hoteli (CSV lub Parquet)")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE, help="plik CSV z odświeżonymi wynikami")
+    parser.add_argument("--concurrency", type=int, default=16, help="limit równoległych żądań")
+    parser.add_argument("--parse-workers", type=int, default=0, help="procesy do parsowania HTML (0 - wyłączone)")
+    args = parser.parse_args(argv)
+
+    refresh_prices(args.city, args.checkin, args.checkout, args.adults, metadata_path=args.metadata,
+                   output=args.output, concurrency=args.concurrency, parse_workers=args.parse_workers)
+
+
+if __name__ == "__main__":
+    main()
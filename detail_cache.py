@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+
+class DetailCache:
+    """
+    Pamięć podręczna danych ze stron hoteli (typ hotelu, współrzędne) kluczowana kanonicznym linkiem.
+
+    Dane ze strony hotelu nie zależą od miasta wyszukiwania ani od dat, więc jeden wpis obsługuje
+    wszystkie wyszukiwania w danym uruchomieniu, a po zapisaniu na dysk także kolejne uruchomienia.
+    """
+
+    COLUMNS = ['canonical_link', 'hotel_type', 'latitude', 'longitude']
+
+    def __init__(self, path=None):
+        """
+        Parametry:
+        - path: str (opcjonalnie) - Ścieżka do pliku CSV z zapisaną pamięcią podręczną. Jeśli istnieje, jest wczytywany.
+        """
+        self.path = path
+        self.details = {}
+        self.missing = set()  # Linki, dla których strona hotelu nie zawierała danych (tylko w tym uruchomieniu)
+        if path and os.path.exists(path):
+            self.update_from_frame(pd.read_csv(path))
+
+    def __contains__(self, key):
+        return key in self.details or key in self.missing
+
+    def __len__(self):
+        return len(self.details)
+
+    def get(self, key):
+        """
+        Zwraca słownik z danymi hotelu lub None.
+        """
+        return self.details.get(key)
+
+    def put(self, key, details):
+        """
+        Zapisuje dane hotelu.
+
+        Parametry:
+        - key: str - Kanoniczny link do strony hotelu.
+        - details: tuple | None - Krotka (hotel_type, latitude, longitude) z extract_hotel_details lub None.
+        """
+        if details is None:
+            self.missing.add(key)
+            return
+        hotel_type, latitude, longitude = details
+        self.details[key] = {'hotel_type': hotel_type, 'latitude': latitude, 'longitude': longitude}
+
+    def update_from_frame(self, df):
+        """
+        Dodaje do pamięci podręcznej dane z DataFrame (kolumny jak w COLUMNS).
+        """
+        df = df.dropna(subset=['canonical_link', 'latitude', 'longitude'])
+        for row in df[self.COLUMNS].itertuples(index=False):
+            self.details[row.canonical_link] = {
+                'hotel_type': None if pd.isna(row.hotel_type) else row.hotel_type,
+                'latitude': row.latitude,
+                'longitude': row.longitude,
+            }
+
+    def to_frame(self):
+        """
+        Zwraca zawartość pamięci podręcznej jako DataFrame (kolumny jak w COLUMNS).
+        """
+        df = pd.DataFrame.from_dict(self.details, orient='index', columns=self.COLUMNS[1:])
+        return df.rename_axis('canonical_link').reset_index()
+
+    def save(self):
+        """
+        Zapisuje pamięć podręczną do pliku CSV (jeśli podano ścieżkę).
+        """
+        if self.path:
+            self.to_frame().to_csv(self.path, index=False)
@@ -0,0 +1,112 @@
+import numpy as np
+
+LARGE_PLOT_POINTS = 5000  # Od tej liczby punktów wykresy przechodzą w tryb dużych danych (WebGL + próbka)
+MAX_OUTLIER_SHARE = 0.25  # Najwyżej taka część próbki to punkty odstające (najbardziej skrajne)
+POINTS_PER_CELL = 4  # Średnio tyle punktów próbki na komórkę siatki - gęstsze obszary dostają więcej
+
+
+def outlier_scores(values):
+    """
+    O ile punkty wychodzą poza granice Tukeya (Q1 - 1.5 IQR, Q3 + 1.5 IQR) każdej z kolumn, w jednostkach IQR.
+
+    Parametry:
+    - values: np.ndarray - Macierz (liczba punktów x liczba kolumn) bez braków.
+
+    Zwraca:
+    - np.ndarray - Macierz wyników tego samego kształtu; dodatni = punkt odstający w tej kolumnie.
+    """
+    q1, q3 = np.percentile(values, [25, 75], axis=0)
+    iqr = q3 - q1
+    excess = np.maximum(q1 - 1.5 * iqr - values, values - q3 - 1.5 * iqr)
+    return excess / np.where(iqr > 0, iqr, 1)
+
+
+def extreme_points(values, limit):
+    """
+    Punkty odstające, najwyżej `limit`: każda kolumna dostaje równą część limitu na swoje najbardziej
+    skrajne punkty (kolumna z długim ogonem nie wypiera punktów odstających pozostałych kolumn).
+
+    Parametry:
+    - values: np.ndarray - Macierz (liczba punktów x liczba kolumn) bez braków.
+    - limit: int - Największa liczba punktów.
+
+    Zwraca:
+    - np.ndarray - Rosnące pozycje punktów odstających.
+    """
+    scores = outlier_scores(values)
+    per_column = limit // values.shape[1]
+    extremes = []
+    for column_scores in scores.T:
+        outliers = np.flatnonzero(column_scores > 0)
+        extremes.append(outliers[np.argsort(-column_scores[outliers], kind='stable')[:per_column]])
+    return np.unique(np.concatenate(extremes))
+
+
+def cell_quotas(counts, budget):
+    """
+    Liczba punktów próbki z każdej komórki: proporcjonalnie do liczby punktów w komórce (zachowuje
+    gęstość), ale co najmniej jeden z każdej niepustej komórki (rzadkie obszary nie znikają).
+
+    Parametry:
+    - counts: np.ndarray - Liczba punktów w komórkach.
+    - budget: int - Największa łączna liczba punktów próbki.
+
+    Zwraca:
+    - np.ndarray - Limit punktów dla każdej komórki.
+    """
+    def quotas(rate):
+        return np.minimum(np.maximum(np.floor(counts * rate), 1), counts).astype('int64')
+
+    low, high = 0.0, 1.0
+    for _ in range(40):  # Wyszukiwanie binarne największego współczynnika mieszczącego się w budżecie
+        rate = (low + high) / 2
+        if quotas(rate).sum() <= budget:
+            low = rate
+        else:
+            high = rate
+    return quotas(low)
+
+
+def downsample(data, columns, max_points=LARGE_PLOT_POINTS, seed=0):
+    """
+    Próbka wierszy do wykresu, zachowująca rozkład punktów i punkty odstające.
+
+    Punkty odstające są zawsze w próbce (do MAX_OUTLIER_SHARE próbki - najbardziej skrajne, extreme_points).
+    Pozostałe punkty są dzielone na siatkę o równych przedziałach w każdej z kolumn, a z każdej komórki
+    losowana jest liczba punktów z cell_quotas. Losowanie ma stałe ziarno, więc ta sama ramka daje tę samą
+    próbkę.
+
+    Parametry:
+    - data: pd.DataFrame - Dane wykresu.
+    - columns: list[str] - Kolumny liczbowe osi wykresu.
+    - max_points: int - Największa liczba punktów próbki.
+    - seed: int - Ziarno losowania.
+
+    Zwraca:
+    - np.ndarray - Rosnące pozycje (iloc) wybranych wierszy; wiersze z brakami w kolumnach są pomijane.
+    """
+    values = np.column_stack([data[column].to_numpy(dtype='float64') for column in columns])
+    known = np.flatnonzero(~np.isnan(values).any(axis=1))
+    if len(known) <= max_points:
+        return known
+    values = values[known]
+
+    outliers = extreme_points(values, int(max_points * MAX_OUTLIER_SHARE))
+    inliers = np.setdiff1d(np.arange(len(values)), outliers)
+
+    # Numer komórki siatki: tyle przedziałów na kolumnę, żeby komórek było ok. budżet / POINTS_PER_CELL
+    budget = max_points - len(outliers)
+    bins = max(int((budget / POINTS_PER_CELL) ** (1 / len(columns))), 1)
+    cells = np.zeros(len(inliers), dtype='int64')
+    for column_values in values[inliers].T:
+        low, high = column_values.min(), column_values.max()
+        width = (high - low) / bins if high > low else 1.0
+        cells = cells * bins + np.clip(((column_values - low) / width).astype('int64'), 0, bins - 1)
+    cells, cell_of_point, counts = np.unique(cells, return_inverse=True, return_counts=True)
+
+    # Losowa kolejność punktów w komórkach; z każdej komórki pierwsze quota punktów
+    order = np.lexsort((np.random.default_rng(seed).random(len(inliers)), cell_of_point))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(order)) - starts[cell_of_point[order]]
+    sampled = order[rank < cell_quotas(counts, budget)[cell_of_point[order]]]
+    return np.sort(known[np.concatenate([outliers, inliers[sampled]])])
@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024  # Domyślny limit pamięci wykresów (liczony jako rozmiar JSON)
+
+
+class FigureCache:
+    """
+    Pamięć podręczna gotowych wykresów Plotly (najdawniej używane są usuwane pierwsze) z limitem pamięci.
+
+    Klucz opisuje wszystko, od czego zależy wykres: wersję danych (skrót zbioru), rodzaj wykresu, wybrane
+    osie i opcje oraz tryb ciemny. Ten sam klucz to ten sam wykres, więc rerun bez zmian w jego wejściu
+    nie wywołuje Plotly Express. Rozmiar wpisu to długość JSON wykresu (tyle trafia do przeglądarki).
+
+    Przechowywane są obiekty go.Figure, a nie sam JSON: odtworzenie Figure z JSON (z walidacją) trwa
+    dłużej niż zbudowanie wykresu przez Plotly Express, a gotowy Figure st.plotly_chart tylko serializuje.
+    Wykresy są wspólne dla wszystkich sesji - zwróconego wykresu nie wolno modyfikować.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        """
+        Parametry:
+        - max_bytes: int - Limit łącznego rozmiaru wykresów; większe pojedyncze wykresy nie są zapamiętywane.
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._figures = OrderedDict()  # Klucz -> (wykres, rozmiar JSON)
+        self._lock = threading.Lock()  # Jedna pamięć dla wszystkich sesji (wątków) aplikacji
+
+    def __len__(self):
+        return len(self._figures)
+
+    def __contains__(self, key):
+        return key in self._figures
+
+    def figure(self, key, build):
+        """
+        Wykres dla klucza: zapamiętany albo zbudowany przez `build` i zapamiętany.
+
+        Parametry:
+        - key: tuple - Klucz wykresu (wartości hashowalne).
+        - build: callable - Funkcja bez argumentów budująca wykres (go.Figure albo None, gdy brak danych).
+
+        Zwraca:
+        - go.Figure | None - Wykres (None nie jest zapamiętywane).
+        """
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return self._figures[key][0]
+            self.misses += 1
+
+        figure = build()
+        if figure is None:
+            return None
+        size = len(figure.to_json())
+        with self._lock:
+            if size <= self.max_bytes and key not in self._figures:
+                self._figures[key] = (figure, size)
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._figures.popitem(last=False)
+                    self.total_bytes -= evicted_size
+        return figure
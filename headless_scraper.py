@@ -0,0 +1,95 @@
+"""
+Lekki punkt wejścia do scrapowania bez interfejsu (cron, skrypty).
+
+Importuje wyłącznie stos scrapujący (scrapy, pandas, moduły scraperów) - nigdy Streamlit, Plotly,
+Folium ani matplotlib, które ładuje app.py i theme_settings.py.
+
+Przykłady:
+    python headless_scraper.py Kraków 2025-05-01 2025-05-03 --adults 2 -o krakow.parquet
+    python headless_scraper.py --batch searches.csv -o batchResults
+"""
+import argparse
+import os
+
+from batch_scraper import SearchSpec, load_specs, run_batch, write_dataset
+from scraper_booking import run_spider  # noqa: F401  (dotychczasowe API dla zadań cron)
+
+OUTPUT_FORMATS = ['json', 'parquet']
+
+
+def write_output(df, path, output_format=None):
+    """
+    Zapisuje wyniki do pliku JSON (lista rekordów) lub Parquet.
+
+    Parametry:
+    - df: pd.DataFrame - Wyniki scrapowania.
+    - path: str - Ścieżka pliku wynikowego.
+    - output_format: str (opcjonalnie) - 'json' lub 'parquet'; domyślnie na podstawie rozszerzenia pliku.
+    """
+    output_format = output_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if output_format == 'json':
+        df.to_json(path, orient='records', force_ascii=False, date_format='iso')
+    elif output_format == 'parquet':
+        df.to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Nieobsługiwany format wyników: {output_format}. Dostępne: {OUTPUT_FORMATS}")
+    print(f"Zapisano {len(df)} wierszy do: {path}")
+
+
+def scrape(city, checkin, checkout, adults=2, output=None, output_format=None, concurrency=16,
+           parse_workers=None, cache_path="hotel_details_cache.csv"):
+    """
+    Scrapuje jedno wyszukiwanie (wyniki + strony hoteli) w bieżącym procesie.
+
+    Parametry:
+    - city: str - Miejsce docelowe.
+    - checkin: str - Data zameldowania (RRRR-MM-DD).
+    - checkout: str - Data wymeldowania (RRRR-MM-DD).
+    - adults: int - Liczba dorosłych.
+    - output: str (opcjonalnie) - Plik wynikowy JSON/Parquet.
+    - output_format: str (opcjonalnie) - 'json' lub 'parquet'.
+    - concurrency: int - Limit równoległych żądań.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+    - cache_path: str | None - Plik pamięci podręcznej danych ze stron hoteli.
+
+    Zwraca:
+    - pd.DataFrame - Zebrane dane.
+    """
+    df = run_batch([SearchSpec(city, str(checkin), str(checkout), int(adults))], output_dir=None,
+                   concurrency=concurrency, parse_workers=parse_workers, cache_path=cache_path)
+    if output and not df.empty:
+        write_output(df, output, output_format)
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrapowanie Booking.com bez interfejsu Streamlit.")
+    parser.add_argument("city", nargs="?", help="miejsce docelowe")
+    parser.add_argument("checkin", nargs="?", help="data zameldowania RRRR-MM-DD")
+    parser.add_argument("checkout", nargs="?", help="data wymeldowania RRRR-MM-DD")
+    parser.add_argument("--adults", type=int, default=2, help="liczba dorosłych")
+    parser.add_argument("--batch", help="plik CSV z wyszukiwaniami (city, checkin, checkout, adults)")
+    parser.add_argument("-o", "--output", help="plik (JSON/Parquet) lub katalog partycjonowanego zbioru dla --batch")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="format wyników (domyślnie z rozszerzenia)")
+    parser.add_argument("--concurrency", type=int, default=16, help="limit równoległych żądań")
+    parser.add_argument("--parse-workers", type=int, default=0, help="procesy do parsowania HTML (0 - wyłączone)")
+    parser.add_argument("--cache", default="hotel_details_cache.csv", help="plik pamięci podręcznej stron hoteli")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        df = run_batch(load_specs(args.batch), output_dir=None, concurrency=args.concurrency,
+                       parse_workers=args.parse_workers, cache_path=args.cache)
+        if args.output and not df.empty:
+            if args.format == 'json':
+                write_output(df, args.output, 'json')
+            else:
+                write_dataset(df, args.output)
+    elif args.city and args.checkin and args.checkout:
+        scrape(args.city, args.checkin, args.checkout, args.adults, output=args.output, output_format=args.format,
+               concurrency=args.concurrency, parse_workers=args.parse_workers, cache_path=args.cache)
+    else:
+        parser.error("podaj miasto i daty albo plik --batch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import subprocess
+
+import pandas as pd
+
+from ranking import TOP_N_CRITERIA, in_price_range, top_n
+
+# Priorytety żądań stron hoteli (wyższy = wcześniej w kolejce Scrapy)
+PRIORITY_TOP_N = 2
+PRIORITY_IN_RANGE = 1
+PRIORITY_REST = 0
+
+# Co zrobić ze stronami hoteli spoza top N i wybranego zakresu cen
+REST_MODES = ['background', 'skip']
+
+# Kryteria top N, które proces pobierający policzy z surowego pliku wyników
+# (deal_score dodaje dopiero dataset.prepare_dataset)
+DETAIL_CRITERIA = [criterion for criterion in TOP_N_CRITERIA if criterion != 'deal_score']
+
+
+def detail_priorities(hotels, criterion=None, price_range=None, n=5):
+    """
+    Nadaje priorytet pobrania strony hotelu według tego, co użytkownik ogląda:
+    najpierw top N dla wybranego kryterium, potem hotele z wybranego zakresu cen, na końcu pozostałe.
+
+    Parametry:
+    - hotels: pd.DataFrame - Dane z wyników wyszukiwania.
+    - criterion: str (opcjonalnie) - Kryterium listy top N (jak w ranking.top_n).
+    - price_range: tuple[float, float] (opcjonalnie) - Wybrany zakres cen.
+    - n: int - Liczba hoteli w liście top N.
+
+    Zwraca:
+    - pd.Series - Priorytet (PRIORITY_*) dla każdego wiersza.
+    """
+    priorities = pd.Series(PRIORITY_REST, index=hotels.index)
+    in_range = in_price_range(hotels, price_range)
+    if price_range is not None:
+        priorities[in_range] = PRIORITY_IN_RANGE
+    if criterion:
+        priorities[top_n(hotels[in_range], criterion, n).index] = PRIORITY_TOP_N
+    return priorities
+
+
+def pending_details(hotels):
+    """
+    Maska hoteli, dla których nie pobrano jeszcze danych ze strony hotelu (brak współrzędnych).
+
+    Parametry:
+    - hotels: pd.DataFrame - Dane hoteli.
+
+    Zwraca:
+    - pd.Series - Maska logiczna.
+    """
+    if 'latitude' not in hotels.columns:
+        return pd.Series(True, index=hotels.index)
+    return hotels['latitude'].isna()
+
+
+def start_enrichment(csv_file, criterion=None, price_range=None, rest='background', n=5, parse_workers=None,
+                     append_history=True):
+    """
+    Uruchamia w tle (bez czekania na zakończenie) pobieranie stron hoteli w kolejności priorytetów.
+    Wyniki są dopisywane na bieżąco do pliku bookingResults_updated.csv.
+
+    Parametry:
+    - csv_file: str - Plik z wynikami wyszukiwania (hotele z kompletem danych są pomijane).
+    - criterion: str (opcjonalnie) - Kryterium listy top N (jedno z DETAIL_CRITERIA).
+    - price_range: tuple[float, float] (opcjonalnie) - Wybrany zakres cen.
+    - rest: str - 'background' (pozostałe strony na końcu kolejki) albo 'skip' (pozostałe pomijane).
+    - n: int - Liczba hoteli w liście top N.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+    - append_history: bool - Czy dopisać wyniki do historii cen po zakończeniu.
+
+    Zwraca:
+    - subprocess.Popen - Uruchomiony proces.
+    """
+    if rest not in REST_MODES:
+        raise ValueError(f"Nieznany tryb: {rest}. Dostępne: {', '.join(REST_MODES)}")
+    command = [
+        "scrapy",
+        "runspider",
+        "scraper_hotel_details.py",
+        "-a",
+        f"csv_file={csv_file}",
+        "-a",
+        f"rest={rest}",
+        "-a",
+        f"top_n={n}",
+    ]
+    if criterion:
+        command += ["-a", f"criterion={criterion}"]
+    if price_range is not None:
+        command += ["-a", f"price_min={price_range[0]}", "-a", f"price_max={price_range[1]}"]
+    if parse_workers:
+        command += ["-a", f"parse_workers={parse_workers}"]
+    if not append_history:
+        command += ["-a", "append_history=0"]
+    return subprocess.Popen(command)
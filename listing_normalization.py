@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+
+# Wzorce dla surowych tekstów z kart hoteli (polska wersja booking.com)
+DISTANCE_PATTERN = r'(?P<value>\d+(?:[.,]\d+)?)\s*(?P<unit>km|m)\b'
+RATE_REVIEW_PATTERN = r'(\d+(?:[.,]\d+)?)'
+
+LISTING_FIELDS = ['price', 'distance', 'rate_review', 'num_review']
+
+
+def _as_text(column):
+    """
+    Zamienia kolumnę na tekst, zachowując braki danych (NaN zostaje NaN, a nie 'nan').
+    """
+    return column.astype('string').str.strip()
+
+
+def _on_unique(normalizer):
+    """
+    Dekorator: parsuje tylko unikalne wartości kolumny i rozkłada wynik z powrotem po kodach z `pd.factorize`.
+
+    Surowe teksty mocno się powtarzają (te same ceny, odległości i oceny w wielu kartach),
+    więc operacje `.str` działają na słowniku wartości zamiast na każdym wierszu.
+    """
+    def wrapper(raw):
+        codes, uniques = pd.factorize(raw)
+        parsed = normalizer(pd.Series(uniques, dtype=raw.dtype))
+        # Kod -1 oznacza brak wartości - allow_fill zamienia go na NaN/<NA> zgodnie z typem kolumny
+        values = pd.api.extensions.take(parsed.array, codes, allow_fill=True)
+        return pd.Series(values, index=raw.index, dtype=parsed.dtype)
+
+    wrapper.__name__ = normalizer.__name__
+    wrapper.__doc__ = normalizer.__doc__
+    return wrapper
+
+
+@_on_unique
+def normalize_price(raw):
+    """
+    Zamienia surowe ceny (np. '1 234 zł' z twardymi spacjami) na liczby całkowite.
+
+    Parametry:
+    - raw: pd.Series - Surowe teksty cen.
+
+    Zwraca:
+    - pd.Series - Ceny jako Int64 (brak wartości lub błąd parsowania -> <NA>).
+    """
+    digits = _as_text(raw).str.replace(r'\D', '', regex=True)
+    return pd.to_numeric(digits.mask(digits == ''), errors='coerce').astype('Int64')
+
+
+@_on_unique
+def normalize_distance(raw):
+    """
+    Zamienia surowe odległości (np. '1,2 km od centrum', '350 m od centrum') na metry.
+
+    Parametry:
+    - raw: pd.Series - Surowe teksty odległości.
+
+    Zwraca:
+    - pd.Series - Odległość w metrach jako float64.
+    """
+    parts = _as_text(raw).str.lower().str.extract(DISTANCE_PATTERN)
+    value = pd.to_numeric(parts['value'].str.replace(',', '.', regex=False), errors='coerce')
+    return (value * parts['unit'].map({'km': 1000.0, 'm': 1.0})).astype('float64')
+
+
+@_on_unique
+def normalize_rate_review(raw):
+    """
+    Wyciąga ocenę z tekstu (np. 'Z oceną 8,6' -> 8.6).
+
+    Parametry:
+    - raw: pd.Series - Surowe teksty oceny.
+
+    Zwraca:
+    - pd.Series - Ocena jako float64.
+    """
+    value = _as_text(raw).str.extract(RATE_REVIEW_PATTERN, expand=False)
+    return pd.to_numeric(value.str.replace(',', '.', regex=False), errors='coerce').astype('float64')
+
+
+@_on_unique
+def normalize_num_review(raw):
+    """
+    Zamienia surowy tekst z liczbą opinii (np. '1 234 opinie') na liczbę całkowitą.
+
+    Parametry:
+    - raw: pd.Series - Surowe teksty liczby opinii.
+
+    Zwraca:
+    - pd.Series - Liczba opinii jako Int64.
+    """
+    digits = _as_text(raw).str.replace(r'\D', '', regex=True)
+    return pd.to_numeric(digits.mask(digits == ''), errors='coerce').astype('Int64')
+
+
+def _present(raw):
+    """
+    Maska wierszy, w których surowa wartość istnieje i nie jest pustym tekstem (liczona na unikalnych wartościach).
+    """
+    codes, uniques = pd.factorize(raw)
+    non_blank = _as_text(pd.Series(uniques, dtype='object')).str.len().gt(0).fillna(False).to_numpy(dtype=bool)
+    # Dodatkowy False na końcu obsługuje kod -1 (brak wartości)
+    return pd.Series(np.append(non_blank, False)[codes], index=raw.index)
+
+
+NORMALIZERS = {
+    'price': normalize_price,
+    'distance': normalize_distance,
+    'rate_review': normalize_rate_review,
+    'num_review': normalize_num_review,
+}
+
+
+def normalize_listings(raw_df, sample_size=3):
+    """
+    Normalizuje kolumnowo surowe pola zebrane przez HotelsSpider.
+
+    Każde pole jest konwertowane jedną operacją na całej kolumnie (metody `.str` i wyrażenia regularne pandas),
+    więc nietypowy format w jednej karcie daje brak wartości w tym polu, a nie przerywa całego przetwarzania.
+
+    Parametry:
+    - raw_df: pd.DataFrame - Dane z surowymi tekstami w kolumnach 'price', 'distance', 'rate_review', 'num_review'.
+    - sample_size: int - Liczba przykładowych niesparsowanych wartości w raporcie.
+
+    Zwraca:
+    - tuple[pd.DataFrame, pd.DataFrame] - Dane z typowanymi kolumnami oraz raport błędów parsowania
+      (kolumny: field, raw_values, parsed, failed, failed_examples).
+    """
+    df = raw_df.copy()
+    report = []
+    for field, normalizer in NORMALIZERS.items():
+        if field not in df.columns:
+            continue
+        raw = df[field]
+        parsed = normalizer(raw)
+        present = _present(raw)
+        failed = present & parsed.isna()
+        report.append({
+            'field': field,
+            'raw_values': int(present.sum()),
+            'parsed': int((present & parsed.notna()).sum()),
+            'failed': int(failed.sum()),
+            'failed_examples': raw[failed].drop_duplicates().head(sample_size).tolist(),
+        })
+        df[field] = parsed
+    return df, pd.DataFrame(report, columns=['field', 'raw_values', 'parsed', 'failed', 'failed_examples'])
+
+
+def print_parse_report(report):
+    """
+    Wypisuje pola, których część wartości nie dała się sparsować.
+
+    Parametry:
+    - report: pd.DataFrame - Raport błędów parsowania z normalize_listings.
+    """
+    for row in report.itertuples():
+        if row.failed:
+            print(f"Pole '{row.field}': nie udało się sparsować {row.failed}/{row.raw_values} wartości, "
+                  f"np. {row.failed_examples}")
+
+
+def normalize_listings_csv(file_path, report_path=None):
+    """
+    Normalizuje plik CSV z surowymi danymi w miejscu i zapisuje raport błędów parsowania.
+
+    Parametry:
+    - file_path: str - Ścieżka do pliku CSV wygenerowanego przez HotelsSpider.
+    - report_path: str (opcjonalnie) - Ścieżka do pliku CSV z raportem błędów parsowania.
+
+    Zwraca:
+    - pd.DataFrame - Raport błędów parsowania (pusty, jeśli pliku nie udało się przetworzyć).
+    """
+    try:
+        raw_df = pd.read_csv(file_path, dtype={field: 'string' for field in LISTING_FIELDS})
+        df, report = normalize_listings(raw_df)
+        df.to_csv(file_path, index=False)
+        if report_path:
+            report.to_csv(report_path, index=False)
+        print_parse_report(report)
+        print(f"Dane znormalizowane w pliku: {file_path}")
+        return report
+    except Exception as e:
+        print(f"Błąd podczas normalizacji danych: {e}")
+        return pd.DataFrame()
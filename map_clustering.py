@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+TILE_SIZE = 256  # Rozmiar kafelka mapy w pikselach (Web Mercator)
+
+
+def mercator(latitude, longitude):
+    """
+    Rzutuje współrzędne na znormalizowany układ Web Mercator (x, y w zakresie 0-1).
+
+    Parametry:
+    - latitude: np.ndarray - Szerokość geograficzna.
+    - longitude: np.ndarray - Długość geograficzna.
+
+    Zwraca:
+    - tuple[np.ndarray, np.ndarray] - Współrzędne x, y.
+    """
+    x = (np.asarray(longitude, dtype='float64') + 180) / 360
+    sin = np.sin(np.radians(np.clip(latitude, -85.05112878, 85.05112878)))
+    y = 0.5 - np.log((1 + sin) / (1 - sin)) / (4 * np.pi)
+    return x, y
+
+
+class GridClusterIndex:
+    """
+    Hierarchiczny indeks klastrów hoteli na siatce (w stylu supercluster), liczony raz dla zbioru danych.
+
+    Na poziomie przybliżenia z komórka siatki ma `radius` pikseli ekranu. Komórki kolejnych poziomów
+    są zagnieżdżone (komórka na poziomie z-1 to 2x2 komórki poziomu z), więc poziomy są budowane od
+    najdokładniejszego w górę przez sumowanie klastrów, bez ponownego przechodzenia po hotelach.
+    Powyżej max_zoom pokazywane są pojedyncze hotele.
+    """
+
+    def __init__(self, data, radius=60, min_zoom=0, max_zoom=16):
+        """
+        Parametry:
+        - data: pd.DataFrame - Hotele z liczbowymi kolumnami latitude, longitude (bez braków) i price.
+        - radius: int - Rozmiar komórki siatki w pikselach ekranu.
+        - min_zoom: int - Najmniejsze przybliżenie z klastrami.
+        - max_zoom: int - Największe przybliżenie z klastrami.
+        """
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.latitude = data['latitude'].to_numpy(dtype='float64')
+        self.longitude = data['longitude'].to_numpy(dtype='float64')
+        x, y = mercator(self.latitude, self.longitude)
+
+        scale = 2 ** max_zoom * TILE_SIZE / radius
+        cell_x = np.floor(x * scale).astype('int64')
+        cell_y = np.floor(y * scale).astype('int64')
+        level = {
+            'count': np.ones(len(data), dtype='int64'),
+            'sum_latitude': self.latitude,
+            'sum_longitude': self.longitude,
+            'min_price': pd.to_numeric(data['price'], errors='coerce').to_numpy(dtype='float64'),
+            'point': np.arange(len(data)),
+        }
+        self.levels = {}
+        for zoom in range(max_zoom, min_zoom - 1, -1):
+            cell_x, cell_y, level = self._aggregate(cell_x, cell_y, level)
+            self.levels[zoom] = {
+                'latitude': level['sum_latitude'] / level['count'],
+                'longitude': level['sum_longitude'] / level['count'],
+                'count': level['count'],
+                'min_price': level['min_price'],
+                'point': level['point'],
+            }
+            cell_x, cell_y = cell_x // 2, cell_y // 2
+
+    @staticmethod
+    def _aggregate(cell_x, cell_y, level):
+        """
+        Łączy elementy leżące w tej samej komórce siatki (sumy, minimum ceny, jeden reprezentant).
+        """
+        keys = (cell_x << 32) | cell_y
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        starts = np.r_[0, np.flatnonzero(np.diff(inverse[order])) + 1]
+        aggregated = {
+            'count': np.bincount(inverse, weights=level['count']).astype('int64'),
+            'sum_latitude': np.bincount(inverse, weights=level['sum_latitude']),
+            'sum_longitude': np.bincount(inverse, weights=level['sum_longitude']),
+            'min_price': np.fmin.reduceat(level['min_price'][order], starts),
+            'point': level['point'][order][starts],
+        }
+        return unique_keys >> 32, unique_keys & 0xFFFFFFFF, aggregated
+
+    def query(self, south, west, north, east, zoom, padding=0.25):
+        """
+        Klastry i pojedyncze hotele widoczne w danym obszarze mapy przy danym przybliżeniu.
+
+        Parametry:
+        - south, west, north, east: float - Granice widoku mapy.
+        - zoom: float - Przybliżenie mapy.
+        - padding: float - Margines dookoła widoku (ułamek jego rozmiaru), żeby lekkie przesunięcie
+          mapy nie odsłaniało pustych krawędzi.
+
+        Zwraca:
+        - tuple[pd.DataFrame, np.ndarray] - Klastry z więcej niż jednym hotelem (latitude, longitude,
+          count, min_price) oraz pozycje (iloc) pojedynczych hoteli w danych, z których zbudowano indeks.
+        """
+        lat_margin = (north - south) * padding
+        lon_margin = (east - west) * padding
+        south, north = south - lat_margin, north + lat_margin
+        west, east = west - lon_margin, east + lon_margin
+
+        zoom = int(np.floor(zoom))
+        if zoom > self.max_zoom:
+            visible = ((self.latitude >= south) & (self.latitude <= north) &
+                       (self.longitude >= west) & (self.longitude <= east))
+            return pd.DataFrame(columns=['latitude', 'longitude', 'count', 'min_price']), np.flatnonzero(visible)
+
+        level = self.levels[max(zoom, self.min_zoom)]
+        visible = ((level['latitude'] >= south) & (level['latitude'] <= north) &
+                   (level['longitude'] >= west) & (level['longitude'] <= east))
+        single = visible & (level['count'] == 1)
+        grouped = visible & (level['count'] > 1)
+        clusters = pd.DataFrame({
+            'latitude': level['latitude'][grouped],
+            'longitude': level['longitude'][grouped],
+            'count': level['count'][grouped],
+            'min_price': level['min_price'][grouped],
+        })
+        return clusters, level['point'][single]
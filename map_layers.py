@@ -0,0 +1,295 @@
+import json
+
+import folium
+import numpy as np
+import pandas as pd
+from branca.element import CssLink, Element, JavascriptLink, MacroElement
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+from deals import deal_discounts
+
+# Wspólny arkusz stylów dymków i klastrów - dodawany do strony raz, zamiast w każdym dymku osobno.
+# Wstawia go skrypt warstwy, bo st_folium nie przenosi nagłówka (header) mapy.
+STYLESHEET = """
+@import url('https://fonts.googleapis.com/css2?family=Roboto+Mono:ital,wght@0,100..700;1,100..700&display=swap');
+
+.hotel-popup {
+    font-family: 'Roboto Mono', sans-serif !important;
+    font-weight: 700 !important;
+    text-align: left !important;
+}
+
+.hotel-cluster div {
+    width: 36px;
+    height: 36px;
+    margin: 2px;
+    border-radius: 18px;
+    background-color: rgba(95, 158, 160, 0.85);
+    color: white;
+    font: 700 12px 'Roboto Mono', sans-serif;
+    line-height: 36px;
+    text-align: center;
+}
+"""
+
+# Kolumny danych hotelu przekazywane do przeglądarki (nazwa w JS -> kolumna DataFrame)
+MARKER_COLUMNS = {
+    'name': 'name',
+    'price': 'price',
+    'rating': 'rating_stars',
+    'reviews': 'num_review',
+    'address': 'address',
+}
+
+# Funkcje JS wspólne dla warstw: arkusz stylów, ikony, dymki i znaczniki hoteli z kolumn danych
+HOTEL_MARKERS_JS = """
+                if (!document.getElementById("hotel-map-stylesheet")) {
+                    var style = document.createElement("style");
+                    style.id = "hotel-map-stylesheet";
+                    style.textContent = {{ this.stylesheet }};
+                    document.head.appendChild(style);
+                }
+                var icons = [
+                    L.AwesomeMarkers.icon({icon: "heart", markerColor: "cadetblue", iconColor: "beige",
+                                           prefix: "glyphicon"}),
+                    L.AwesomeMarkers.icon({icon: "star", markerColor: "pink", iconColor: "beige",
+                                           prefix: "glyphicon"}),
+                    L.AwesomeMarkers.icon({icon: "tag", markerColor: "green", iconColor: "beige",
+                                           prefix: "glyphicon"})
+                ];
+                var escape = function (value) {
+                    if (value === null) { return "N/A"; }
+                    return String(value).replace(/[&<>"']/g, function (c) {
+                        return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+                    });
+                };
+                var popup = function (columns, i) {
+                    return '<div class="hotel-popup">' +
+                        '<strong>' + escape(columns.name[i]) + '</strong><br>' +
+                        '<b>price:</b> ' + escape(columns.price[i]) + ' PLN<br>' +
+                        '<b>rating:</b> ' + escape(columns.rating[i]) + '<br>' +
+                        '<b>number of reviews:</b> ' + escape(columns.reviews[i]) + '<br>' +
+                        '<b>address:</b> ' + escape(columns.address[i]) + '<br>' +
+                        (columns.deal[i] === null ? '' :
+                            '<b>deal:</b> ' + escape(columns.deal[i]) + '% below similar spots<br>') +
+                        '</div>';
+                };
+                var hotelMarkers = function (columns) {
+                    var markers = new Array(columns.lat.length);
+                    for (var i = 0; i < columns.lat.length; i++) {
+                        var marker = L.marker([columns.lat[i], columns.lon[i]], {icon: icons[columns.icon[i]]});
+                        marker.bindPopup(popup.bind(null, columns, i), {maxWidth: 400});
+                        marker.bindTooltip(escape(columns.name[i]) + " (" + escape(columns.price[i]) + " PLN)");
+                        markers[i] = marker;
+                    }
+                    return markers;
+                };
+"""
+
+
+def column_values(data, column):
+    """
+    Zamienia kolumnę na listę gotową do zapisu w JSON (brakujące wartości -> null).
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli.
+    - column: str - Nazwa kolumny (jeśli jej brak, wszystkie wartości to null).
+
+    Zwraca:
+    - list - Wartości kolumny.
+    """
+    if column not in data.columns:
+        return [None] * len(data)
+    values = data[column]
+    if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+        values = values.astype('Int64')  # 200.0 -> 200, jak w danych ze scrapera
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def to_script_json(value):
+    """
+    Zapisuje wartość jako JSON bezpieczny do osadzenia w <script> ("</" w nazwach hoteli nie zamknie znacznika).
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def hotel_columns(data, top_names=()):
+    """
+    Kolumny danych hoteli dla HOTEL_MARKERS_JS.
+
+    Parametry:
+    - data: pd.DataFrame - Hotele z liczbowymi współrzędnymi (bez braków) i kolumnami MARKER_COLUMNS.
+    - top_names: set[str] - Nazwy hoteli z listy top 5 (wyróżnione ikoną gwiazdki).
+
+    Zwraca:
+    - dict - Listy wartości: lat, lon, icon (0 - zwykły hotel, 1 - top 5, 2 - okazja), deal (procent poniżej
+      typowej ceny podobnych hoteli albo null) oraz klucze MARKER_COLUMNS.
+    """
+    columns = {key: column_values(data, column) for key, column in MARKER_COLUMNS.items()}
+    columns['lat'] = data['latitude'].astype('float64').round(6).tolist()
+    columns['lon'] = data['longitude'].astype('float64').round(6).tolist()
+    deals = deal_discounts(data)
+    columns['deal'] = column_values(deals.to_frame('deal'), 'deal')
+    columns['icon'] = np.where(data['name'].isin(top_names), 1, np.where(deals.notna(), 2, 0)).tolist()
+    return columns
+
+
+class RenderedScript(Element):
+    """
+    Gotowy fragment skryptu. Element z branca parsuje swój tekst jako szablon Jinja, co przy kolumnach
+    tysięcy hoteli (megabajty JSON) trwa dłużej niż zbudowanie samej mapy.
+    """
+
+    def __init__(self, script):
+        super().__init__()
+        self.script = script
+
+    def render(self, **kwargs):
+        return self.script
+
+
+class CachedScriptMixin:
+    """
+    Renderuje skrypt warstwy raz i używa go ponownie przy kolejnych renderowaniach tej samej mapy
+    (st_folium renderuje mapę przy każdym rerunie aplikacji).
+    """
+
+    _rendered_script = None
+
+    def render(self, **kwargs):
+        figure = self.get_root()
+        for name, url in getattr(self, 'default_js', []):
+            figure.header.add_child(JavascriptLink(url), name=name)
+        for name, url in getattr(self, 'default_css', []):
+            figure.header.add_child(CssLink(url), name=name)
+        # st_folium zmienia identyfikatory elementów, a nazwy zmiennych JS są częścią skryptu
+        names = (self.get_name(), self._parent.get_name())
+        if self._rendered_script is None or self._rendered_script[0] != names:
+            self._rendered_script = (names, RenderedScript(self._template.module.script(self, kwargs)))
+        figure.script.add_child(self._rendered_script[1], name=self.get_name())
+
+
+class HotelMarkerCluster(CachedScriptMixin, MarkerCluster):
+    """
+    Warstwa znaczników hoteli budowana w przeglądarce z kolumn danych (jak FastMarkerCluster).
+
+    Zamiast osobnego obiektu folium.Marker i folium.Popup dla każdego hotelu, do HTML trafiają
+    tylko kolumny (współrzędne, nazwa, cena, ...) i jeden szablon JS: trzy wspólne ikony
+    (zwykła, top 5 i okazja), treść dymku tworzona dopiero przy jego otwarciu.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+        """ + HOTEL_MARKERS_JS + """
+                var cluster = L.markerClusterGroup({{ this.options|tojson }});
+                cluster.addLayers(hotelMarkers({{ this.columns }}));
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, data, top_names=(), **kwargs):
+        """
+        Parametry:
+        - data: pd.DataFrame - Hotele z kolumnami latitude, longitude oraz MARKER_COLUMNS (bez brakujących współrzędnych).
+        - top_names: set[str] - Nazwy hoteli z listy top 5 (wyróżnione ikoną gwiazdki).
+        - kwargs: dict - Opcje Leaflet.markercluster (np. zoomToBoundsOnClick).
+        """
+        super().__init__(**kwargs)
+        self._name = "HotelMarkerCluster"
+        self.stylesheet = to_script_json(STYLESHEET)
+        self.columns = to_script_json(hotel_columns(data, top_names))
+
+
+class ViewportClusterLayer(CachedScriptMixin, MacroElement):
+    """
+    Warstwa z klastrami policzonymi po stronie Pythona (map_clustering.GridClusterIndex) dla bieżącego
+    widoku mapy: klastry jako kółka z liczbą hoteli (kliknięcie przybliża mapę), pojedyncze hotele
+    jako zwykłe znaczniki z dymkiem.
+    """
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+        """ + HOTEL_MARKERS_JS + """
+                var clusters = {{ this.clusters }};
+                var layer = L.featureGroup(hotelMarkers({{ this.columns }}));
+                for (var i = 0; i < clusters.lat.length; i++) {
+                    var bubble = L.marker([clusters.lat[i], clusters.lon[i]], {
+                        icon: L.divIcon({className: "hotel-cluster", iconSize: L.point(40, 40),
+                                         html: "<div>" + clusters.count[i] + "</div>"})
+                    });
+                    bubble.bindTooltip(clusters.count[i] + " spots, from " + clusters.min_price[i] + " PLN");
+                    bubble.on("click", function (e) {
+                        e.target._map.setView(e.latlng, e.target._map.getZoom() + 2);
+                    });
+                    layer.addLayer(bubble);
+                }
+                layer.addTo({{ this._parent.get_name() }});
+                return layer;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, clusters, points, top_names=()):
+        """
+        Parametry:
+        - clusters: pd.DataFrame - Klastry (latitude, longitude, count, min_price) z więcej niż jednym hotelem.
+        - points: pd.DataFrame - Pojedyncze hotele do pokazania jako znaczniki.
+        - top_names: set[str] - Nazwy hoteli z listy top 5.
+        """
+        super().__init__()
+        self._name = "ViewportClusterLayer"
+        self.stylesheet = to_script_json(STYLESHEET)
+        self.clusters = to_script_json({
+            'lat': clusters['latitude'].round(6).tolist(),
+            'lon': clusters['longitude'].round(6).tolist(),
+            'count': clusters['count'].astype(int).tolist(),
+            'min_price': column_values(clusters, 'min_price'),
+        })
+        self.columns = to_script_json(hotel_columns(points, top_names))
+
+
+def add_landmark(parent, landmark):
+    """
+    Dodaje wybrany punkt (kliknięty na mapie albo hotel) i okrąg promienia wyszukiwania.
+
+    Parametry:
+    - parent: folium.Map | folium.FeatureGroup - Mapa albo warstwa.
+    - landmark: tuple[float, float, float] - Szerokość, długość geograficzna i promień w metrach.
+    """
+    latitude, longitude, radius = landmark
+    folium.Circle([latitude, longitude], radius=radius, color="#5f9ea0", weight=2, fill=True,
+                  fill_opacity=0.08).add_to(parent)
+    folium.Marker([latitude, longitude], tooltip=f"selected point ({radius:.0f} m)",
+                  icon=folium.Icon(color="red", icon="screenshot", prefix="glyphicon")).add_to(parent)
+
+
+def hotel_map(data, top_names=(), zoom_start=12, tiles='cartodbpositron', landmark=None):
+    """
+    Tworzy mapę z warstwą HotelMarkerCluster.
+
+    Parametry:
+    - data: pd.DataFrame - Hotele z poprawnymi współrzędnymi (liczbowymi, bez braków).
+    - top_names: set[str] - Nazwy hoteli z listy top 5.
+    - zoom_start: int - Początkowe przybliżenie.
+    - tiles: str - Podkład mapy.
+    - landmark: tuple[float, float, float] (opcjonalnie) - Wybrany punkt i promień (patrz add_landmark).
+
+    Zwraca:
+    - folium.Map - Mapa z oznaczeniami hoteli.
+    """
+    if landmark is not None:
+        location = landmark[:2]
+    else:
+        location = [data['latitude'].mean(), data['longitude'].mean()]
+    m = folium.Map(location=location, zoom_start=zoom_start, tiles=tiles)
+    HotelMarkerCluster(data, top_names=top_names, zoom_to_bounds_on_click=True).add_to(m)
+    if landmark is not None:
+        add_landmark(m, landmark)
+    return m
@@ -0,0 +1,81 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from twisted.internet import defer
+
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePool:
+    """
+    Pula procesów do parsowania HTML poza wątkiem reaktora Twisted.
+
+    Spider przekazuje surowe body odpowiedzi do funkcji ekstrakcji uruchamianej w osobnym procesie,
+    a reaktor w tym czasie dalej obsługuje pobieranie kolejnych stron. Wynik wraca jako Deferred,
+    więc można go użyć bezpośrednio w callbacku `async def`.
+    """
+
+    def __init__(self, max_workers):
+        """
+        Parametry:
+        - max_workers: int - Liczba procesów roboczych.
+        """
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    def submit(self, fn, *args):
+        """
+        Zleca wywołanie funkcji w puli procesów.
+
+        Parametry:
+        - fn: callable - Funkcja zdefiniowana na poziomie modułu (musi dać się spiklować).
+        - args: Argumenty funkcji (body, kodowanie, URL itp.).
+
+        Zwraca:
+        - twisted.internet.defer.Deferred - Deferred, który odpali się w wątku reaktora z wynikiem funkcji.
+        """
+        # Import w funkcji, bo scraper_booking usuwa reaktor z sys.modules przy imporcie
+        from twisted.internet import reactor
+
+        deferred = defer.Deferred()
+        future = self.executor.submit(fn, *args)
+
+        def _done(done_future):
+            # Zadanie anulowane przez shutdown - exception() rzuciłoby CancelledError w wątku puli
+            if done_future.cancelled():
+                reactor.callFromThread(deferred.errback, defer.CancelledError())
+                return
+            error = done_future.exception()
+            if error is not None:
+                reactor.callFromThread(deferred.errback, error)
+            else:
+                reactor.callFromThread(deferred.callback, done_future.result())
+
+        future.add_done_callback(_done)
+        return deferred
+
+    def shutdown(self):
+        """
+        Zamyka pulę procesów (bez czekania na niedokończone zadania).
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_parse_pool(parse_workers):
+    """
+    Tworzy pulę procesów na podstawie argumentu spidera.
+
+    Parametry:
+    - parse_workers: str | int | None - Liczba procesów (z `-a parse_workers=N`). 0 lub brak wyłącza pulę.
+
+    Zwraca:
+    - ParsePool | None - Pula procesów lub None, jeśli parsowanie ma się odbywać w wątku reaktora.
+    """
+    if not parse_workers:
+        return None
+    workers = int(parse_workers)
+    if workers <= 0:
+        return None
+    logger.info(f"Parsowanie HTML w puli {workers} procesów")
+    return ParsePool(workers)
@@ -0,0 +1,389 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Kryteria listy "show me top 5" w aplikacji
+TOP_N_CRITERIA = ['distance', 'rate_review', 'rating_stars', 'num_review', 'price', 'deal_score']
+
+# Kierunek sortowania kryterium: True - najlepsze są najmniejsze wartości (odległość, cena),
+# False - największe (ocena, gwiazdki, liczba recenzji, ocena okazji)
+CRITERION_ASCENDING = {
+    'distance': True,
+    'rate_review': False,
+    'rating_stars': False,
+    'num_review': False,
+    'price': True,
+    'deal_score': False,  # Ocena okazji z deals.deal_scores (dodawana w dataset.prepare_dataset)
+    'distance_to_point': True,  # Odległość od punktu wybranego na mapie (dodawana w aplikacji)
+}
+
+# Kryteria trybu "best balance" (ranking ważony i front Pareto)
+BALANCE_CRITERIA = ['price', 'distance', 'rate_review', 'num_review']
+MAX_FRONT = 1000  # Tyle punktów frontu Pareto jest wyznaczanych dokładnie (limit kosztu skyline)
+
+
+def top_n(data, criterion, n=5):
+    """
+    Wybiera n najlepszych hoteli według wybranego kryterium.
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli.
+    - criterion: str - Jedno z TOP_N_CRITERIA.
+    - n: int - Liczba hoteli.
+
+    Zwraca:
+    - pd.DataFrame - Wybrane hotele (pusty DataFrame, jeśli kolumny kryterium brak); hotele bez wartości
+      kryterium są pomijane, więc wyników może być mniej niż n.
+    """
+    if criterion not in data.columns:
+        return data.iloc[0:0]
+    # nsmallest/nlargest dobierają wiersze z NaN, gdy wartości jest mniej niż n
+    data = data[data[criterion].notna()]
+    if CRITERION_ASCENDING[criterion]:
+        return data.nsmallest(n, criterion)
+    return data.nlargest(n, criterion)
+
+
+def in_price_range(data, price_range):
+    """
+    Maska hoteli z ceną w wybranym zakresie (włącznie).
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli (kolumna 'price').
+    - price_range: tuple[float, float] | None - Zakres cen; None oznacza brak ograniczenia.
+
+    Zwraca:
+    - pd.Series - Maska logiczna.
+    """
+    if price_range is None:
+        return pd.Series(True, index=data.index)
+    return (data['price'] >= price_range[0]) & (data['price'] <= price_range[1])
+
+
+def normalized_criteria(data, criteria=BALANCE_CRITERIA):
+    """
+    Macierz kryteriów przeskalowanych do zakresu 0-1, gdzie 1 to najlepsza wartość w danych
+    (kierunek z CRITERION_ASCENDING). Liczba recenzji jest najpierw logarytmowana, żeby kilka hoteli
+    z tysiącami recenzji nie spłaszczyło reszty. Braki danych dostają 0 (najgorsza wartość).
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli.
+    - criteria: list[str] - Kryteria (kolumny macierzy).
+
+    Zwraca:
+    - np.ndarray - Macierz (liczba hoteli x liczba kryteriów).
+    """
+    columns = []
+    for criterion in criteria:
+        if criterion not in data.columns:
+            columns.append(np.zeros(len(data)))
+            continue
+        values = data[criterion].to_numpy(dtype='float64')
+        if criterion == 'num_review':
+            values = np.log1p(values)
+        known = values[~np.isnan(values)]
+        low, high = (known.min(), known.max()) if len(known) else (0.0, 0.0)
+        scaled = (values - low) / (high - low) if high > low else np.where(np.isnan(values), np.nan, 1.0)
+        if CRITERION_ASCENDING[criterion] and high > low:
+            scaled = 1 - scaled
+        columns.append(np.nan_to_num(scaled, nan=0.0))
+    return np.column_stack(columns) if columns else np.zeros((len(data), 0))
+
+
+def dominated_by(leaders, chunk):
+    """
+    Maska wierszy `chunk` przewyższanych przez któryś z wierszy `leaders` (nie gorszy w żadnej kolumnie
+    i lepszy w co najmniej jednej). Kolumny są porównywane po kolei - bez tablicy trójwymiarowej.
+
+    Parametry:
+    - leaders: np.ndarray - Macierz (wiersze x kryteria).
+    - chunk: np.ndarray - Macierz (wiersze x kryteria).
+
+    Zwraca:
+    - np.ndarray - Maska logiczna wierszy `chunk`.
+    """
+    not_worse = np.ones((len(leaders), len(chunk)), dtype=bool)
+    better = np.zeros((len(leaders), len(chunk)), dtype=bool)
+    for column in range(chunk.shape[1]):
+        not_worse &= leaders[:, column, None] >= chunk[None, :, column]
+        better |= leaders[:, column, None] > chunk[None, :, column]
+    return (not_worse & better).any(axis=0)
+
+
+def skyline(values, block=512, leaders_count=16, max_front=None):
+    """
+    Front Pareto (skyline): wiersze, których żaden inny wiersz nie przewyższa we wszystkich kolumnach
+    (większa wartość jest lepsza; przewyższa = nie gorszy w żadnej kolumnie i lepszy w co najmniej jednej).
+
+    Wiersze są sortowane malejąco po sumie kolumn (O(n log n)), więc wiersz może być zdominowany tylko
+    przez wiersze przed nim. Porcje po `block` wierszy są porównywane wektorowo z dotychczasowym frontem
+    i między sobą - łączny koszt to sortowanie plus n x (rozmiar frontu) porównań.
+
+    Przy kryteriach przeciwstawnych (np. cena i ocena) front może objąć większość wierszy, a koszt rośnie
+    wtedy kwadratowo - `max_front` go ogranicza: po zebraniu tylu punktów frontu obliczenie się kończy.
+    Wynik to wtedy punkty frontu o największej sumie kolumn (każdy z nich na pewno należy do frontu),
+    a koszt to najwyżej n x max_front porównań.
+
+    Parametry:
+    - values: np.ndarray - Macierz (wiersze x kryteria).
+    - block: int - Rozmiar porcji.
+    - leaders_count: int - Liczba punktów frontu sprawdzanych w pierwszej kolejności.
+    - max_front: int (opcjonalnie) - Po zebraniu co najmniej tylu punktów frontu obliczenie jest przerywane.
+
+    Zwraca:
+    - np.ndarray - Pozycje wierszy frontu (rosnąco).
+    """
+    values = np.asarray(values, dtype='float64')
+    order = np.argsort(-values.sum(axis=1), kind='stable')
+    front_rows, front = [], np.empty((0, values.shape[1]))
+    for start in range(0, len(order), block):
+        rows = order[start:start + block]
+        chunk = values[rows]
+        # Najpierw najsilniejsze punkty frontu (największe sumy) - odrzucają większość porcji,
+        # potem cały front dla pozostałych
+        for leaders in (front[:leaders_count], front[leaders_count:]):
+            if len(leaders) and len(chunk):
+                dominated = dominated_by(leaders, chunk)
+                rows, chunk = rows[~dominated], chunk[~dominated]
+        dominated = dominated_by(chunk, chunk)
+        front_rows.append(rows[~dominated])
+        front = np.concatenate([front, chunk[~dominated]])
+        if max_front is not None and len(front) >= max_front:
+            break
+    return np.sort(np.concatenate(front_rows)) if front_rows else np.empty(0, dtype='int64')
+
+
+class RankingIndex:
+    """
+    Indeks zapytań top N i zakresu cen, liczony raz dla zbioru danych.
+
+    Dla każdego kryterium trzyma permutację wierszy z wartością kryterium, od najlepszego do najgorszego
+    (wiersze bez wartości są pomijane, jak w top_n),
+    a ceny - posortowane, więc zakres cen to dwa wyszukiwania binarne (searchsorted). Top N w zakresie
+    cen to przejście po permutacji kryterium od początku, aż zbierze się n hoteli z zakresu; jeśli
+    zakres jest wąski, taniej jest posortować tylko hotele z zakresu według ich pozycji w permutacji.
+    Wyniki są takie same jak top_n(data[in_price_range(data, price_range)], criterion, n), remisy
+    w kolejności wierszy danych.
+
+    Tryb "best balance" korzysta z macierzy normalized_criteria (liczonej raz, w kolejności cen): front
+    Pareto zależy tylko od zakresu cen, więc przy zmianie wag jest brany z pamięci, a wynik ważony
+    liczony tylko dla hoteli z frontu. Front jest wyznaczany najwyżej do max_front punktów (skyline);
+    gdy jest niepełny, najlepsi kandydaci według wag są sprawdzani bezpośrednio na tle całego zakresu.
+    """
+
+    max_cached_fronts = 16
+    max_front = MAX_FRONT
+    max_front_checks = 10  # Na jeden hotel wyniku - tylu kandydatów spoza niepełnego frontu jest sprawdzanych
+
+    def __init__(self, data):
+        """
+        Parametry:
+        - data: pd.DataFrame - Hotele (np. z dataset.prepare_dataset); wyniki to wiersze tej ramki.
+        """
+        self.data = data
+        self.prices = data['price'].to_numpy(dtype='float64')
+        self.price_order = np.argsort(self.prices, kind='stable')  # Braki (NaN) na końcu
+        self.sorted_prices = self.prices[self.price_order]
+        self.orders = {}
+        self.positions = {}
+        for criterion, ascending in CRITERION_ASCENDING.items():
+            if criterion not in data.columns:
+                continue
+            values = data[criterion].to_numpy(dtype='float64')
+            # Sortowanie stabilne - tak jak kolejność nsmallest/nlargest; braki (NaN na końcu) są odcinane
+            order = np.argsort(values if ascending else -values, kind='stable')
+            order = order[:np.count_nonzero(~np.isnan(values))]
+            # Wiersze bez wartości mają pozycję za ostatnim hotelem permutacji
+            positions = np.full(len(data), len(order), dtype='int64')
+            positions[order] = np.arange(len(order))
+            self.orders[criterion] = order
+            self.positions[criterion] = positions
+        # W kolejności cen - hotele z zakresu cen to ciągły fragment macierzy
+        self.balance_values = normalized_criteria(data)[self.price_order]
+        self._fronts = OrderedDict()
+
+    def price_bounds(self, price_range):
+        """
+        Zakres pozycji w price_order z cenami w wybranym zakresie (włącznie).
+
+        Zwraca:
+        - tuple[int, int] - Początek i koniec (bez końca) zakresu.
+        """
+        if price_range is None:
+            return 0, len(self.prices)
+        return (int(np.searchsorted(self.sorted_prices, price_range[0], side='left')),
+                int(np.searchsorted(self.sorted_prices, price_range[1], side='right')))
+
+    def in_price_range(self, price_range):
+        """
+        Maska hoteli z ceną w wybranym zakresie (jak ranking.in_price_range).
+
+        Zwraca:
+        - np.ndarray - Maska logiczna w kolejności wierszy danych.
+        """
+        if price_range is None:
+            return np.ones(len(self.prices), dtype=bool)
+        start, stop = self.price_bounds(price_range)
+        mask = np.zeros(len(self.prices), dtype=bool)
+        mask[self.price_order[start:stop]] = True
+        return mask
+
+    def top_n_rows(self, criterion, n=5, price_range=None):
+        """
+        Pozycje (iloc) n najlepszych hoteli według kryterium, w kolejności od najlepszego.
+
+        Parametry:
+        - criterion: str - Jedno z TOP_N_CRITERIA.
+        - n: int - Liczba hoteli.
+        - price_range: tuple[float, float] | None - Zakres cen; None oznacza brak ograniczenia.
+
+        Zwraca:
+        - np.ndarray - Pozycje wierszy (pusta tablica, jeśli kolumny kryterium brak); hotele bez wartości
+          kryterium są pomijane, więc wyników może być mniej niż n.
+        """
+        if criterion not in self.orders:
+            return np.empty(0, dtype='int64')
+        order = self.orders[criterion]
+        if price_range is None:
+            return order[:n]
+        start, stop = self.price_bounds(price_range)
+        if criterion == 'price':
+            # Permutacja cen to price_order - hotele z zakresu są w niej kolejno
+            return self.price_order[start:min(stop, start + n)]
+        low, high = price_range
+
+        # Przejście po permutacji kryterium porcjami rosnącej wielkości
+        scanned, chunk, found = 0, max(4 * n, 64), []
+        while scanned < len(order) and scanned < stop - start:
+            rows = order[scanned:scanned + chunk]
+            prices = self.prices[rows]
+            found.extend(rows[(prices >= low) & (prices <= high)][:n - len(found)])
+            if len(found) >= n:
+                return np.asarray(found, dtype='int64')
+            scanned += len(rows)
+            chunk *= 2
+        if len(found) == stop - start or scanned >= len(order):
+            # Zebrano już wszystkie hotele z zakresu
+            return np.asarray(found, dtype='int64')
+
+        # Hotele z zakresu są daleko w kolejności kryterium - wybór spośród samych hoteli z zakresu
+        rows = self.price_order[start:stop]
+        positions = self.positions[criterion][rows]
+        valued = positions < len(order)
+        rows, positions = rows[valued], positions[valued]
+        if len(rows) > n:
+            nearest = np.argpartition(positions, n - 1)[:n]
+            rows, positions = rows[nearest], positions[nearest]
+        return rows[np.argsort(positions)]
+
+    def top_n(self, criterion, n=5, price_range=None):
+        """
+        n najlepszych hoteli według kryterium w wybranym zakresie cen.
+
+        Zwraca:
+        - pd.DataFrame - Wybrane hotele (wiersze danych indeksu).
+        """
+        return self.data.iloc[self.top_n_rows(criterion, n, price_range)]
+
+    def _front(self, start, stop):
+        """
+        Pozycje frontu Pareto we fragmencie price_order[start:stop] (z pamięci, jeśli był już liczony).
+        """
+        if (start, stop) not in self._fronts:
+            self._fronts[(start, stop)] = skyline(self.balance_values[start:stop], max_front=self.max_front)
+            while len(self._fronts) > self.max_cached_fronts:
+                self._fronts.popitem(last=False)
+        self._fronts.move_to_end((start, stop))
+        return self._fronts[(start, stop)]
+
+    def pareto_front(self, price_range=None):
+        """
+        Hotele z wybranego zakresu cen, których żaden inny hotel z zakresu nie przewyższa we wszystkich
+        kryteriach BALANCE_CRITERIA.
+
+        Zwraca:
+        - np.ndarray - Pozycje (iloc) hoteli frontu, w kolejności cen.
+        """
+        start, stop = self.price_bounds(price_range)
+        return self.price_order[start:stop][self._front(start, stop)]
+
+    def front_complete(self, price_range=None):
+        """
+        Czy pareto_front zwraca cały front (False - front przekroczył max_front i zawiera tylko jego
+        część: hotele o największej sumie kryteriów).
+        """
+        return len(self._front(*self.price_bounds(price_range))) < self.max_front
+
+    def _checked_front(self, values, scores, front, n):
+        """
+        n najlepszych według wyniku hoteli frontu, gdy front jest niepełny: kandydaci w kolejności wyniku
+        (najwyżej max_front_checks x n) są sprawdzani na tle wszystkich hoteli z zakresu cen.
+
+        Parametry:
+        - values: np.ndarray - Znormalizowane kryteria hoteli z zakresu cen.
+        - scores: np.ndarray - Wyniki ważone tych hoteli.
+        - front: np.ndarray - Znane pozycje frontu (niepełnego).
+        - n: int - Liczba hoteli.
+
+        Zwraca:
+        - np.ndarray - Pozycje hoteli frontu (znany front i sprawdzeni kandydaci).
+        """
+        checks = min(self.max_front_checks * n, len(scores))
+        best = np.argpartition(-scores, checks - 1)[:checks]
+        best = best[np.lexsort((best, -scores[best]))]
+        on_front = np.zeros(len(scores), dtype=bool)
+        on_front[front] = True
+        found = 0
+        for row in best:
+            if not on_front[row]:
+                on_front[row] = not dominated_by(values, values[row][None, :])[0]
+            found += on_front[row]
+            if found == n:
+                break
+        return np.flatnonzero(on_front)
+
+    def weight_vector(self, weights):
+        """
+        Wagi BALANCE_CRITERIA jako wektor o sumie 1 (ujemne wagi jak 0; same zera - równe wagi).
+
+        Parametry:
+        - weights: dict[str, float] - Wagi kryteriów.
+
+        Zwraca:
+        - np.ndarray - Wektor wag.
+        """
+        vector = np.array([max(float(weights.get(criterion, 0)), 0.0) for criterion in BALANCE_CRITERIA])
+        if vector.sum() == 0:
+            return np.full(len(vector), 1 / len(vector))
+        return vector / vector.sum()
+
+    def balanced_top_n(self, weights, n=5, price_range=None):
+        """
+        n hoteli o najlepszym wyniku ważonym (0-1, średnia ważona znormalizowanych kryteriów) w zakresie
+        cen, wybranych z frontu Pareto. Jeśli na froncie jest mniej niż n hoteli, lista jest uzupełniana
+        najlepszymi spoza niego.
+
+        Parametry:
+        - weights: dict[str, float] - Wagi kryteriów BALANCE_CRITERIA.
+        - n: int - Liczba hoteli.
+        - price_range: tuple[float, float] | None - Zakres cen.
+
+        Zwraca:
+        - pd.DataFrame - Wybrane hotele z kolumnami balance_score i pareto_optimal.
+        """
+        start, stop = self.price_bounds(price_range)
+        front = self._front(start, stop)
+        if len(front) >= self.max_front:
+            # Niepełny front - dopisanie najlepszych według wag hoteli, które też są na froncie
+            values = self.balance_values[start:stop]
+            front = self._checked_front(values, values @ self.weight_vector(weights), front, n)
+        # Front zwykle ma co najmniej n hoteli - wtedy wynik liczony jest tylko dla niego
+        candidates = front if len(front) >= n else np.arange(stop - start)
+        scores = self.balance_values[start:stop][candidates] @ self.weight_vector(weights)
+        on_front = np.isin(candidates, front)
+        key = scores + on_front * 2  # Wyniki są w zakresie 0-1, więc hotele z frontu są zawsze przed resztą
+        best = np.argpartition(-key, n - 1)[:n] if len(candidates) > n else np.arange(len(candidates))
+        best = best[np.lexsort((candidates[best], -key[best]))]
+        rows = self.price_order[start:stop][candidates[best]]
+        return self.data.iloc[rows].assign(balance_score=scores[best], pareto_optimal=on_front[best])
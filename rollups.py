@@ -0,0 +1,257 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+# Progi cen za noc (PLN) dla kategorii price_range - te same, co w opisie kategorii w aplikacji
+PRICE_RANGE_BINS = [0, 150, 300, 500, np.inf]
+PRICE_RANGE_LABELS = ['cheap', 'moderate', 'expensive', 'luxury']
+
+ROLLUP_KEYS = ['city', 'snapshot_date', 'hotel_type', 'price_range']
+UNKNOWN_KEY = 'unknown'  # Wartość klucza agregatu dla braku (np. hotel bez pobranego typu)
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    city TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    hotel_type TEXT NOT NULL,
+    price_range TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    min REAL,
+    max REAL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (city, snapshot_date, hotel_type, price_range)
+);
+CREATE INDEX IF NOT EXISTS idx_rollups_date ON rollups (snapshot_date);
+"""
+
+
+def price_range(price_per_night):
+    """
+    Przypisuje kategorię cenową na podstawie ceny za noc.
+
+    Parametry:
+    - price_per_night: pd.Series - Cena za noc.
+
+    Zwraca:
+    - pd.Series - Kategoria (cheap / moderate / expensive / luxury).
+    """
+    return pd.cut(price_per_night, bins=PRICE_RANGE_BINS, labels=PRICE_RANGE_LABELS)
+
+
+class QuantileSketch:
+    """
+    Scalany szkic kwantyli z gwarantowanym błędem względnym (histogram o logarytmicznych koszykach).
+
+    Wartość x > 0 trafia do koszyka ceil(log(x) / log(gamma)), gdzie gamma = (1 + a) / (1 - a).
+    Dwa szkice łączy się przez dodanie liczników koszyków, więc agregaty z kolejnych scrapowań
+    i z wielu dni można łączyć bez dostępu do surowych wierszy.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Parametry:
+        - relative_accuracy: float - Dopuszczalny błąd względny kwantyli (np. 0.01 = 1%).
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins = {}
+        self.zero_count = 0  # Wartości <= 0
+
+    @property
+    def count(self):
+        return self.zero_count + sum(self.bins.values())
+
+    def add_many(self, values):
+        """
+        Dodaje wartości do szkicu (wektorowo).
+
+        Parametry:
+        - values: array-like - Wartości liczbowe (NaN są pomijane).
+        """
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        self.zero_count += int(len(values) - len(positive))
+        keys, counts = np.unique(np.ceil(np.log(positive) / self.log_gamma).astype('int64'), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.bins[key] = self.bins.get(key, 0) + count
+        return self
+
+    def merge(self, other):
+        """
+        Dołącza inny szkic (z tą samą dokładnością).
+        """
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        return self
+
+    def quantile(self, q):
+        """
+        Zwraca przybliżony kwantyl rzędu q (0-1) lub NaN dla pustego szkicu.
+        """
+        total = self.count
+        if total == 0:
+            return float('nan')
+        rank = q * (total - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # Środek koszyka (gamma^(k-1), gamma^k] w sensie błędu względnego
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_json(self):
+        keys = sorted(self.bins)
+        return json.dumps({'a': self.relative_accuracy, 'z': self.zero_count, 'k': keys,
+                           'c': [self.bins[key] for key in keys]})
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        sketch = cls(data['a'])
+        sketch.zero_count = data['z']
+        sketch.bins = dict(zip(data['k'], data['c']))
+        return sketch
+
+
+def build_rollups(rows):
+    """
+    Agreguje wiersze migawki według (miasto, data migawki, typ hotelu, kategoria cenowa).
+
+    Parametry:
+    - rows: pd.DataFrame - Wiersze z snapshot_store.snapshot_rows.
+
+    Zwraca:
+    - list[dict] - Agregaty: klucze ROLLUP_KEYS oraz count, sum, min, max i szkic ceny za noc.
+    """
+    rows = rows.dropna(subset=['price_per_night'])
+    if rows.empty:
+        return []
+    frame = pd.DataFrame({
+        'city': rows['city'].fillna(UNKNOWN_KEY).astype(str),
+        'snapshot_date': rows['snapshot_date'],
+        'hotel_type': rows['hotel_type'].fillna(UNKNOWN_KEY).astype(str),
+        'price_range': price_range(rows['price_per_night'].astype('float64')).astype(str),
+        'price_per_night': rows['price_per_night'].astype('float64'),
+    })
+    rollups = []
+    for key, group in frame.groupby(ROLLUP_KEYS, sort=False)['price_per_night']:
+        values = group.to_numpy()
+        rollups.append({
+            **dict(zip(ROLLUP_KEYS, key)),
+            'count': len(values),
+            'sum': float(values.sum()),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'sketch': QuantileSketch().add_many(values),
+        })
+    return rollups
+
+
+def merge_into_table(connection, rollups):
+    """
+    Scala nowe agregaty z zapisanymi w tabeli rollups (w ramach bieżącej transakcji).
+
+    Parametry:
+    - connection: sqlite3.Connection - Połączenie z bazą historii cen.
+    - rollups: list[dict] - Agregaty z build_rollups.
+    """
+    for rollup in rollups:
+        key = tuple(rollup[column] for column in ROLLUP_KEYS)
+        stored = connection.execute(
+            "SELECT count, sum, min, max, sketch FROM rollups "
+            "WHERE city = ? AND snapshot_date = ? AND hotel_type = ? AND price_range = ?",
+            key,
+        ).fetchone()
+        count, total, low, high, sketch = (rollup['count'], rollup['sum'], rollup['min'], rollup['max'],
+                                           rollup['sketch'])
+        if stored:
+            count += stored[0]
+            total += stored[1]
+            low = min(low, stored[2])
+            high = max(high, stored[3])
+            sketch = QuantileSketch.from_json(stored[4]).merge(sketch)
+        connection.execute(
+            "INSERT OR REPLACE INTO rollups (city, snapshot_date, hotel_type, price_range, count, sum, min, max, "
+            "sketch) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, count, total, low, high, sketch.to_json()),
+        )
+
+
+def summarize(rollup_rows, group_by, quantiles=(0.25, 0.5, 0.75, 0.9)):
+    """
+    Łączy zapisane agregaty (np. z wielu dni) w statystyki dla wybranych grup.
+
+    Parametry:
+    - rollup_rows: pd.DataFrame - Wiersze tabeli rollups.
+    - group_by: list[str] - Kolumny grupujące (podzbiór ROLLUP_KEYS).
+    - quantiles: tuple[float] - Kwantyle do policzenia ze scalonych szkiców.
+
+    Zwraca:
+    - pd.DataFrame - Kolumny group_by oraz count, mean, min, max i p25/p50/... ceny za noc.
+    """
+    columns = group_by + ['count', 'mean', 'min', 'max'] + [f"p{int(q * 100)}" for q in quantiles]
+    if rollup_rows.empty:
+        return pd.DataFrame(columns=columns)
+    summary = []
+    for key, group in rollup_rows.groupby(group_by, sort=True):
+        key = key if isinstance(key, tuple) else (key,)
+        sketch = QuantileSketch()
+        for text in group['sketch']:
+            sketch.merge(QuantileSketch.from_json(text))
+        count = int(group['count'].sum())
+        summary.append([*key, count, group['sum'].sum() / count, group['min'].min(), group['max'].max(),
+                        *[sketch.quantile(q) for q in quantiles]])
+    return pd.DataFrame(summary, columns=columns)
+
+
+def histogram_counts(values, bins=20, value_range=None):
+    """
+    Liczniki histogramu (np.histogram) - wykres z nich ma stały rozmiar, niezależny od liczby wierszy.
+
+    Parametry:
+    - values: pd.Series - Wartości liczbowe (braki są pomijane).
+    - bins: int - Liczba przedziałów równej szerokości między najmniejszą a największą wartością.
+    - value_range: tuple[float, float] (opcjonalnie) - Zakres przedziałów zamiast min i max wartości.
+
+    Zwraca:
+    - tuple[np.ndarray, np.ndarray] - Liczniki przedziałów i ich granice (o jedną więcej niż liczników).
+    """
+    values = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64')
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return np.zeros(0, dtype='int64'), np.zeros(1)
+    return np.histogram(values, bins=bins, range=value_range)
+
+
+def treemap_rollup(data, path, value_column, color_column):
+    """
+    Agregaty liści treemapy: suma wartości i średnia koloru ważona wartością (jak liczy ją px.treemap
+    dla wierszy surowych), po jednym wierszu na liść zamiast na hotel.
+
+    Parametry:
+    - data: pd.DataFrame - Dane hoteli.
+    - path: list[str] - Kolumny hierarchii treemapy (np. typ hotelu, kategoria cenowa).
+    - value_column: str - Kolumna wielkości pól (sumowana).
+    - color_column: str - Kolumna koloru (średnia ważona; braki są pomijane).
+
+    Zwraca:
+    - pd.DataFrame - Kolumny path, value_column i color_column; tylko liście o dodatniej sumie wartości.
+    """
+    values = pd.to_numeric(data[value_column], errors='coerce')
+    colors = pd.to_numeric(data[color_column], errors='coerce')
+    frame = data[path].assign(value=values, weighted=values * colors, weight=values.where(colors.notna()))
+    grouped = frame.groupby(path, observed=True, sort=False)[['value', 'weighted', 'weight']].sum()
+    grouped = grouped[grouped['value'] > 0]
+    return pd.DataFrame({
+        value_column: grouped['value'],
+        color_column: grouped['weighted'] / grouped['weight'].where(grouped['weight'] > 0),
+    }).reset_index()
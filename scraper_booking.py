@@ -2,44 +2,66 @@ import sys
 
 if "twisted.internet.reactor" in sys.modules:
     del sys.modules["twisted.internet.reactor"]
-import re
 import logging
 import scrapy
+from scrapy import signals
 import subprocess
 import pandas as pd
+from urllib.parse import urljoin
+from w3lib.html import get_base_url
+from parse_pool import create_parse_pool
+from listing_normalization import normalize_listings_csv
+
+# Tryby pobierania stron hoteli po wynikach wyszukiwania
+DETAIL_MODES = ['all', 'lazy']
+
+# Lista końcówek-aby zescrapować jak najwięcej hoteli to sortuję po różnych atrybutach
+LISTING_SUFFIXES = [
+    "",  # Bez końcówki
+    "&order=upsort_bh",
+    "&order=price",
+    "&order=price_from_high_to_low",
+    "&order=review_score_and_price",
+    "&order=class",
+    "&order=class_asc",
+    "&order=distance_from_search",
+    "&order=bayesian_review_score",
+    "&order=class_and_price",
+]
 
 
 class HotelsSpider(scrapy.Spider):
     name = "hotels"
 
-    def __init__(self, url=None, *args, **kwargs):
+    def __init__(self, url=None, parse_workers=None, details='all', *args, **kwargs):
         """
         Inicjalizuje spidera, który generuje listę URL do scrapowania na podstawie podanego URL-a i różnych końcówek linków.
 
         Parametry:
         - url: str. (opcjonalnie) - Główny URL, do którego będą dodawane różne końcówki.
+        - parse_workers: str | int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem.
+        - details: str - 'all' - po wynikach wyszukiwania pobierz strony wszystkich hoteli,
+          'lazy' - zakończ na wynikach wyszukiwania (strony hoteli pobiera potem lazy_enrichment).
         """
 
         super(HotelsSpider, self).__init__(*args, **kwargs)
         if url:
-            # Lista końcówek-aby zescrapować jak najwięcej hoteli to sortuję po różnych atrybutach
-            suffixes = [
-                "",  # Bez końcówki
-                "&order=upsort_bh",
-                "&order=price",
-                "&order=price_from_high_to_low",
-                "&order=review_score_and_price",
-                "&order=class",
-                "&order=class_asc",
-                "&order=distance_from_search",
-                "&order=bayesian_review_score",
-                "&order=class_and_price",
-            ]
-            # Generowanie URL-i z końcówkami
-            self.start_urls = [f"{url}{suffix}" for suffix in suffixes]
+            self.start_urls = [f"{url}{suffix}" for suffix in LISTING_SUFFIXES]
         else:
             raise ValueError("Brak URL! Podaj URL podczas uruchamiania scrapera.")
         self.seen_links = set()  # Zbiór przechowujący już widziane linki
+        self.parse_workers = parse_workers
+        self.parse_pool = create_parse_pool(parse_workers)
+        if details not in DETAIL_MODES:
+            raise ValueError(f"Nieznany tryb details: {details}. Dostępne: {', '.join(DETAIL_MODES)}")
+        self.details = details
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(HotelsSpider, cls).from_crawler(crawler, *args, **kwargs)
+        # Plik bookingResults.csv jest kompletny dopiero po zamknięciu eksportu, a nie w chwili close()
+        crawler.signals.connect(spider.process_results, signal=signals.feed_exporter_closed)
+        return spider
 
     custom_settings = {
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -56,91 +78,168 @@ class HotelsSpider(scrapy.Spider):
     def parse(self, response):
         """
         Funkcja, która przetwarza odpowiedź HTTP, ekstraktuje dane o hotelach i zapisuje je w formacie JSON.
+        Jeśli spider ma pulę procesów (`-a parse_workers=N`), parsowanie HTML odbywa się poza wątkiem reaktora.
 
         Parametry:
         - response: scrapy.http.Response - Odpowiedź HTTP otrzymana podczas scrapowania.
         """
-        hotel_cards = response.xpath('//*[@data-testid="property-card"]')
+        if self.parse_pool is not None:
+            return self._parse_in_pool(response)
+        return self._unseen_hotels(extract_hotel_cards(response.body, response.encoding, response.url))
 
-        for card in hotel_cards:
-            link = response.urljoin(card.xpath('.//h3[@class="aab71f8e4e"]//@href').get())
-            if link in self.seen_links:
-                continue  # Pomijanie duplikatów
-            self.seen_links.add(link)
+    async def _parse_in_pool(self, response):
+        """
+        Wysyła body odpowiedzi do puli procesów i czeka (bez blokowania reaktora) na wyekstraktowane hotele.
 
-            raw_price = card.xpath('.//*[@data-testid="price-and-discounted-price"]//text()').get()
-            clean_price = (
-                int(raw_price.replace(' ', '').replace('zł', '').strip().encode('ascii', 'ignore').decode('ascii'))
-                if raw_price else None
-            )
+        Parametry:
+        - response: scrapy.http.Response - Odpowiedź HTTP otrzymana podczas scrapowania.
 
-            raw_distance = card.xpath('.//span[@data-testid="distance"]//text()').get()
-            if raw_distance:
-                distance_value, distance_unit = raw_distance.replace(',', '.').split(' ')[:2]
-                distance_value = float(distance_value.strip())
-                clean_distance = distance_value * 1000 if distance_unit.lower() == 'km' else distance_value
-            else:
-                clean_distance = None
-
-            raw_rate_review = card.xpath('.//*[@data-testid="review-score"]//text()').get()
-            clean_rate_review = (
-                float(raw_rate_review.replace(',', '.').split(' ')[2].strip()) if raw_rate_review else None
-            )
+        Zwraca:
+        - list[dict] - Lista hoteli, które nie były jeszcze widziane.
+        """
+        hotels = await self.parse_pool.submit(extract_hotel_cards, response.body, response.encoding, response.url)
+        return list(self._unseen_hotels(hotels))
 
-            raw_reviews = card.xpath(
-                './/*[@data-testid="review-score"]//div[contains(@class,"abf093bdfe")]//text()').get()
-            clean_reviews = int(re.sub(r'\D', '', raw_reviews)) if raw_reviews else None
+    def _unseen_hotels(self, hotels):
+        """
+        Odfiltrowuje hotele, których link był już widziany w innej odpowiedzi.
 
-            rating_stars = len(
-                card.xpath('.//div[@data-testid="rating-stars"]//span[contains(@class, "fcd9eec8fb")]').extract()
-            )
-            if rating_stars == 0:
-                rating_stars = len(
-                    card.xpath('.//div[@data-testid="rating-circles"]//span[contains(@class, "fcd9eec8fb")]').extract()
-                )
-            if rating_stars == 0:
-                rating_stars = len(
-                    card.xpath('.//div[@data-testid="rating-squares"]//span[contains(@class, "fcd9eec8fb")]').extract()
-                )
-
-            yield {
-                'name': card.xpath('.//*[@data-testid="title"]//text()').get(),
-                'address': card.xpath('.//*[@data-testid="address"]//text()').get(),
-                'price': clean_price,
-                'distance': clean_distance,
-                'rate_review': clean_rate_review,
-                'num_review': clean_reviews,
-                'rating_stars': rating_stars,
-                'link': link,
-                'source_url': response.url,  # Dodanie oryginalnego URL-a z końcówką
-            }
+        Parametry:
+        - hotels: list[dict] - Hotele wyekstraktowane z jednej strony wyników.
+        """
+        for hotel in hotels:
+            if hotel['link'] in self.seen_links:
+                continue  # Pomijanie duplikatów
+            self.seen_links.add(hotel['link'])
+            yield hotel
 
     def close(self, reason):
         """
-        Funkcja uruchamiana po zakończeniu działania Scrapera.
-        Usuwa duplikaty z pliku CSV i uruchamia drugi Scraper.
+        Funkcja uruchamiana po zakończeniu działania Scrapera. Zamyka pulę procesów do parsowania.
 
         Parametry:
         - reason: str - Powód zakończenia działania Scrapera.
         """
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+
+    def process_results(self):
+        """
+        Funkcja uruchamiana po zapisaniu pliku z wynikami.
+        Usuwa duplikaty z pliku CSV i (w trybie details='all') uruchamia drugi Scraper.
+        """
         print("Scrapowanie głównych danych zakończone. Usuwanie duplikatów...")
         remove_duplicates_from_csv('bookingResults.csv')
-        print("Duplikaty usunięte. Rozpoczynam scrapowanie detali...")
+        print("Duplikaty usunięte. Normalizacja danych...")
+        normalize_listings_csv('bookingResults.csv', report_path='bookingResults_parse_report.csv')
+        if self.details == 'lazy':
+            print("Tryb lazy - strony hoteli zostaną pobrane osobno.")
+            return
+        print("Rozpoczynam scrapowanie detali...")
+        command = [
+            "scrapy",
+            "runspider",
+            "scraper_hotel_details.py",
+            "-a",
+            "csv_file=bookingResults.csv",
+        ]
+        if self.parse_workers:
+            command += ["-a", f"parse_workers={self.parse_workers}"]
         try:
-            subprocess.run(
-                [
-                    "scrapy",
-                    "runspider",
-                    "scraper_hotel_details.py",
-                    "-a",
-                    "csv_file=bookingResults.csv",
-                ],
-                check=True,
-            )
+            subprocess.run(command, check=True)
         except subprocess.CalledProcessError as e:
             print(f"Error during second Scrapy execution: {e}")
 
 
+def extract_hotel_cards(body, encoding, url):
+    """
+    Ekstraktuje surowe dane o hotelach z HTML strony wyników wyszukiwania.
+    Funkcja jest czysta i zdefiniowana na poziomie modułu, więc można ją uruchomić w puli procesów.
+
+    Parametry:
+    - body: bytes - Body odpowiedzi HTTP.
+    - encoding: str - Kodowanie odpowiedzi.
+    - url: str - URL strony wyników (do budowania linków absolutnych i kolumny 'source_url').
+
+    Zwraca:
+    - list[dict] - Lista hoteli w kolejności występowania na stronie (bez usuwania duplikatów).
+    """
+    text = body.decode(encoding, errors='replace')
+    selector = scrapy.Selector(text=text)
+    base_url = get_base_url(text, url)
+    hotels = []
+
+    for card in selector.xpath('//*[@data-testid="property-card"]'):
+        link = urljoin(base_url, card.xpath('.//h3[@class="aab71f8e4e"]//@href').get())
+
+        # Pola są zapisywane jako surowe teksty; czyszczenie odbywa się kolumnowo w listing_normalization
+        raw_price = card.xpath('.//*[@data-testid="price-and-discounted-price"]//text()').get()
+        raw_distance = card.xpath('.//span[@data-testid="distance"]//text()').get()
+        raw_rate_review = card.xpath('.//*[@data-testid="review-score"]//text()').get()
+        raw_reviews = card.xpath(
+            './/*[@data-testid="review-score"]//div[contains(@class,"abf093bdfe")]//text()').get()
+
+        rating_stars = len(
+            card.xpath('.//div[@data-testid="rating-stars"]//span[contains(@class, "fcd9eec8fb")]').extract()
+        )
+        if rating_stars == 0:
+            rating_stars = len(
+                card.xpath('.//div[@data-testid="rating-circles"]//span[contains(@class, "fcd9eec8fb")]').extract()
+            )
+        if rating_stars == 0:
+            rating_stars = len(
+                card.xpath('.//div[@data-testid="rating-squares"]//span[contains(@class, "fcd9eec8fb")]').extract()
+            )
+
+        hotels.append({
+            'name': card.xpath('.//*[@data-testid="title"]//text()').get(),
+            'address': card.xpath('.//*[@data-testid="address"]//text()').get(),
+            'price': raw_price,
+            'distance': raw_distance,
+            'rate_review': raw_rate_review,
+            'num_review': raw_reviews,
+            'rating_stars': rating_stars,
+            'link': link,
+            'source_url': url,  # Dodanie oryginalnego URL-a z końcówką
+        })
+    return hotels
+
+
+def build_search_url(city, checkin, checkout, adults):
+    """
+    Buduje link do wyszukiwania na Booking.com.
+
+    Parametry:
+    - city: str - Miejsce docelowe.
+    - checkin: datetime.date | str - Data zameldowania.
+    - checkout: datetime.date | str - Data wymeldowania.
+    - adults: int - Liczba dorosłych.
+
+    Zwraca:
+    - str - URL strony wyników wyszukiwania.
+    """
+    return (
+        f"https://www.booking.com/searchresults.pl.html"
+        f"?ss={city}"
+        f"&checkin={checkin}&checkout={checkout}"
+        f"&group_adults={adults}"
+    )
+
+
+def canonical_link(link):
+    """
+    Zwraca kanoniczny link do strony hotelu (bez parametrów zapytania i fragmentu).
+    Parametry w linkach z wyników zależą od wyszukiwania (daty, liczba osób), a strona hotelu nie.
+
+    Parametry:
+    - link: str - Link do strony hotelu z wyników wyszukiwania.
+
+    Zwraca:
+    - str - Link bez części '?...' i '#...'.
+    """
+    return link.split('#', 1)[0].split('?', 1)[0]
+
+
 def remove_duplicates_from_csv(file_path):
     """
     Usuwa duplikaty z pliku CSV na podstawie kolumny 'link'.
@@ -157,12 +256,14 @@ def remove_duplicates_from_csv(file_path):
         print(f"Błąd podczas usuwania duplikatów: {e}")
 
 
-def run_spider(url):
+def run_spider(url, parse_workers=None, details='all'):
     """
     Uruchamia Scrapy jako osobny proces za pomocą subprocess.
 
     Parametry:
     - url: str-URL, który ma zostać użyty do uruchomienia Scrapy.
+    - parse_workers: int (opcjonalnie) - Liczba procesów do parsowania HTML poza reaktorem Twisted.
+    - details: str - 'all' albo 'lazy' (tylko wyniki wyszukiwania, patrz HotelsSpider).
     """
     command = [
         "scrapy",
@@ -171,6 +272,10 @@ def run_spider(url):
         "-a",
         f"url={url}"
     ]
+    if parse_workers:
+        command += ["-a", f"parse_workers={parse_workers}"]
+    if details != 'all':
+        command += ["-a", f"details={details}"]
     try:
         subprocess.run(command, check=True)
     except subprocess.CalledProcessError as e:
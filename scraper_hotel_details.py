@@ -1,24 +1,41 @@
 import scrapy
 import logging
+import os
 import pandas as pd
 import re
+from lazy_enrichment import PRIORITY_REST, detail_priorities, pending_details
+from parse_pool import create_parse_pool
+from snapshot_store import append_snapshot_csv
 
 
 class HotelDetailsSpider(scrapy.Spider):
     name = "hotelDetails"
 
-    def __init__(self, csv_file=None, *args, **kwargs):
+    def __init__(self, csv_file=None, parse_workers=None, criterion=None, price_min=None, price_max=None, top_n=5,
+                 rest='background', append_history=True, *args, **kwargs):
         """
         Inicjalizuje Spidera i wczytuje plik CSV z linkami do hoteli.
 
         :param csv_file: Ścieżka do pliku CSV zawierającego linki do hoteli
+        :param parse_workers: Liczba procesów do parsowania HTML poza reaktorem (opcjonalnie)
+        :param criterion: Kryterium listy top N, której strony hoteli są pobierane najpierw (opcjonalnie)
+        :param price_min: Dolna granica wybranego zakresu cen (opcjonalnie)
+        :param price_max: Górna granica wybranego zakresu cen (opcjonalnie)
+        :param top_n: Liczba hoteli w liście top N
+        :param rest: 'background' - pozostałe strony na końcu kolejki, 'skip' - pozostałe strony pomijane
+        :param append_history: Czy po zakończeniu dopisać wyniki do historii cen
         """
         super(HotelDetailsSpider, self).__init__(*args, **kwargs)
         if csv_file:
             self.hotels_df = pd.read_csv(csv_file)  # Wczytujemy dane z pliku
-            self.start_urls = self.hotels_df['link'].tolist()  # Pobieramy linki
         else:
             raise ValueError("Brak pliku CSV z linkami!")
+        self.parse_pool = create_parse_pool(parse_workers)
+        self.criterion = criterion
+        self.price_range = None if price_min is None or price_max is None else (float(price_min), float(price_max))
+        self.top_n = int(top_n)
+        self.rest = rest
+        self.append_history = str(append_history).lower() not in ('0', 'false', 'no')
 
     custom_settings = {
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -26,6 +43,18 @@ class HotelDetailsSpider(scrapy.Spider):
         'LOG_LEVEL': logging.WARNING,
     }
 
+    def start_requests(self):
+        """
+        Generuje żądania stron hoteli w kolejności priorytetów (top N, potem wybrany zakres cen, potem reszta).
+        Hotele, które mają już współrzędne (np. z wcześniejszego przebiegu), są pomijane.
+        """
+        priorities = detail_priorities(self.hotels_df, self.criterion, self.price_range, self.top_n)
+        pending = pending_details(self.hotels_df)
+        for link, priority, is_pending in zip(self.hotels_df['link'], priorities, pending):
+            if not is_pending or (self.rest == 'skip' and priority == PRIORITY_REST):
+                continue
+            yield scrapy.Request(link, priority=int(priority), dont_filter=True)
+
     def parse(self, response):
         """
         Parsuje stronę hotelu i zapisuje dane takie jak typ hotelu, współrzędne geograficzne,
@@ -33,45 +62,47 @@ class HotelDetailsSpider(scrapy.Spider):
 
         :param response: Odpowiedź z serwera zawierająca stronę hotelu
         """
+        if self.parse_pool is not None:
+            return self._parse_in_pool(response)
+        self.update_hotel(response.url, extract_hotel_details(response.body, response.encoding))
 
-        if not response.xpath('//*[@id="wrap-hotelpage-top"]'):
-            self.logger.warning(f"No hotel data found for: {response.url}")
+    async def _parse_in_pool(self, response):
+        """
+        Buduje DOM strony hotelu w puli procesów, a wynik zapisuje już w wątku reaktora.
 
-        hotelCards = response.xpath('//*[@id="wrap-hotelpage-top"]')
+        :param response: Odpowiedź z serwera zawierająca stronę hotelu
+        """
+        details = await self.parse_pool.submit(extract_hotel_details, response.body, response.encoding)
+        self.update_hotel(response.url, details)
+        return []
 
-        # Pobierz aktualny URL
-        current_link = response.url
+    def update_hotel(self, current_link, details):
+        """
+        Aktualizuje dataframe o dane ze strony hotelu i zapisuje plik CSV.
 
+        :param current_link: URL strony hotelu
+        :param details: Krotka (hotel_type, latitude, longitude) lub None, jeśli strona nie zawiera danych hotelu
+        """
         # Loguj przetwarzany link
         self.logger.info(f"Processing link: {current_link}")
 
-        if not hotelCards:
+        if details is None:
             self.logger.warning(f"No hotel data found for link: {current_link}")
             return
 
-        for card in hotelCards:
-            # Pobierz rodzaj hotelu/hostelu/apartamentu etc.
-            hotel_type = response.xpath('//a[@class="bui_breadcrumb__link_masked" and @itemprop="item"]/text()').get()
-            hotel_type = re.search(r'\(([^,]+)\)', hotel_type).group(1) if hotel_type and re.search(r'\(([^,]+)\)',
-                                                                                                    hotel_type) else None
-            # Pobierz współrzędne geograficzne
-            lat_lon = card.xpath('.//a[@id="map_trigger_header_pin"]/@data-atlas-latlng').get()
-            latitude, longitude = None, None
-            if lat_lon:
-                lat_lon_split = lat_lon.split(",")
-                if len(lat_lon_split) == 2:
-                    latitude, longitude = lat_lon_split
-
-            # Aktualizacja dataframe na podstawie linku
-            if current_link in self.hotels_df['link'].values:
-                self.hotels_df.loc[self.hotels_df['link'] == current_link, 'latitude'] = latitude
-                self.hotels_df.loc[self.hotels_df['link'] == current_link, 'longitude'] = longitude
-                self.hotels_df.loc[self.hotels_df['link'] == current_link, 'hotel_type'] = hotel_type
-            else:
-                self.logger.warning(f"Link {current_link} not found in original CSV.")
-
-        # Zapisuj zaktualizowany plik po każdej iteracji
-        self.hotels_df.to_csv('bookingResults_updated.csv', index=False)
+        hotel_type, latitude, longitude = details
+
+        # Aktualizacja dataframe na podstawie linku
+        if current_link in self.hotels_df['link'].values:
+            self.hotels_df.loc[self.hotels_df['link'] == current_link, 'latitude'] = latitude
+            self.hotels_df.loc[self.hotels_df['link'] == current_link, 'longitude'] = longitude
+            self.hotels_df.loc[self.hotels_df['link'] == current_link, 'hotel_type'] = hotel_type
+        else:
+            self.logger.warning(f"Link {current_link} not found in original CSV.")
+
+        # Zapisuj zaktualizowany plik po każdej iteracji (przez plik tymczasowy, bo aplikacja może go właśnie czytać)
+        self.hotels_df.to_csv('bookingResults_updated.csv.tmp', index=False)
+        os.replace('bookingResults_updated.csv.tmp', 'bookingResults_updated.csv')
 
     def close(self, reason):
         """
@@ -79,21 +110,58 @@ class HotelDetailsSpider(scrapy.Spider):
 
         :param reason: Powód zakończenia scrapowania
         """
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
         print("Scrapowanie zakończone. Usuwanie duplikatów...")
         remove_duplicates_from_csv('bookingResults_updated.csv')
         print("Duplikaty usunięte.")
+        # 'shutdown' - proces zatrzymany (SIGTERM), np. przez nowe wyszukiwanie; niepełne wyniki bez historii
+        if self.append_history and reason != 'shutdown':
+            append_snapshot_csv('bookingResults_updated.csv')
+
+
+def extract_hotel_details(body, encoding):
+    """
+    Ekstraktuje typ hotelu i współrzędne geograficzne z surowego HTML strony hotelu.
+    Funkcja jest zdefiniowana na poziomie modułu, więc można ją uruchomić w puli procesów.
+
+    :param body: Body odpowiedzi HTTP (bytes)
+    :param encoding: Kodowanie odpowiedzi
+    :return: Krotka (hotel_type, latitude, longitude) lub None, jeśli strona nie zawiera danych hotelu
+    """
+    selector = scrapy.Selector(text=body.decode(encoding, errors='replace'))
+    hotelCards = selector.xpath('//*[@id="wrap-hotelpage-top"]')
+    if not hotelCards:
+        return None
+
+    hotel_type, latitude, longitude = None, None, None
+    for card in hotelCards:
+        # Pobierz rodzaj hotelu/hostelu/apartamentu etc.
+        hotel_type = selector.xpath('//a[@class="bui_breadcrumb__link_masked" and @itemprop="item"]/text()').get()
+        hotel_type = re.search(r'\(([^,]+)\)', hotel_type).group(1) if hotel_type and re.search(r'\(([^,]+)\)',
+                                                                                                hotel_type) else None
+        # Pobierz współrzędne geograficzne
+        lat_lon = card.xpath('.//a[@id="map_trigger_header_pin"]/@data-atlas-latlng').get()
+        latitude, longitude = None, None
+        if lat_lon:
+            lat_lon_split = lat_lon.split(",")
+            if len(lat_lon_split) == 2:
+                latitude, longitude = lat_lon_split
+    return hotel_type, latitude, longitude
 
 
 def remove_duplicates_from_csv(file_path):
     """
     Usuwa duplikaty z pliku CSV na podstawie kolumn 'latitude' i 'longitude'.
+    Wiersze bez współrzędnych (strona hotelu jeszcze niepobrana) są zachowywane.
 
     :param file_path: Ścieżka do pliku CSV, z którego mają zostać usunięte duplikaty
     """
     try:
         df = pd.read_csv(file_path)
         if 'latitude' in df.columns and 'longitude' in df.columns:
-            df = df.drop_duplicates(subset=['latitude', 'longitude'])
+            located = df[['latitude', 'longitude']].notna().all(axis=1)
+            df = df[~located | ~df.duplicated(subset=['latitude', 'longitude'])]
         else:
             print("Kolumny 'latitude' i 'longitude' nie istnieją w pliku CSV.")
         df.to_csv(file_path, index=False)
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+from spatial_index import METERS_PER_DEGREE
+
+# Waga grupy cech w odległości między hotelami
+FEATURE_WEIGHTS = {
+    'price_per_night': 1.0,
+    'rate_review': 1.0,
+    'rating_stars': 0.5,
+    'num_review': 0.5,
+    'location': 1.0,
+    'hotel_type': 1.0,
+}
+
+
+def standardized(values):
+    """
+    Standaryzacja (średnia 0, odchylenie 1); braki danych dostają 0, czyli średnią.
+    """
+    values = np.asarray(values, dtype='float64')
+    known = values[~np.isnan(values)]
+    if not len(known) or known.std() == 0:
+        return np.zeros(len(values))
+    return np.nan_to_num((values - known.mean()) / known.std(), nan=0.0)
+
+
+def feature_matrix(data):
+    """
+    Znormalizowane wektory cech hoteli: cena za noc i liczba recenzji (w skali logarytmicznej), ocena,
+    gwiazdki, położenie (metry od środka danych) i typ obiektu (one-hot). Każda grupa cech ma po
+    standaryzacji wagę z FEATURE_WEIGHTS.
+
+    Parametry:
+    - data: pd.DataFrame - Hotele (np. z dataset.prepare_dataset).
+
+    Zwraca:
+    - np.ndarray - Macierz (liczba hoteli x liczba cech), float32.
+    """
+    def column(name):
+        if name not in data.columns:
+            return np.full(len(data), np.nan)
+        return data[name].to_numpy(dtype='float64')
+
+    price = column('price_per_night') if 'price_per_night' in data.columns else column('price')
+    columns = [
+        FEATURE_WEIGHTS['price_per_night'] * standardized(np.log1p(price)),
+        FEATURE_WEIGHTS['rate_review'] * standardized(column('rate_review')),
+        FEATURE_WEIGHTS['rating_stars'] * standardized(column('rating_stars')),
+        FEATURE_WEIGHTS['num_review'] * standardized(np.log1p(column('num_review'))),
+    ]
+
+    # Położenie w metrach, wspólna skala dla obu osi (żeby nie zniekształcić odległości)
+    latitude, longitude = column('latitude'), column('longitude')
+    if (~np.isnan(latitude)).any():
+        middle_lat, middle_lon = np.nanmedian(latitude), np.nanmedian(longitude)
+        y = (latitude - middle_lat) * METERS_PER_DEGREE
+        x = (longitude - middle_lon) * METERS_PER_DEGREE * np.cos(np.radians(middle_lat))
+        spread = np.sqrt(np.nanmean(x ** 2 + y ** 2))
+        scale = FEATURE_WEIGHTS['location'] / spread if spread > 0 else 0.0
+        columns += [np.nan_to_num(x * scale, nan=0.0), np.nan_to_num(y * scale, nan=0.0)]
+
+    # Typ obiektu: dwa różne typy są od siebie oddalone o wagę grupy
+    if 'hotel_type' in data.columns:
+        types = data['hotel_type'].astype('category')
+        codes = types.cat.codes.to_numpy()
+        one_hot = np.zeros((len(data), len(types.cat.categories)))
+        one_hot[np.flatnonzero(codes >= 0), codes[codes >= 0]] = FEATURE_WEIGHTS['hotel_type'] / np.sqrt(2)
+        columns += list(one_hot.T)
+
+    return np.column_stack(columns).astype('float32')
+
+
+class SimilarHotels:
+    """
+    Indeks najbliższych sąsiadów na wektorach cech (feature_matrix), liczony raz dla zbioru danych.
+
+    Odległości do wszystkich hoteli dla całej listy zapytań to jedno mnożenie macierzy
+    (|a - b|^2 = |a|^2 + |b|^2 - 2ab, normy hoteli policzone z góry), a k najbliższych wybiera
+    argpartition - bez sortowania wszystkich hoteli.
+    """
+
+    def __init__(self, data):
+        """
+        Parametry:
+        - data: pd.DataFrame - Hotele; zapytania i wyniki to pozycje (iloc) w tej ramce.
+        """
+        self.name_codes = pd.factorize(data['name'])[0]  # Porównywanie liczb zamiast nazw
+        self.features = feature_matrix(data)
+        self.norms = (self.features ** 2).sum(axis=1)
+
+    def similar(self, rows, k=3):
+        """
+        k hoteli najbardziej podobnych do każdego z podanych (bez niego samego i hoteli o tej samej nazwie).
+
+        Parametry:
+        - rows: np.ndarray - Pozycje (iloc) hoteli, dla których szukamy podobnych.
+        - k: int - Liczba podobnych hoteli na zapytanie.
+
+        Zwraca:
+        - tuple[np.ndarray, np.ndarray] - Pozycje podobnych hoteli i ich odległości w przestrzeni cech
+          (macierze liczba zapytań x k, od najbardziej podobnego).
+        """
+        rows = np.asarray(rows, dtype='int64')
+        k = min(k, len(self.name_codes) - 1)
+        if not len(rows) or k <= 0:
+            return np.empty((len(rows), 0), dtype='int64'), np.empty((len(rows), 0))
+        queries = self.features[rows]
+        distances = self.norms[None, :] + self.norms[rows, None] - 2 * queries @ self.features.T
+        # Sam hotel (i jego duplikaty z innych stron wyników) nie jest swoim podobnym
+        distances[self.name_codes[None, :] == self.name_codes[rows, None]] = np.inf
+
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind='stable')
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.sqrt(np.maximum(np.take_along_axis(nearest_distances, order, axis=1), 0))
+        return nearest, nearest_distances
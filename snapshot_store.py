@@ -0,0 +1,262 @@
+import datetime
+import os
+import sqlite3
+from contextlib import closing
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from rollups import ROLLUP_SCHEMA, UNKNOWN_KEY, build_rollups, merge_into_table, summarize
+from scraper_booking import canonical_link
+
+SNAPSHOT_DB = "priceHistory.sqlite"
+
+SNAPSHOT_COLUMNS = ['scraped_at', 'snapshot_date', 'city', 'checkin', 'checkout', 'adults', 'nights', 'hotel',
+                    'name', 'hotel_type', 'price', 'price_per_night', 'rate_review', 'num_review', 'rating_stars',
+                    'distance', 'latitude', 'longitude']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    scraped_at TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    city TEXT,
+    checkin TEXT,
+    checkout TEXT,
+    adults INTEGER,
+    nights INTEGER,
+    hotel TEXT NOT NULL,
+    name TEXT,
+    hotel_type TEXT,
+    price REAL,
+    price_per_night REAL,
+    rate_review REAL,
+    num_review INTEGER,
+    rating_stars INTEGER,
+    distance REAL,
+    latitude REAL,
+    longitude REAL
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_hotel_date ON snapshots (hotel, snapshot_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_date_type_price ON snapshots (snapshot_date, hotel_type, price_per_night);
+CREATE INDEX IF NOT EXISTS idx_snapshots_city_date ON snapshots (city, snapshot_date);
+"""
+
+
+def parse_search_url(url):
+    """
+    Odczytuje parametry wyszukiwania (miasto, daty, liczba dorosłych) z URL-a strony wyników.
+
+    Parametry:
+    - url: str - URL z kolumny 'source_url'.
+
+    Zwraca:
+    - dict - Klucze: city, checkin, checkout, adults (None, jeśli parametru brak).
+    """
+    query = parse_qs(urlsplit(url).query) if isinstance(url, str) else {}
+    first = lambda key: query.get(key, [None])[0]  # noqa: E731
+    adults = first('group_adults')
+    return {
+        'city': first('ss'),
+        'checkin': first('checkin'),
+        'checkout': first('checkout'),
+        'adults': int(adults) if adults and adults.isdigit() else None,
+    }
+
+
+def snapshot_rows(df, scraped_at=None):
+    """
+    Przygotowuje wiersze migawki z wyników scrapowania (z batch_scraper albo z pliku CSV pełnego przebiegu).
+
+    Parametry:
+    - df: pd.DataFrame - Wyniki scrapowania. Brakujące kolumny wyszukiwania są odczytywane z 'source_url'.
+    - scraped_at: datetime.datetime (opcjonalnie) - Czas scrapowania; domyślnie teraz (UTC).
+
+    Zwraca:
+    - pd.DataFrame - Wiersze z kolumnami SNAPSHOT_COLUMNS.
+    """
+    scraped_at = scraped_at or datetime.datetime.now(datetime.timezone.utc)
+    rows = df.copy()
+    search_columns = ['city', 'checkin', 'checkout', 'adults']
+    if any(column not in rows.columns for column in search_columns):
+        search = pd.DataFrame([parse_search_url(url) for url in rows['source_url']], index=rows.index)
+        for column in search_columns:
+            if column not in rows.columns:
+                rows[column] = search[column]
+    if 'canonical_link' not in rows.columns:
+        rows['canonical_link'] = rows['link'].map(canonical_link)
+
+    rows['scraped_at'] = scraped_at.isoformat(timespec='seconds')
+    rows['snapshot_date'] = scraped_at.date().isoformat()
+    rows['hotel'] = rows['canonical_link']
+    rows['nights'] = (pd.to_datetime(rows['checkout']) - pd.to_datetime(rows['checkin'])).dt.days
+    rows['price_per_night'] = pd.to_numeric(rows['price'], errors='coerce') / rows['nights']
+    for column in SNAPSHOT_COLUMNS:
+        if column not in rows.columns:
+            rows[column] = None
+    return rows[SNAPSHOT_COLUMNS]
+
+
+class SnapshotStore:
+    """
+    Historia cen: każde scrapowanie jest dopisywane (nigdy nadpisywane) do tabeli SQLite
+    z indeksami po hotelu i dacie migawki oraz po dacie, typie hotelu i cenie.
+
+    Przy każdym dopisaniu aktualizowane są też agregaty w tabeli rollups (miasto / data / typ hotelu /
+    kategoria cenowa), z których korzystają statystyki historyczne zamiast skanowania surowych wierszy.
+    """
+
+    def __init__(self, path=SNAPSHOT_DB):
+        """
+        Parametry:
+        - path: str - Ścieżka do pliku bazy SQLite (tworzony, jeśli nie istnieje).
+        """
+        self.path = path
+        with closing(self.connect()) as connection, connection:
+            connection.executescript(SCHEMA + ROLLUP_SCHEMA)
+            has_rollups = connection.execute("SELECT 1 FROM rollups LIMIT 1").fetchone()
+            has_snapshots = connection.execute("SELECT 1 FROM snapshots LIMIT 1").fetchone()
+        if has_snapshots and not has_rollups:
+            self.rebuild_rollups()
+
+    def connect(self):
+        """
+        Otwiera nowe połączenie (Streamlit wykonuje skrypt w różnych wątkach, więc połączenia nie są współdzielone).
+        """
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def append(self, df, scraped_at=None):
+        """
+        Dopisuje migawkę wyników scrapowania.
+
+        Parametry:
+        - df: pd.DataFrame - Wyniki scrapowania.
+        - scraped_at: datetime.datetime (opcjonalnie) - Czas scrapowania.
+
+        Zwraca:
+        - pd.DataFrame - Dopisane wiersze.
+        """
+        rows = snapshot_rows(df, scraped_at)
+        with closing(self.connect()) as connection, connection:
+            rows.to_sql('snapshots', connection, if_exists='append', index=False, chunksize=10000)
+            merge_into_table(connection, build_rollups(rows))
+        return rows
+
+    def rebuild_rollups(self):
+        """
+        Przelicza tabelę rollups od zera na podstawie wszystkich migawek (np. dla bazy sprzed wprowadzenia agregatów).
+        """
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM rollups")
+            chunks = pd.read_sql_query(
+                "SELECT city, snapshot_date, hotel_type, price_per_night FROM snapshots ORDER BY snapshot_date",
+                connection, chunksize=200000,
+            )
+            for chunk in chunks:
+                merge_into_table(connection, build_rollups(chunk))
+
+    def query(self, sql, params=()):
+        """
+        Wykonuje zapytanie i zwraca wynik jako DataFrame.
+        """
+        with closing(self.connect()) as connection:
+            return pd.read_sql_query(sql, connection, params=params)
+
+    def price_trajectory(self, hotel):
+        """
+        Historia ceny jednego hotelu.
+
+        Parametry:
+        - hotel: str - Kanoniczny link do strony hotelu.
+
+        Zwraca:
+        - pd.DataFrame - Kolumny: scraped_at, checkin, nights, price, price_per_night (rosnąco po czasie).
+        """
+        return self.query(
+            "SELECT scraped_at, checkin, nights, price, price_per_night FROM snapshots "
+            "WHERE hotel = ? ORDER BY snapshot_date, scraped_at",
+            (hotel,),
+        )
+
+    def distribution(self, group_by, days=30, city=None, today=None):
+        """
+        Rozkład ceny za noc z ostatnich `days` dni liczony z agregatów (bez skanowania surowych wierszy).
+        Przy grupowaniu po typie hotelu pomijane są hotele bez typu (jak groupby na surowych wierszach).
+
+        Parametry:
+        - group_by: list[str] - Kolumny grupujące: 'city', 'snapshot_date', 'hotel_type', 'price_range'.
+        - days: int - Długość okna w dniach (razem z dniem `today`).
+        - city: str (opcjonalnie) - Ograniczenie do jednego miasta.
+        - today: datetime.date (opcjonalnie) - Koniec okna; domyślnie dzisiaj (UTC, jak snapshot_date).
+
+        Zwraca:
+        - pd.DataFrame - Kolumny group_by oraz count, mean, min, max, p25, p50, p75, p90.
+        """
+        today = today or datetime.datetime.now(datetime.timezone.utc).date()
+        # Okno `days` dni kalendarzowych kończące się dniem `today` (włącznie)
+        since = (today - datetime.timedelta(days=days - 1)).isoformat()
+        sql = "SELECT * FROM rollups WHERE snapshot_date >= ?"
+        params = [since]
+        if 'hotel_type' in group_by:
+            sql += " AND hotel_type != ?"
+            params.append(UNKNOWN_KEY)
+        if city:
+            sql += " AND city = ?"
+            params.append(city)
+        return summarize(self.query(sql, params), group_by)
+
+    def median_price_by_type(self, days=30, city=None, today=None):
+        """
+        Mediana ceny za noc według typu hotelu z ostatnich `days` dni (ze szkiców kwantyli, błąd względny ~1%).
+
+        Parametry:
+        - days: int - Długość okna w dniach.
+        - city: str (opcjonalnie) - Ograniczenie do jednego miasta.
+        - today: datetime.date (opcjonalnie) - Koniec okna; domyślnie dzisiaj (UTC, jak snapshot_date).
+
+        Zwraca:
+        - pd.DataFrame - Kolumny: hotel_type, median_price_per_night, snapshots.
+        """
+        summary = self.distribution(['hotel_type'], days=days, city=city, today=today)
+        return summary.rename(columns={'p50': 'median_price_per_night', 'count': 'snapshots'})[
+            ['hotel_type', 'median_price_per_night', 'snapshots']]
+
+    def cities(self):
+        """
+        Lista miast obecnych w historii.
+        """
+        return self.query("SELECT DISTINCT city FROM snapshots WHERE city IS NOT NULL ORDER BY city")['city'].tolist()
+
+    def hotels(self, city):
+        """
+        Hotele z historii dla jednego miasta (ostatnia znana nazwa dla każdego kanonicznego linku).
+
+        Parametry:
+        - city: str - Miasto.
+
+        Zwraca:
+        - pd.DataFrame - Kolumny: hotel, name, snapshots.
+        """
+        return self.query(
+            "SELECT hotel, MAX(name) AS name, COUNT(*) AS snapshots FROM snapshots "
+            "WHERE city = ? GROUP BY hotel ORDER BY name",
+            (city,),
+        )
+
+
+def append_snapshot_csv(file_path, db_path=SNAPSHOT_DB):
+    """
+    Dopisuje wyniki pełnego przebiegu (plik CSV) do historii cen.
+
+    Parametry:
+    - file_path: str - Ścieżka do pliku CSV z wynikami.
+    - db_path: str - Ścieżka do bazy historii cen.
+    """
+    try:
+        if not os.path.exists(file_path):
+            return
+        rows = SnapshotStore(db_path).append(pd.read_csv(file_path))
+        print(f"Dopisano {len(rows)} wierszy do historii cen: {db_path}")
+    except Exception as e:
+        print(f"Błąd podczas zapisu historii cen: {e}")
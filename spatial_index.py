@@ -0,0 +1,130 @@
+import numpy as np
+
+EARTH_RADIUS = 6371008.8  # Średni promień Ziemi w metrach
+METERS_PER_DEGREE = np.pi * EARTH_RADIUS / 180
+
+
+def haversine(latitude, longitude, latitudes, longitudes):
+    """
+    Odległość po powierzchni Ziemi (wzór haversine) od punktu do wielu punktów.
+
+    Parametry:
+    - latitude, longitude: float - Punkt odniesienia.
+    - latitudes, longitudes: np.ndarray - Punkty.
+
+    Zwraca:
+    - np.ndarray - Odległości w metrach.
+    """
+    lat1, lat2 = np.radians(latitude), np.radians(latitudes)
+    half_lat = (lat2 - lat1) / 2
+    half_lon = np.radians(np.asarray(longitudes) - longitude) / 2
+    a = np.sin(half_lat) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(half_lon) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class SpatialIndex:
+    """
+    Indeks przestrzenny hoteli na siatce (jak geohash): hotele są posortowane po numerze komórki siatki
+    o boku `cell_size` metrów, więc hotele jednego wiersza komórek leżą w tablicy obok siebie, a zakres
+    komórek to dwa wyszukiwania binarne (searchsorted).
+
+    Zapytanie o promień bierze tylko hotele z komórek prostokąta otaczającego okrąg i liczy dla nich
+    dokładną odległość (haversine). Zapytanie o k najbliższych powtarza zapytanie o promień, podwajając
+    go, aż k-ty najbliższy hotel leży w jego zasięgu.
+    """
+
+    max_search_cells = 1024  # Największy promień szukania najbliższych (w komórkach), dalej - wszystkie hotele
+
+    def __init__(self, data, cell_size=250):
+        """
+        Parametry:
+        - data: pd.DataFrame - Hotele z liczbowymi kolumnami latitude, longitude (np. z dataset.prepare_dataset);
+          hotele bez współrzędnych są pomijane, wyniki to pozycje (iloc) w tej ramce.
+        - cell_size: float - Bok komórki siatki w metrach (na szerokości geograficznej środka danych).
+        """
+        latitude = data['latitude'].to_numpy(dtype='float64')
+        longitude = data['longitude'].to_numpy(dtype='float64')
+        located = np.flatnonzero(~np.isnan(latitude) & ~np.isnan(longitude))
+        middle = np.radians(np.median(latitude[located])) if len(located) else 0.0
+        self.cell_lat = cell_size / METERS_PER_DEGREE
+        self.cell_lon = cell_size / (METERS_PER_DEGREE * max(np.cos(middle), 0.01))
+
+        cell_y = np.floor(latitude[located] / self.cell_lat).astype('int64')
+        cell_x = np.floor(longitude[located] / self.cell_lon).astype('int64')
+        self.min_x = cell_x.min() if len(located) else 0
+        self.width = (cell_x.max() - self.min_x + 1) if len(located) else 1
+        keys = cell_y * self.width + (cell_x - self.min_x)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.rows = located[order]
+        self.latitude = latitude[self.rows]
+        self.longitude = longitude[self.rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _candidates(self, latitude, longitude, radius):
+        """
+        Pozycje (w tablicach indeksu) hoteli z komórek prostokąta otaczającego okrąg.
+        """
+        lat_span = radius / METERS_PER_DEGREE
+        widest = min(abs(latitude) + lat_span, 89.0)  # Na krawędzi bliższej biegunowi stopień długości jest najkrótszy
+        lon_span = radius / (METERS_PER_DEGREE * np.cos(np.radians(widest)))
+        y0 = int(np.floor((latitude - lat_span) / self.cell_lat))
+        y1 = int(np.floor((latitude + lat_span) / self.cell_lat))
+        x0 = max(int(np.floor((longitude - lon_span) / self.cell_lon)) - self.min_x, 0)
+        x1 = min(int(np.floor((longitude + lon_span) / self.cell_lon)) - self.min_x, self.width - 1)
+        if x0 > x1:
+            return np.empty(0, dtype='int64')
+        cell_rows = np.arange(y0, y1 + 1) * self.width
+        starts = np.searchsorted(self.keys, cell_rows + x0, side='left')
+        stops = np.searchsorted(self.keys, cell_rows + x1, side='right')
+        if not len(starts) or not (stops - starts).any():
+            return np.empty(0, dtype='int64')
+        return np.concatenate([np.arange(start, stop) for start, stop in zip(starts, stops) if stop > start])
+
+    def within(self, latitude, longitude, radius):
+        """
+        Hotele w promieniu od punktu, od najbliższego.
+
+        Parametry:
+        - latitude, longitude: float - Punkt.
+        - radius: float - Promień w metrach.
+
+        Zwraca:
+        - tuple[np.ndarray, np.ndarray] - Pozycje (iloc) hoteli i odległości w metrach.
+        """
+        candidates = self._candidates(latitude, longitude, radius)
+        distances = haversine(latitude, longitude, self.latitude[candidates], self.longitude[candidates])
+        inside = distances <= radius
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.lexsort((self.rows[candidates], distances))
+        return self.rows[candidates[order]], distances[order]
+
+    def nearest(self, latitude, longitude, k=5):
+        """
+        k hoteli najbliższych punktowi, od najbliższego.
+
+        Parametry:
+        - latitude, longitude: float - Punkt.
+        - k: int - Liczba hoteli.
+
+        Zwraca:
+        - tuple[np.ndarray, np.ndarray] - Pozycje (iloc) hoteli i odległości w metrach.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype='int64'), np.empty(0)
+        cell_size = self.cell_lat * METERS_PER_DEGREE
+        radius = cell_size
+        while True:
+            rows, distances = self.within(latitude, longitude, radius)
+            if len(rows) >= k or radius > self.max_search_cells * cell_size:
+                break
+            radius *= 2
+        if len(rows) < k:
+            # Punkt daleko od hoteli - odległości do wszystkich
+            distances = haversine(latitude, longitude, self.latitude, self.longitude)
+            order = np.lexsort((self.rows, distances))[:k]
+            return self.rows[order], distances[order]
+        return rows[:k], distances[:k]
@@ -0,0 +1,169 @@
+import sys
+
+if "twisted.internet.reactor" in sys.modules:
+    del sys.modules["twisted.internet.reactor"]
+import json
+import os
+import subprocess
+import time
+import weakref
+
+# Plik, do którego rozgrzany proces zapisuje czasy ostatniego scrapowania
+STATUS_FILE = "speculativeCrawl.json"
+
+
+def kill_processes(processes):
+    """
+    Zabija procesy, które jeszcze działają (sprzątanie po porzuconym crawlerze).
+
+    Parametry:
+    - processes: set[subprocess.Popen] - Procesy; zbiór jest opróżniany.
+    """
+    while processes:
+        process = processes.pop()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+class SpeculativeCrawler:
+    """
+    Spekulacyjne scrapowanie wyników wyszukiwania, zanim użytkownik wyśle formularz.
+
+    Trzyma w gotowości rozgrzany proces (Python, Scrapy i reaktor już załadowane), który czeka na URL.
+    Gdy formularz ma już wpisane miejsce docelowe i daty, speculate() od razu uruchamia na nim scrapowanie
+    wyników wyszukiwania (bez stron hoteli). Jeśli wysłane wyszukiwanie jest takie samo, fetch() przejmuje
+    rozpoczętą pracę; jeśli nie - proces jest zabijany, a wyszukiwanie idzie na kolejny rozgrzany proces.
+
+    Crawler żyje w stanie sesji Streamlit, a tej nikt nie zamyka - procesy, które zostały po porzuconej sesji,
+    są zabijane, gdy crawler zostanie usunięty z pamięci (albo przy zamknięciu serwera).
+    """
+
+    def __init__(self, cwd=None):
+        """
+        Parametry:
+        - cwd: str (opcjonalnie) - Katalog roboczy procesów (tam trafiają pliki wyników); domyślnie bieżący.
+        """
+        self.cwd = cwd
+        self.spare = None  # Rozgrzany proces czekający na URL
+        self.running = None  # Proces scrapujący spekulacyjnie
+        self.url = None
+        self.started_at = None
+        self._processes = set()  # Procesy do zabicia przy sprzątaniu (bez odwołania do crawlera)
+        self._finalizer = weakref.finalize(self, kill_processes, self._processes)
+
+    def _spawn(self):
+        process = subprocess.Popen([sys.executable, os.path.abspath(__file__)], stdin=subprocess.PIPE, text=True,
+                                   cwd=self.cwd)
+        self._processes.difference_update([old for old in self._processes if old.poll() is not None])
+        self._processes.add(process)
+        return process
+
+    def _start(self, url):
+        """
+        Przekazuje URL rozgrzanemu procesowi i od razu przygotowuje kolejny.
+        """
+        self.warm_up()
+        process, self.spare = self.spare, None
+        process.stdin.write(json.dumps({'url': url}) + "\n")
+        process.stdin.close()
+        self.warm_up()
+        return process
+
+    def warm_up(self):
+        """
+        Uruchamia rozgrzany proces, jeśli żaden nie czeka.
+        """
+        if self.spare is None or self.spare.poll() is not None:
+            self.spare = self._spawn()
+
+    def speculate(self, url):
+        """
+        Zaczyna scrapować wyniki dla URL-a (nic nie robi, jeśli to samo wyszukiwanie już trwa).
+
+        Parametry:
+        - url: str - URL strony wyników wyszukiwania.
+        """
+        if url == self.url:
+            return
+        self.discard()
+        self.running = self._start(url)
+        self.url = url
+        self.started_at = time.time()
+
+    def discard(self):
+        """
+        Porzuca spekulacyjne scrapowanie (zabija proces).
+        """
+        if self.running is not None:
+            self.running.kill()
+            self.running.wait()
+        self.running, self.url, self.started_at = None, None, None
+
+    def fetch(self, url):
+        """
+        Scrapuje wyniki wyszukiwania (plik bookingResults.csv, bez stron hoteli) i czeka na zakończenie.
+
+        Parametry:
+        - url: str - URL strony wyników wyszukiwania.
+
+        Zwraca:
+        - dict - reused (czy przejęto spekulacyjne scrapowanie), started_at, first_item_at, finished_at
+          (znaczniki time.time(); first_item_at to None, jeśli nie znaleziono żadnego hotelu).
+        """
+        reused = url == self.url and self.running is not None
+        if reused:
+            process, started_at = self.running, self.started_at
+            self.running, self.url, self.started_at = None, None, None
+        else:
+            self.discard()
+            process, started_at = self._start(url), time.time()
+        process.wait()
+        status = {'first_item_at': None, 'finished_at': time.time()}
+        status_path = os.path.join(self.cwd or "", STATUS_FILE)
+        if os.path.exists(status_path) and os.path.getmtime(status_path) >= started_at:
+            with open(status_path) as file:
+                status.update(json.load(file))
+        return {'reused': reused, 'started_at': started_at, **status}
+
+    def close(self):
+        """
+        Kończy wszystkie procesy.
+        """
+        self.discard()
+        self.spare = None
+        kill_processes(self._processes)
+
+
+def serve():
+    """
+    Tryb rozgrzanego procesu: ładuje Scrapy i przygotowuje crawler, a potem czeka na URL na standardowym wejściu.
+    Puste wejście (zamknięta aplikacja) kończy proces bez scrapowania.
+    """
+    from scrapy import signals
+    from scrapy.crawler import CrawlerProcess
+    from scraper_booking import HotelsSpider
+
+    process = CrawlerProcess()
+    crawler = process.create_crawler(HotelsSpider)
+    status = {'first_item_at': None}
+
+    def item_scraped():
+        if status['first_item_at'] is None:
+            status['first_item_at'] = time.time()
+
+    crawler.signals.connect(item_scraped, signal=signals.item_scraped)
+
+    line = sys.stdin.readline()
+    if not line.strip():
+        return
+    request = json.loads(line)
+    process.crawl(crawler, url=request['url'], details='lazy')
+    process.start()
+    status['finished_at'] = time.time()
+    with open(STATUS_FILE, 'w') as file:
+        json.dump(status, file)
+
+
+if __name__ == "__main__":
+    serve()